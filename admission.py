@@ -0,0 +1,158 @@
+import os
+import math
+import time
+import threading
+
+# 음악 생성 요청 입장 제어 설정
+# - GENERATION_MAX_IN_FLIGHT: 동시에 접수/진행 중일 수 있는 생성 작업 수 (전체)
+# - GENERATION_MAX_PER_USER: 사용자 한 명이 동시에 가질 수 있는 생성 작업 수
+# - GENERATION_ADMISSION_QUEUE: 자리가 빌 때까지 기다릴 수 있는 요청 수
+# - GENERATION_ADMISSION_WAIT: 대기 요청이 자리를 기다리는 최대 시간 (초)
+# - GENERATION_RETRY_AFTER: 작업 시간 기록이 없을 때 Retry-After 기본값 (초)
+GENERATION_MAX_IN_FLIGHT = int(os.getenv('GENERATION_MAX_IN_FLIGHT', '8'))
+GENERATION_MAX_PER_USER = int(os.getenv('GENERATION_MAX_PER_USER', '2'))
+GENERATION_ADMISSION_QUEUE = int(os.getenv('GENERATION_ADMISSION_QUEUE', '16'))
+GENERATION_ADMISSION_WAIT = float(os.getenv('GENERATION_ADMISSION_WAIT', '5'))
+GENERATION_RETRY_AFTER = float(os.getenv('GENERATION_RETRY_AFTER', '10'))
+
+# 작업 시간 이동 평균 가중치
+HOLD_TIME_WEIGHT = 0.2
+
+
+class Rejected(Exception):
+    """입장 거절 - status_code(429/503)와 retry_after(초)를 응답에 사용"""
+
+    def __init__(self, status_code, reason, message, retry_after):
+        super().__init__(message)
+        self.status_code = status_code
+        self.reason = reason
+        self.message = message
+        self.retry_after = retry_after
+
+
+class Slot:
+    """입장한 요청 하나가 차지한 자리 - 생성 작업이 끝날 때 release()"""
+
+    def __init__(self, controller, owner):
+        self._controller = controller
+        self.owner = owner
+        self.acquired_at = time.monotonic()
+        self.claimed = False
+        self._released = False
+        self._lock = threading.Lock()
+
+    def claim(self):
+        """생성 작업이 자리를 넘겨받음 (요청이 끝나도 해제하지 않음) - 해제 함수 반환"""
+        self.claimed = True
+        return self.release
+
+    def release(self):
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        self._controller._release(self)
+
+
+class AdmissionController:
+    """전체/사용자별 동시 생성 작업 수 제한 + 대기열
+
+    사용자별 한도를 넘으면 바로 429, 전체 한도가 차면 대기열에서 wait_timeout까지
+    기다리고, 대기열도 차 있거나 시간이 지나면 503으로 거절한다.
+    """
+
+    def __init__(self, max_in_flight=GENERATION_MAX_IN_FLIGHT, max_per_user=GENERATION_MAX_PER_USER,
+                 max_queue=GENERATION_ADMISSION_QUEUE, wait_timeout=GENERATION_ADMISSION_WAIT):
+        self.max_in_flight = max_in_flight
+        self.max_per_user = max_per_user
+        self.max_queue = max_queue
+        self.wait_timeout = wait_timeout
+        self._in_flight = 0
+        self._waiting = 0
+        self._per_user = {}
+        self._hold_time = None
+        self._lock = threading.Lock()
+        self._freed = threading.Condition(self._lock)
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = {'per_user': 0, 'queue_full': 0, 'queue_timeout': 0}
+
+    def _retry_after_locked(self, ahead):
+        """앞에 있는 작업 수와 평균 작업 시간으로 추정한 재시도 대기 시간 (초, 정수)"""
+        hold_time = self._hold_time if self._hold_time is not None else GENERATION_RETRY_AFTER
+        rounds = max(ahead, 1) / max(self.max_in_flight, 1)
+        return max(1, math.ceil(hold_time * rounds))
+
+    def _reject_locked(self, status_code, reason, message, ahead):
+        self.rejected[reason] += 1
+        return Rejected(status_code, reason, message, self._retry_after_locked(ahead))
+
+    def acquire(self, owner):
+        """자리 하나를 차지하고 Slot 반환 - 자리가 없으면 Rejected"""
+        with self._lock:
+            if self._per_user.get(owner, 0) >= self.max_per_user:
+                raise self._reject_locked(429, 'per_user', '진행 중인 음악 생성이 너무 많습니다. 잠시 후 다시 시도해주세요.',
+                                          self._per_user[owner])
+            if self._in_flight >= self.max_in_flight and self._waiting >= self.max_queue:
+                raise self._reject_locked(503, 'queue_full', '음악 생성 요청이 많습니다. 잠시 후 다시 시도해주세요.',
+                                          self._in_flight + self._waiting)
+
+            # 대기 중에도 사용자별 자리로 계산해서 한 사용자가 대기열을 채우지 못하게 함
+            self._per_user[owner] = self._per_user.get(owner, 0) + 1
+            if self._in_flight >= self.max_in_flight:
+                self.queued += 1
+                self._waiting += 1
+                deadline = time.monotonic() + self.wait_timeout
+                try:
+                    while self._in_flight >= self.max_in_flight:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._decrement_user_locked(owner)
+                            raise self._reject_locked(503, 'queue_timeout', '음악 생성 요청이 많습니다. 잠시 후 다시 시도해주세요.',
+                                                      self._in_flight + self._waiting)
+                        self._freed.wait(timeout=remaining)
+                finally:
+                    self._waiting -= 1
+
+            self._in_flight += 1
+            self.admitted += 1
+            return Slot(self, owner)
+
+    def _decrement_user_locked(self, owner):
+        count = self._per_user.get(owner, 0) - 1
+        if count > 0:
+            self._per_user[owner] = count
+        else:
+            self._per_user.pop(owner, None)
+
+    def _release(self, slot):
+        hold_time = time.monotonic() - slot.acquired_at
+        with self._lock:
+            self._in_flight -= 1
+            self._decrement_user_locked(slot.owner)
+            # 작업 없이 끝난 요청(입력 오류 등)은 작업 시간 평균에 넣지 않음
+            if slot.claimed:
+                if self._hold_time is None:
+                    self._hold_time = hold_time
+                else:
+                    self._hold_time += HOLD_TIME_WEIGHT * (hold_time - self._hold_time)
+            self._freed.notify()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'in_flight': self._in_flight,
+                'max_in_flight': self.max_in_flight,
+                'max_per_user': self.max_per_user,
+                'queue_depth': self._waiting,
+                'max_queue': self.max_queue,
+                'wait_timeout': self.wait_timeout,
+                'active_users': len(self._per_user),
+                'avg_hold_time': round(self._hold_time, 3) if self._hold_time is not None else None,
+                'admitted': self.admitted,
+                'queued': self.queued,
+                'rejected': dict(self.rejected),
+            }
+
+
+controller = AdmissionController()
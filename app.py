@@ -1,10 +1,29 @@
-from flask import Flask, render_template, request, redirect, url_for, session, jsonify, send_from_directory
+from flask import Flask, render_template, request, redirect, url_for, session, jsonify, send_from_directory, Response, make_response, g
 import os
+import hashlib
+import functools
 import datetime
-import json
 import uuid
 import requests
-from werkzeug.utils import secure_filename
+import backend_client
+import backend_health
+import backend_fanout
+import backend_cache
+import backend_hedging
+import generation_jobs
+import resumable_uploads
+import blob_store
+import music_store
+import pagination
+import date_parser
+import single_flight
+import generation_cache
+import idempotency
+import admission
+import rate_limit
+import like_buffer
+import deadlines
+from urllib.parse import urlencode
 from dotenv import load_dotenv
 import secrets
 import random
@@ -23,7 +42,7 @@ app.secret_key = os.getenv('FLASK_SECRET_KEY', secrets.token_hex(16))
 # 백엔드 API URL 설정
 BACKEND_API_URL = os.getenv('BACKEND_API_URL', 'http://localhost:8000/api')
 
-# 음악 데이터를 저장할 JSON 파일 경로 (백엔드 연결 실패 시 사용)
+# 예전 로컬 음악 데이터 JSON 파일 경로 (있으면 music_store로 옮겨 담음)
 MUSIC_DATA_FILE = 'music_data.json'
 
 # Google OAuth 설정
@@ -34,6 +53,14 @@ GOOGLE_CLIENT_SECRET = os.getenv('GOOGLE_CLIENT_SECRET')
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MUSIC_FOLDER'] = 'static/music'
 app.config['ALLOWED_EXTENSIONS'] = {'mp3', 'wav', 'ogg'}
+app.config['IMAGE_EXTENSIONS'] = {'png', 'jpg', 'jpeg', 'gif'}
+app.config['VIDEO_EXTENSIONS'] = {'mp4', 'mov', 'avi', 'mkv', 'webm'}
+
+# 업로드 크기 제한 (MB) - 본문을 받기 전에 Content-Length로 거절
+app.config['MAX_IMAGE_UPLOAD_BYTES'] = int(os.getenv('MAX_IMAGE_UPLOAD_MB', '20')) * 1024 * 1024
+app.config['MAX_VIDEO_UPLOAD_BYTES'] = int(os.getenv('MAX_VIDEO_UPLOAD_MB', '500')) * 1024 * 1024
+# Content-Length 없이 들어오는 요청도 이 크기를 넘으면 werkzeug가 읽는 도중 중단
+app.config['MAX_CONTENT_LENGTH'] = max(app.config['MAX_IMAGE_UPLOAD_BYTES'], app.config['MAX_VIDEO_UPLOAD_BYTES'])
 
 # uploads 폴더가 없으면 생성
 if not os.path.exists(app.config['UPLOAD_FOLDER']):
@@ -47,6 +74,12 @@ if not os.path.exists(app.config['MUSIC_FOLDER']):
 if not os.path.exists('static/images'):
     os.makedirs('static/images')
 
+# 로컬 음악 데이터 저장소 (백엔드 연결 실패 시 사용) - 조회는 메모리 인덱스에서 처리
+local_music = music_store.MusicIndex(music_store.MusicStore(json_path=MUSIC_DATA_FILE))
+
+# 업로드 파일 저장소 (내용 해시 기준 중복 제거)
+upload_store = blob_store.BlobStore(os.path.join(app.config['UPLOAD_FOLDER'], 'blobs'))
+
 # Google OAuth 도우미 가져오기
 from oauth_helper import get_google_login_url, handle_google_callback
 
@@ -82,75 +115,236 @@ def is_user_logged_in():
     return logged_in and access_token is not None
 
 
+@app.before_request
+def start_request_deadline():
+    """라우트 예산으로 이 요청의 마감 시간 설정 - 백엔드 호출은 남은 시간만 사용"""
+    g.deadline_started, g.deadline_token = deadlines.routes.start(request.endpoint)
+
+
+@app.teardown_request
+def finish_request_deadline(error=None):
+    """마감 시간 해제 및 라우트별 예산 초과 기록"""
+    started = g.pop('deadline_started', None)
+    if started is not None:
+        deadlines.routes.finish(request.endpoint, started, g.pop('deadline_token', None))
+
+
 def check_backend_connection():
-    """백엔드 서버 연결 확인"""
+    """백엔드 서버 연결 확인 (캐시된 상태 사용 - 네트워크 호출 없음)"""
+    available = backend_health.monitor.is_available()
+    if not available:
+        print(f"백엔드 차단 상태: {backend_health.breaker.state} - 로컬 데이터를 사용합니다.")
+    return available
+
+
+def load_backend_payload(path, headers, timeout=10):
+    """백엔드 GET 호출 후 응답 본문(Payload) 반환 - 200이고 캐시 대상이면 저장
+
+    캐시에 남아 있는 이전 응답에 백엔드 ETag가 있으면 If-None-Match로 재검증하고,
+    304면 본문을 다시 받지 않고 이전 응답을 그대로 다시 저장한다.
+    같은 요청이 이미 진행 중이면 백엔드를 다시 부르지 않고 그 결과를 함께 받는다.
+    목록 엔드포인트는 backend_hedging 정책에 따라 느린 응답은 헤징, 실패는 재시도한다.
+    """
+    generation = backend_cache.cache.generation
+    cacheable = backend_cache.cache.is_cacheable(path)
+    identity = backend_cache.identity_from_headers(headers) if cacheable else None
+
+    def fetch():
+        previous = backend_cache.cache.peek(path, identity) if cacheable else None
+        request_headers = headers
+        if previous is not None and previous.upstream_etag:
+            request_headers = dict(headers, **{'If-None-Match': previous.upstream_etag})
+
+        response = backend_hedging.get(path, headers=request_headers, timeout=timeout)
+        if response.status_code == 304 and previous is not None:
+            response.close()
+            return previous
+        return backend_client.Payload.from_response(response)
+
+    payload = single_flight.flights.do(single_flight.flights.key('GET', path, headers), fetch)
+
+    # 합쳐진 요청도 각자의 사용자 키로 캐시에 저장
+    if payload.status_code == 200 and cacheable:
+        backend_cache.cache.set(path, identity, payload, generation=generation)
+    return payload
+
+
+def fetch_backend_payload(path, headers, timeout=10):
+    """백엔드 GET 응답 본문(Payload) 반환 - 목록 엔드포인트는 사용자별 캐시 사용"""
+    if backend_cache.cache.is_cacheable(path):
+        cached = backend_cache.cache.get(path, backend_cache.identity_from_headers(headers))
+        if cached is not None:
+            return cached
+    return load_backend_payload(path, headers, timeout=timeout)
+
+
+def payload_json(path, payload):
+    """Payload의 JSON (200이 아니면 None)"""
+    if payload.status_code != 200:
+        print(f"백엔드 {path} 오류 응답: {payload.status_code}")
+        return None
+    return payload.json()
+
+
+def load_backend_json(path, headers, timeout=10):
+    """백엔드 GET 호출 후 JSON 반환 (200이 아니면 None) - 캐시 대상이면 결과 저장"""
+    return payload_json(path, load_backend_payload(path, headers, timeout=timeout))
+
+
+def view_etag(*parts):
+    """응답을 결정하는 값들로 만든 강한 ETag 값 - 본문을 만들기 전에 계산할 수 있다"""
+    return hashlib.sha256(repr(parts).encode('utf-8')).hexdigest()[:32]
+
+
+def template_version():
+    """템플릿 파일 목록과 수정 시각 - 템플릿이 바뀌면 HTML ETag도 바뀌도록"""
+    folder = os.path.join(app.root_path, app.template_folder)
     try:
-        print(f"백엔드 연결 시도: {BACKEND_API_URL}/health")
-        response = requests.get(f'{BACKEND_API_URL}/health', timeout=5)
-        print(f"백엔드 응답: {response.status_code}")
-
-        if response.status_code == 200:
-            result = response.json()
-            print(f"백엔드 상태: 연결 성공")
-            return True
-        else:
-            print(f"백엔드 오류 응답: {response.text}")
-            return False
-    except requests.exceptions.ConnectionError:
-        print("백엔드 연결 실패: 서버가 실행되지 않았습니다.")
-        return False
-    except Exception as e:
-        print(f"백엔드 연결 오류: {e}")
-        return False
+        names = sorted(os.listdir(folder))
+    except OSError:
+        return None
+    return view_etag(*[(name, os.path.getmtime(os.path.join(folder, name))) for name in names])
 
 
-def load_music_data():
-    """음악 데이터 로드 (로컬 JSON 파일)"""
-    if os.path.exists(MUSIC_DATA_FILE):
-        with open(MUSIC_DATA_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return []
+TEMPLATE_VERSION = template_version()
 
 
-def save_music_data(data):
-    """음악 데이터 저장 (로컬 JSON 파일)"""
-    with open(MUSIC_DATA_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+def conditional_response(etag, build):
+    """If-None-Match가 etag와 같으면 build()를 호출하지 않고 304, 아니면 build() 결과에 ETag 설정"""
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = make_response(build())
+    response.set_etag(etag)
+    # 세션마다 내용이 다르므로 공유 캐시에는 두지 않고, 브라우저는 매번 재검증
+    response.headers.setdefault('Cache-Control', 'private, no-cache')
+    response.vary.add('Cookie')
+    return response
+
+
+def session_view_parts():
+    """화면 ETag에 넣을 세션 값 - 헤더에 그리는 사용자 정보(inject_user)가 바뀌면 ETag도 바뀜"""
+    return (session.get('user_id'), session.get('logged_in', False), session.get('user_name', ''),
+            session.get('user_picture', ''), session.get('user_email', ''))
+
+
+def payload_response(payload):
+    """Payload를 파싱하지 않고 상태 코드/헤더/본문 그대로 응답 (200이면 ETag/304 처리)"""
+    def build():
+        response = Response(payload.body, status=payload.status_code, headers=payload.headers)
+        if 'Content-Type' not in payload.headers:
+            response.mimetype = 'application/json'
+        return response
+
+    if payload.status_code != 200:
+        return build()
+    return conditional_response(payload.etag, build)
+
+
+def proxy_response(backend_response):
+    """stream=True로 받은 백엔드 응답을 읽는 대로 클라이언트에 전달 (본문 파싱 없음)"""
+    return Response(
+        backend_client.iter_body(backend_response),
+        status=backend_response.status_code,
+        headers=backend_client.passthrough_headers(backend_response)
+    )
+
+
+def fetch_backend_payload_swr(path, headers, timeout=10):
+    """stale-while-revalidate 조회 - (payload, is_stale)
+
+    TTL이 지난 캐시라도 max_stale 이내면 바로 반환하고 백그라운드에서 갱신한다.
+    캐시가 없을 때만 백엔드 응답을 기다린다.
+    """
+    identity = backend_cache.identity_from_headers(headers)
+    cached = backend_cache.cache.get_stale(path, identity)
+    if cached is not None:
+        payload, is_stale = cached
+        if is_stale:
+            backend_cache.cache.refresh_async(
+                path, identity, lambda: load_backend_payload(path, headers, timeout=timeout)
+            )
+        return payload, is_stale
+    return load_backend_payload(path, headers, timeout=timeout), False
+
+
+def fetch_backend_json_swr(path, headers, timeout=10):
+    """stale-while-revalidate 조회 - (result, is_stale, etag), 200이 아니면 result는 None"""
+    payload, is_stale = fetch_backend_payload_swr(path, headers, timeout=timeout)
+    return payload_json(path, payload), is_stale, payload.etag
+
+
+def fetch_backend_music_list(path, headers, timeout=10):
+    """백엔드 목록 API 호출 후 (musicList, is_stale, etag) 반환 (실패 응답이면 musicList는 None)"""
+    result, is_stale, etag = fetch_backend_json_swr(path, headers, timeout=timeout)
+    if not result or not result.get('success'):
+        return None, False, None
+    return result.get('data', {}).get('musicList', []), is_stale, etag
 
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
 
 
-# 날짜 형식 포맷터
+# 날짜 형식 포맷터 - 라우트에서 미리 datetime으로 바꿔 넘기는 것이 기본이고, 문자열도 처리
 @app.template_filter('format_date')
 def format_date(value, format='%Y년 %m월 %d일 %H:%M'):
     if isinstance(value, str):
-        try:
-            # ISO format 시도
-            value = datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
-        except ValueError:
-            try:
-                # GMT format 시도 ('Mon, 26 May 2025 03:36:17 GMT')
-                value = datetime.datetime.strptime(value, '%a, %d %b %Y %H:%M:%S %Z')
-            except ValueError:
-                try:
-                    # 다른 일반적인 형식들 시도
-                    for fmt in ['%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d']:
-                        try:
-                            value = datetime.datetime.strptime(value, fmt)
-                            break
-                        except ValueError:
-                            continue
-                    else:
-                        # 모든 형식이 실패하면 현재 시간 사용
-                        print(f"날짜 형식 변환 실패: {value}")
-                        value = datetime.datetime.now()
-                except:
-                    value = datetime.datetime.now()
+        parsed = date_parser.parse(value)
+        if parsed is None:
+            # 모든 형식이 실패하면 현재 시간 사용
+            print(f"날짜 형식 변환 실패: {value}")
+            parsed = datetime.datetime.now()
+        value = parsed
     return value.strftime(format)
 
 
+def backend_music_fields(music):
+    """백엔드 음악의 커서 값 (createdAt, id)"""
+    return music.get('createdAt'), music.get('id')
+
+
+def backend_music_sort_key(created_at, music_id):
+    """백엔드 음악의 keyset 정렬 키 - (UTC 기준 생성 시각, id)"""
+    parsed = date_parser.parse(created_at) if isinstance(created_at, str) else None
+    if parsed is None:
+        parsed = datetime.datetime.min
+    elif parsed.tzinfo is not None:
+        parsed = parsed.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return parsed, str(music_id)
+
+
+# 캐시된 백엔드 목록 응답별 정렬 인덱스 (같은 응답이면 다시 정렬하지 않음)
+backend_page_indexes = pagination.IndexMemo()
+
+
+def backend_page_index(music_list):
+    return backend_page_indexes.get(
+        music_list,
+        lambda items: pagination.KeysetIndex(items, backend_music_fields, backend_music_sort_key)
+    )
+
+
+# 캐시된 백엔드 목록 응답별 createdAt 변환본 (응답이 캐시에 들어온 뒤 한 번만 변환)
+backend_dated_lists = pagination.IndexMemo()
+
+
+def with_parsed_dates(music_list, source):
+    """createdAt을 datetime으로 바꾼 목록 사본 - 템플릿에 넘길 용도 (변환 실패 시 원래 값 유지)"""
+    def build(items):
+        return [
+            dict(music, createdAt=date_parser.parse(music.get('createdAt'), source) or music.get('createdAt'))
+            for music in items
+        ]
+    return backend_dated_lists.get(music_list, build)
+
+
+@app.errorhandler(413)
+def request_entity_too_large(e):
+    """업로드 크기 초과"""
+    return upload_too_large_response(app.config['MAX_CONTENT_LENGTH'])
+
+
 @app.route('/')
 def index():
     """메인 페이지 렌더링"""
@@ -208,10 +402,236 @@ def generate_music():
         }), 500
 
 
+def request_fingerprint():
+    """요청 본문 지문 - 같은 Idempotency-Key로 다른 본문을 보냈는지 확인용
+
+    multipart 요청은 boundary가 매번 달라지므로 필드 값과 파일 이름/내용으로 계산한다.
+    파일은 청크 단위로 읽고 다시 처음으로 되감는다.
+    """
+    digest = hashlib.sha256(request.query_string)
+    if request.mimetype in ('multipart/form-data', 'application/x-www-form-urlencoded'):
+        for name, value in sorted(request.form.items(multi=True)):
+            digest.update(repr(('field', name, value)).encode('utf-8'))
+        for name, file in sorted(request.files.items(multi=True), key=lambda item: item[0]):
+            digest.update(repr(('file', name, file.filename)).encode('utf-8'))
+            file.stream.seek(0)
+            for chunk in iter(lambda: file.stream.read(64 * 1024), b''):
+                digest.update(chunk)
+            file.stream.seek(0)
+    else:
+        digest.update(request.get_data(cache=True))
+    return digest.hexdigest()
+
+
+def idempotent(view):
+    """Idempotency-Key 헤더가 있으면 같은 키의 요청을 한 번만 처리
+
+    처리 중에 들어온 중복 요청은 첫 요청의 응답을 기다렸다가 같은 응답을 받고,
+    끝난 뒤의 재요청에는 보관된 응답을 Idempotent-Replayed 헤더와 함께 다시 보낸다.
+    키는 사용자/메서드/경로별로 구분하고, 같은 키로 본문이 다른 요청은 422로 거절한다.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(idempotency.HEADER)
+        if not key:
+            return view(*args, **kwargs)
+        if len(key) > idempotency.IDEMPOTENCY_MAX_KEY_LENGTH:
+            return jsonify({
+                'success': False,
+                'error': 'Idempotency-Key가 너무 깁니다.'
+            }), 400
+
+        produced = {}
+
+        def handler():
+            response = make_response(view(*args, **kwargs))
+            produced['response'] = response
+            headers = [(name, value) for name, value in response.headers if name.lower() != 'set-cookie']
+            return idempotency.StoredResponse(response.status_code, headers, response.get_data())
+
+        try:
+            stored, replayed = idempotency.store.run(
+                (session.get('user_id', 'anonymous'), request.method, request.path, key), handler,
+                fingerprint=request_fingerprint
+            )
+        except idempotency.FingerprintMismatch:
+            return jsonify({
+                'success': False,
+                'error': '같은 Idempotency-Key로 내용이 다른 요청을 보냈습니다. 새 키를 사용해주세요.'
+            }), 422
+        except idempotency.KeyInProgress:
+            return jsonify({
+                'success': False,
+                'error': '같은 요청을 처리하고 있습니다. 잠시 후 다시 시도해주세요.'
+            }), 409
+
+        if not replayed:
+            return produced['response']
+        print(f"♻️ 같은 Idempotency-Key 요청 - 이전 응답 재사용: {request.method} {request.path}")
+        response = Response(stored.body, status=stored.status_code, headers=stored.headers)
+        response.headers[idempotency.REPLAYED_HEADER] = 'true'
+        return response
+
+    return wrapper
+
+
+def rate_limited(rule, error_key='message'):
+    """rate_limit 규칙으로 사용자별 요청 속도 제한 - 초과하면 429 + Retry-After
+
+    error_key는 기존 응답과 같은 오류 메시지 필드 이름 (좋아요: message, 삭제: error).
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            identity = session.get('user_id') or f"ip:{request.remote_addr}"
+            allowed, retry_after = rate_limit.limiter.check(rule, identity)
+            if not allowed:
+                print(f"🚦 요청 속도 제한 ({rule}): {identity}")
+                response = jsonify({
+                    'success': False,
+                    error_key: '요청이 너무 많습니다. 잠시 후 다시 시도해주세요.'
+                })
+                response.status_code = 429
+                response.headers['Retry-After'] = str(retry_after)
+                return response
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def admit_generation():
+    """생성 작업 자리 확보 - 입장하면 None, 거절되면 429/503 응답 (Retry-After 포함)
+
+    확보한 자리는 submit_generation_job()으로 작업에 넘기고, 넘기지 않으면 요청이 끝날 때 해제된다.
+    """
+    owner = session.get('user_id') or f"ip:{request.remote_addr}"
+    try:
+        g.generation_slot = admission.controller.acquire(owner)
+    except admission.Rejected as e:
+        print(f"🚦 음악 생성 요청 거절 ({e.reason}): {owner}")
+        response = jsonify({
+            'success': False,
+            'error': e.message
+        })
+        response.status_code = e.status_code
+        response.headers['Retry-After'] = str(e.retry_after)
+        return response
+    return None
+
+
+def submit_generation_job(kind, fn, *args):
+    """생성 작업 등록 - 요청이 확보한 자리는 등록에 성공한 뒤에만 작업에 넘김
+
+    등록 중 예외가 나면 자리는 요청에 남아 있으므로 요청이 끝날 때 해제된다.
+    작업이 먼저 끝나 해제해도 자리 해제는 한 번만 일어난다.
+    """
+    slot = g.get('generation_slot')
+    job = generation_jobs.jobs.submit(
+        kind, session.get('user_id', 'anonymous'), fn, *args,
+        on_finish=slot.release if slot is not None else None
+    )
+    if slot is not None:
+        g.pop('generation_slot').claim()
+    return job
+
+
+@app.teardown_request
+def release_generation_slot(error=None):
+    """작업에 넘기지 않은 생성 자리 해제 (입력 오류, 캐시 적중 등)"""
+    slot = g.pop('generation_slot', None)
+    if slot is not None:
+        slot.release()
+
+
+def generation_job_response(job):
+    """생성 작업 접수 응답 - 결과는 /jobs/<job_id>로 확인"""
+    return jsonify({
+        'success': True,
+        'job_id': job.id,
+        'status': job.state,
+        'status_url': url_for('get_generation_job', job_id=job.id),
+        'events_url': url_for('stream_generation_job', job_id=job.id)
+    }), 202
+
+
+def run_detail_generation(params):
+    """상세 내용 기반 음악 생성 작업 (워커 스레드에서 실행)"""
+    music_id = params['music_id']
+
+    # 백엔드 연결 확인 및 시도
+    if check_backend_connection():
+        try:
+            api_data = {
+                'prompt1': params['prompt1'],
+                'prompt2': params['prompt2']
+            }
+
+            generation_jobs.jobs.report_progress(generation_jobs.WAITING_BACKEND)
+            response = backend_client.post(
+                '/generate-music',
+                json=api_data,
+                headers=params['headers'],
+                timeout=30
+            )
+
+            if response.status_code == 200:
+                result = response.json()
+                if result.get('success'):
+                    music_data = result.get('data', {})
+
+                    print(f"✓ 백엔드에서 최종 음악 생성 성공: {music_data.get('title')}")
+                    backend_cache.invalidate_music_lists()
+                    generation_cache.cache.put(params['cache_key'], music_data)
+
+                    return {
+                        'success': True,
+                        'music_id': music_id,
+                        'music_url': music_data.get('musicUrl'),
+                        'title': music_data.get('title'),
+                        'redirect_url': params['redirect_url'],
+                        'cached': False
+                    }
+            else:
+                print(f"백엔드 음악 생성 오류: {response.status_code} - {response.text}")
+        except requests.RequestException as e:
+            print(f"백엔드 요청 오류: {e}")
+
+    # 로컬 처리 (백엔드 연결 실패 시)
+    detail_text = params['detail_text']
+    created_at = datetime.datetime.now().isoformat()
+
+    new_music_data = {
+        'id': music_id,
+        'title': f"{detail_text[:30]}{'...' if len(detail_text) > 30 else ''}",
+        'full_prompt': params['prompt1'],
+        'detail_text': detail_text,
+        'original_settings': params['music_settings'],
+        'created_at': created_at,
+        'file_path': f'{music_id}.mp3',
+        'user_id': params['user_id']
+    }
+
+    # 기존 임시 데이터가 있으면 교체, 없으면 새로 추가
+    local_music.save(new_music_data)
+
+    print(f"✓ 로컬에 최종 음악 데이터 저장: {new_music_data['title']}")
+
+    return {
+        'success': True,
+        'music_id': music_id,
+        'redirect_url': params['redirect_url'],
+        'cached': False
+    }
+
+
 # 기존 /generate-music-with-detail을 실제 음악 생성으로 수정
 @app.route('/generate-music-with-detail', methods=['POST'])
+@idempotent
 def generate_music_with_detail():
-    """실제 음악 생성 - 기본 설정 + 상세 내용 통합"""
+    """실제 음악 생성 - 기본 설정 + 상세 내용 통합 (작업 접수 후 바로 반환)
+
+    같은 프롬프트로 백엔드에서 만든 결과가 생성 캐시에 있으면 작업 없이 바로 반환한다.
+    """
     try:
         data = request.get_json()
         print(f"최종 음악 생성 요청: {data}")
@@ -223,7 +643,7 @@ def generate_music_with_detail():
             }), 400
 
         detail_text = data.get('detail_text')
-        music_id = data.get('music_id', '')
+        music_id = data.get('music_id') or str(uuid.uuid4())
 
         # 세션에서 기본 설정 불러오기
         music_settings = session.get('music_settings', {})
@@ -242,100 +662,202 @@ def generate_music_with_detail():
 
         print(f"통합된 프롬프트: {prompt2}")
 
-        # 백엔드 연결 확인 및 시도
-        if check_backend_connection():
-            try:
-                api_data = {
-                    'prompt1': prompt1,
-                    'prompt2': prompt2
-                }
-
-                response = requests.post(
-                    f'{BACKEND_API_URL}/generate-music',
-                    json=api_data,
-                    headers=get_auth_headers(),
-                    timeout=30
-                )
-
-                if response.status_code == 200:
-                    result = response.json()
-                    if result.get('success'):
-                        music_data = result.get('data', {})
-                        new_music_id = str(uuid.uuid4())
+        cache_key = generation_cache.cache.key(session.get('user_id'), music_settings, detail_text)
+        cached = generation_cache.cache.get(cache_key)
+        if cached:
+            print(f"♻️ 같은 프롬프트의 생성 결과 재사용: {cached.get('title')}")
+            session.pop('music_settings', None)
+            # 이번 요청의 music_id로는 아무것도 생성되지 않았으므로 저장된 음악의 id를 돌려줌
+            return jsonify({
+                'success': True,
+                'music_id': cached['id'],
+                'music_url': cached.get('musicUrl'),
+                'title': cached.get('title'),
+                'redirect_url': url_for('generation_complete', music_id=cached['id']),
+                'cached': True
+            })
+
+        rejected = admit_generation()
+        if rejected is not None:
+            return rejected
+
+        # 워커 스레드에서는 session/request를 쓸 수 없으므로 필요한 값을 미리 준비
+        job = submit_generation_job('detail', run_detail_generation, {
+            'music_id': music_id,
+            'prompt1': prompt1,
+            'prompt2': prompt2,
+            'detail_text': detail_text,
+            'music_settings': music_settings,
+            'cache_key': cache_key,
+            'headers': get_auth_headers(),
+            'user_id': session.get('user_id', 'anonymous'),
+            'redirect_url': url_for('generation_complete', music_id=music_id)
+        })
 
-                        print(f"✓ 백엔드에서 최종 음악 생성 성공: {music_data.get('title')}")
+        # 세션에서 설정값 제거
+        session.pop('music_settings', None)
 
-                        # 세션에서 설정값 제거
-                        session.pop('music_settings', None)
+        return generation_job_response(job)
 
-                        return jsonify({
-                            'success': True,
-                            'music_id': new_music_id,
-                            'music_url': music_data.get('musicUrl'),
-                            'title': music_data.get('title'),
-                            'redirect_url': url_for('generation_complete', music_id=new_music_id)
-                        })
-                else:
-                    print(f"백엔드 음악 생성 오류: {response.status_code} - {response.text}")
-            except requests.RequestException as e:
-                print(f"백엔드 요청 오류: {e}")
+    except Exception as e:
+        print(f"최종 음악 생성 오류: {e}")
+        return jsonify({
+            'success': False,
+            'error': f'서버 오류: {str(e)}'
+        }), 500
 
-        # 로컬 처리 (백엔드 연결 실패 시)
-        if not music_id:
-            music_id = str(uuid.uuid4())
 
-        created_at = datetime.datetime.now().isoformat()
+def post_upload_to_backend(path, field_name, params, timeout):
+    """저장된 업로드 파일을 청크 단위로 읽어 백엔드에 multipart 전송 (메모리 사용량 일정)"""
+    generation_jobs.jobs.report_progress(generation_jobs.UPLOADING)
+    files = {field_name: (params['filename'], params['file_path'], params['content_type'])}
+    with backend_client.MultipartStream(
+        files,
+        on_complete=lambda: generation_jobs.jobs.report_progress(generation_jobs.WAITING_BACKEND)
+    ) as body:
+        headers = dict(params['headers'], **{'Content-Type': body.content_type})
+        return backend_client.post(path, data=body, headers=headers, timeout=timeout)
 
-        new_music_data = {
-            'id': music_id,
-            'title': f"{detail_text[:30]}{'...' if len(detail_text) > 30 else ''}",
-            'full_prompt': prompt1,
-            'detail_text': detail_text,
-            'original_settings': music_settings,
-            'created_at': created_at,
-            'file_path': f'{music_id}.mp3',
-            'user_id': session.get('user_id', 'anonymous')
-        }
 
-        music_list = load_music_data()
+def upload_too_large(limit):
+    """Content-Length로 본문을 읽기 전에 크기 초과 여부 판단"""
+    return request.content_length is not None and request.content_length > limit
 
-        # 기존 임시 데이터가 있으면 교체, 없으면 새로 추가
-        existing_index = -1
-        for i, music in enumerate(music_list):
-            if music['id'] == music_id:
-                existing_index = i
-                break
 
-        if existing_index >= 0:
-            music_list[existing_index] = new_music_data
-        else:
-            music_list.append(new_music_data)
+def upload_too_large_response(limit):
+    return jsonify({
+        'success': False,
+        'error': f'파일이 너무 큽니다. 최대 {limit // (1024 * 1024)}MB까지 업로드할 수 있습니다.'
+    }), 413
 
-        save_music_data(music_list)
 
-        # 세션에서 설정값 제거
-        session.pop('music_settings', None)
+def submit_upload_generation(kind, digest, filename, content_type):
+    """업로드 저장소에 들어간 이미지/동영상 파일로 음악 생성 작업 등록
 
-        print(f"✓ 로컬에 최종 음악 데이터 저장: {new_music_data['title']}")
+    put_stream/put_file이 잡은 파일 참조는 작업이 끝날 때 run_upload_generation이 해제한다.
+    작업 등록에 실패하면 참조를 넘겨받을 작업이 없으므로 여기서 해제한다.
+    """
+    headers = {}
+    # JWT 토큰이 있으면 추가
+    if 'access_token' in session:
+        headers['Authorization'] = f'Bearer {session["access_token"]}'
 
-        return jsonify({
-            'success': True,
+    runner = run_video_generation if kind == 'video' else run_image_generation
+    music_id = str(uuid.uuid4())
+    try:
+        return submit_generation_job(kind, run_upload_generation, runner, {
+            'kind': kind,
             'music_id': music_id,
-            'redirect_url': url_for('generation_complete', music_id=music_id)
+            'digest': digest,
+            'file_path': upload_store.path(digest),
+            'filename': filename,
+            'content_type': content_type,
+            'headers': headers,
+            'user_id': session.get('user_id', 'anonymous'),
+            'redirect_url': url_for('generation_complete', music_id=music_id),
+            'complete_url': url_for('generation_complete')
         })
+    except Exception:
+        upload_store.release(digest)
+        raise
 
-    except Exception as e:
-        print(f"최종 음악 생성 오류: {e}")
-        return jsonify({
-            'success': False,
-            'error': f'서버 오류: {str(e)}'
-        }), 500
+
+def run_upload_generation(runner, params):
+    """업로드 기반 생성 작업 공통 처리 (워커 스레드에서 실행)
+
+    같은 사용자가 같은 파일로 이미 백엔드에서 만든 음악이 있으면 다시 업로드하지 않고 그 결과를 쓴다.
+    로컬 기록이 파일을 참조하지 않으면 작업이 끝날 때 파일 참조를 해제한다.
+    """
+    digest = params['digest']
+    try:
+        music_data = upload_store.backend_result(params['user_id'], digest, params['kind'])
+        if music_data:
+            print(f"♻️ 같은 파일의 이전 생성 결과 재사용: {music_data.get('title')}")
+            # 새 기록을 만들지 않으므로 이전에 만든 음악의 id를 돌려줌
+            music_id = music_data.get('id') or params['music_id']
+            return {
+                'success': True,
+                'music_id': music_id,
+                'music_url': music_data.get('musicUrl'),
+                'title': music_data.get('title'),
+                'redirect_url': f"{params['complete_url']}?{urlencode({'music_id': music_id})}"
+            }
+        return runner(params)
+    finally:
+        if not params.get('keep_blob'):
+            upload_store.release(digest)
+
+
+def run_image_generation(params):
+    """이미지 기반 음악 생성 작업 (워커 스레드에서 실행)"""
+    music_id = params['music_id']
+
+    # 백엔드 연결 시도
+    if check_backend_connection():
+        try:
+            response = post_upload_to_backend(
+                '/generate-music/image',
+                'image',
+                params,
+                timeout=60
+            )
+
+            if response.status_code == 200:
+                result = response.json()
+                if result.get('success'):
+                    music_data = result.get('data', {})
+                    backend_cache.invalidate_music_lists()
+                    upload_store.save_backend_result(params['user_id'], params['digest'], 'image', music_data)
+
+                    return {
+                        'success': True,
+                        'music_id': music_id,
+                        'music_url': music_data.get('musicUrl'),
+                        'title': music_data.get('title'),
+                        'redirect_url': params['redirect_url']
+                    }
+        except requests.RequestException:
+            pass
+
+    # 로컬 처리 (백엔드 연결 실패 시)
+    title = f"이미지 음악 {datetime.datetime.now().strftime('%Y-%m-%d %H:%M')}"
+
+    new_music = {
+        'id': music_id,
+        'user_id': params['user_id'],
+        'title': title,
+        'mood': "이미지 기반",
+        'location': "이미지",
+        'tempo': random.randint(60, 180),
+        'file_path': f"music_{music_id}.mp3",
+        'created_at': datetime.datetime.now().isoformat(),
+        'source_digest': params['digest']
+    }
+
+    local_music.save(new_music)
+    # 로컬 기록이 원본 파일을 참조하므로 삭제될 때까지 참조 유지
+    params['keep_blob'] = True
+
+    return {
+        'success': True,
+        'music_id': music_id,
+        'redirect_url': params['redirect_url']
+    }
 
 
 @app.route('/generate-music-from-image', methods=['POST'])
+@idempotent
 def generate_music_from_image():
-    """이미지 기반 음악 생성"""
+    """이미지 기반 음악 생성 (작업 접수 후 바로 반환)"""
     try:
+        if upload_too_large(app.config['MAX_IMAGE_UPLOAD_BYTES']):
+            return upload_too_large_response(app.config['MAX_IMAGE_UPLOAD_BYTES'])
+
+        # 자리가 없으면 파일을 받기 전에 거절
+        rejected = admit_generation()
+        if rejected is not None:
+            return rejected
+
         if 'image' not in request.files:
             return jsonify({
                 'success': False,
@@ -350,7 +872,7 @@ def generate_music_from_image():
                 'error': '파일이 선택되지 않았습니다'
             }), 400
 
-        allowed_extensions = {'png', 'jpg', 'jpeg', 'gif'}
+        allowed_extensions = app.config['IMAGE_EXTENSIONS']
         if not ('.' in image_file.filename and
                 image_file.filename.rsplit('.', 1)[1].lower() in allowed_extensions):
             return jsonify({
@@ -358,66 +880,11 @@ def generate_music_from_image():
                 'error': '허용되지 않는 파일 형식입니다'
             }), 400
 
-        # 백엔드 연결 시도
-        if check_backend_connection():
-            try:
-                files = {'image': (image_file.filename, image_file, image_file.content_type)}
-                headers = {}
-                if 'access_token' in session:
-                    headers['Authorization'] = f'Bearer {session["access_token"]}'
-
-                response = requests.post(
-                    f'{BACKEND_API_URL}/generate-music/image',
-                    files=files,
-                    headers=headers,
-                    timeout=60
-                )
-
-                if response.status_code == 200:
-                    result = response.json()
-                    if result.get('success'):
-                        music_data = result.get('data', {})
-                        music_id = str(uuid.uuid4())
-
-                        return jsonify({
-                            'success': True,
-                            'music_id': music_id,
-                            'music_url': music_data.get('musicUrl'),
-                            'title': music_data.get('title'),
-                            'redirect_url': url_for('generation_complete', music_id=music_id)
-                        })
-            except requests.RequestException:
-                pass
-
-        # 로컬 처리 (백엔드 연결 실패 시)
-        filename = secure_filename(image_file.filename)
-        image_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        image_file.save(image_path)
-
-        user_id = session.get('user_id', 'anonymous')
-        title = f"이미지 음악 {datetime.datetime.now().strftime('%Y-%m-%d %H:%M')}"
-        music_id = str(uuid.uuid4())
-
-        new_music = {
-            'id': music_id,
-            'user_id': user_id,
-            'title': title,
-            'mood': "이미지 기반",
-            'location': "이미지",
-            'tempo': random.randint(60, 180),
-            'file_path': f"music_{music_id}.mp3",
-            'created_at': datetime.datetime.now().isoformat()
-        }
+        # 요청이 끝나면 업로드 스트림이 닫히므로 작업 전에 저장소에 저장 (같은 파일은 한 번만 저장)
+        digest, _ = upload_store.put_stream(image_file.stream)
 
-        music_list = load_music_data()
-        music_list.append(new_music)
-        save_music_data(music_list)
-
-        return jsonify({
-            'success': True,
-            'music_id': music_id,
-            'redirect_url': url_for('generation_complete', music_id=music_id)
-        })
+        job = submit_upload_generation('image', digest, image_file.filename, image_file.content_type)
+        return generation_job_response(job)
 
     except Exception as e:
         return jsonify({
@@ -426,10 +893,90 @@ def generate_music_from_image():
         }), 500
 
 
+def run_video_generation(params):
+    """동영상 기반 음악 생성 작업 - 백엔드 우선 호출 (워커 스레드에서 실행)"""
+    music_id = params['music_id']
+
+    # 백엔드 연결 시도
+    if check_backend_connection():
+        try:
+            print("🔄 백엔드 API 호출 시도 - 동영상 기반 음악 생성")
+
+            response = post_upload_to_backend(
+                '/generate-music/video',
+                'video',
+                params,
+                timeout=120  # 동영상은 처리 시간이 더 길 수 있음
+            )
+
+            print(f"📊 백엔드 응답: {response.status_code}")
+
+            if response.status_code == 200:
+                result = response.json()
+                if result.get('success'):
+                    music_data = result.get('data', {})
+
+                    print(f"✅ 백엔드 동영상 음악 생성 성공: {music_data.get('title')}")
+                    backend_cache.invalidate_music_lists()
+                    upload_store.save_backend_result(params['user_id'], params['digest'], 'video', music_data)
+
+                    return {
+                        'success': True,
+                        'music_id': music_id,
+                        'music_url': music_data.get('musicUrl'),
+                        'title': music_data.get('title'),
+                        'redirect_url': params['redirect_url']
+                    }
+
+        except requests.RequestException as e:
+            print(f"💥 백엔드 요청 실패: {str(e)}")
+        except Exception as e:
+            print(f"💥 백엔드 처리 실패: {str(e)}")
+
+    # 백엔드 실패시 로컬 처리 (파일은 접수 시 이미 저장됨)
+    print("🏠 로컬 동영상 처리 모드로 전환")
+
+    title = f"동영상 음악 {datetime.datetime.now().strftime('%Y-%m-%d %H:%M')}"
+
+    new_music = {
+        'id': music_id,
+        'user_id': params['user_id'],
+        'title': title,
+        'mood': "동영상 기반",
+        'location': "동영상",
+        'tempo': random.randint(60, 180),
+        'file_path': f"music_{music_id}.mp3",
+        'created_at': datetime.datetime.now().isoformat(),
+        'source_type': 'video',
+        'source_digest': params['digest']
+    }
+
+    local_music.save(new_music)
+    # 로컬 기록이 원본 파일을 참조하므로 삭제될 때까지 참조 유지
+    params['keep_blob'] = True
+
+    print(f"🏠 로컬 동영상 음악 생성 완료: {title}")
+
+    return {
+        'success': True,
+        'music_id': music_id,
+        'redirect_url': params['redirect_url']
+    }
+
+
 @app.route('/generate-music-from-video', methods=['POST'])
+@idempotent
 def generate_music_from_video():
-    """동영상 기반 음악 생성 - 백엔드 우선 호출"""
+    """동영상 기반 음악 생성 (작업 접수 후 바로 반환)"""
     try:
+        if upload_too_large(app.config['MAX_VIDEO_UPLOAD_BYTES']):
+            return upload_too_large_response(app.config['MAX_VIDEO_UPLOAD_BYTES'])
+
+        # 자리가 없으면 파일을 받기 전에 거절
+        rejected = admit_generation()
+        if rejected is not None:
+            return rejected
+
         if 'video' not in request.files:
             return jsonify({
                 'success': False,
@@ -444,7 +991,7 @@ def generate_music_from_video():
                 'error': '파일이 선택되지 않았습니다'
             }), 400
 
-        allowed_extensions = {'mp4', 'mov', 'avi', 'mkv', 'webm'}
+        allowed_extensions = app.config['VIDEO_EXTENSIONS']
         if not ('.' in video_file.filename and
                 video_file.filename.rsplit('.', 1)[1].lower() in allowed_extensions):
             return jsonify({
@@ -452,182 +999,288 @@ def generate_music_from_video():
                 'error': '허용되지 않는 파일 형식입니다'
             }), 400
 
-        # 백엔드 연결 시도
-        if check_backend_connection():
-            try:
-                print("🔄 백엔드 API 호출 시도 - 동영상 기반 음악 생성")
-                
-                # 파일을 메모리에서 다시 읽기 위해 시작 위치로 이동
-                video_file.seek(0)
-                
-                files = {'video': (video_file.filename, video_file, video_file.content_type)}
-                headers = {}
-                
-                # JWT 토큰이 있으면 추가
-                if 'access_token' in session:
-                    headers['Authorization'] = f'Bearer {session["access_token"]}'
+        # 요청이 끝나면 업로드 스트림이 닫히므로 작업 전에 저장소에 저장 (같은 파일은 한 번만 저장)
+        digest, _ = upload_store.put_stream(video_file.stream)
 
-                response = requests.post(
-                    f'{BACKEND_API_URL}/generate-music/video',
-                    files=files,
-                    headers=headers,
-                    timeout=120  # 동영상은 처리 시간이 더 길 수 있음
-                )
+        job = submit_upload_generation('video', digest, video_file.filename, video_file.content_type)
+        return generation_job_response(job)
 
-                print(f"📊 백엔드 응답: {response.status_code}")
+    except Exception as e:
+        print(f"🚨 동영상 음악 생성 오류: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': f'서버 오류: {str(e)}'
+        }), 500
 
-                if response.status_code == 200:
-                    result = response.json()
-                    if result.get('success'):
-                        music_data = result.get('data', {})
-                        music_id = str(uuid.uuid4())
 
-                        print(f"✅ 백엔드 동영상 음악 생성 성공: {music_data.get('title')}")
+# ---- 이어받기(resumable) 업로드 ----
+# 1) POST /uploads/sessions            세션 생성 (kind, filename, size, content_type)
+# 2) PUT  /uploads/sessions/<id>/chunks/<n>  청크 업로드 (X-Chunk-Offset, X-Chunk-Checksum: sha256 hex)
+# 3) GET  /uploads/sessions/<id>       받은 청크 / 빠진 청크 확인
+# 4) POST /uploads/sessions/<id>/complete  청크 조립 후 음악 생성 작업 등록
 
-                        return jsonify({
-                            'success': True,
-                            'music_id': music_id,
-                            'music_url': music_data.get('musicUrl'),
-                            'title': music_data.get('title'),
-                            'redirect_url': url_for('generation_complete', music_id=music_id)
-                        })
-                        
-            except requests.RequestException as e:
-                print(f"💥 백엔드 요청 실패: {str(e)}")
-            except Exception as e:
-                print(f"💥 백엔드 처리 실패: {str(e)}")
+def upload_error_response(error):
+    return jsonify({
+        'success': False,
+        'error': error.message
+    }), error.status_code
 
-        # 백엔드 실패시 로컬 처리
-        print("🏠 로컬 동영상 처리 모드로 전환")
-        
-        # 파일을 다시 시작 위치로 이동
-        video_file.seek(0)
-        
-        filename = secure_filename(video_file.filename)
-        video_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        video_file.save(video_path)
-
-        user_id = session.get('user_id', 'anonymous')
-        title = f"동영상 음악 {datetime.datetime.now().strftime('%Y-%m-%d %H:%M')}"
-        music_id = str(uuid.uuid4())
-
-        new_music = {
-            'id': music_id,
-            'user_id': user_id,
-            'title': title,
-            'mood': "동영상 기반",
-            'location': "동영상",
-            'tempo': random.randint(60, 180),
-            'file_path': f"music_{music_id}.mp3",
-            'created_at': datetime.datetime.now().isoformat(),
-            'source_type': 'video'
-        }
 
-        music_list = load_music_data()
-        music_list.append(new_music)
-        save_music_data(music_list)
+@app.route('/uploads/sessions', methods=['POST'])
+def create_upload_session():
+    """이어받기 업로드 세션 생성"""
+    try:
+        data = request.get_json() or {}
+        kind = data.get('kind')
+        filename = data.get('filename', '')
+
+        if kind not in ('image', 'video'):
+            return jsonify({
+                'success': False,
+                'error': 'kind는 image 또는 video여야 합니다'
+            }), 400
+
+        allowed_extensions = app.config['IMAGE_EXTENSIONS'] if kind == 'image' else app.config['VIDEO_EXTENSIONS']
+        if not ('.' in filename and filename.rsplit('.', 1)[1].lower() in allowed_extensions):
+            return jsonify({
+                'success': False,
+                'error': '허용되지 않는 파일 형식입니다'
+            }), 400
 
-        print(f"🏠 로컬 동영상 음악 생성 완료: {title}")
+        max_size = app.config['MAX_IMAGE_UPLOAD_BYTES'] if kind == 'image' else app.config['MAX_VIDEO_UPLOAD_BYTES']
+        meta = resumable_uploads.create_session(
+            app.config['UPLOAD_FOLDER'],
+            kind,
+            filename,
+            int(data.get('size', 0)),
+            data.get('content_type') or 'application/octet-stream',
+            session.get('user_id', 'anonymous'),
+            max_size
+        )
 
         return jsonify({
             'success': True,
-            'music_id': music_id,
-            'redirect_url': url_for('generation_complete', music_id=music_id)
+            'upload_id': meta['upload_id'],
+            'chunk_size': meta['chunk_size'],
+            'total_chunks': meta['total_chunks'],
+            'status_url': url_for('get_upload_session', upload_id=meta['upload_id']),
+            'complete_url': url_for('complete_upload_session', upload_id=meta['upload_id'])
+        }), 201
+
+    except resumable_uploads.UploadError as e:
+        return upload_error_response(e)
+    except (TypeError, ValueError):
+        return jsonify({
+            'success': False,
+            'error': '파일 크기가 올바르지 않습니다.'
+        }), 400
+
+
+@app.route('/uploads/sessions/<upload_id>/chunks/<int:index>', methods=['PUT'])
+def put_upload_chunk(upload_id, index):
+    """청크 하나 업로드 (같은 청크를 다시 보내면 덮어씀)"""
+    try:
+        meta = resumable_uploads.load_session(app.config['UPLOAD_FOLDER'], upload_id, session.get('user_id', 'anonymous'))
+        offset = request.headers.get('X-Chunk-Offset', type=int)
+        checksum = request.headers.get('X-Chunk-Checksum')
+
+        length = resumable_uploads.write_chunk(app.config['UPLOAD_FOLDER'], meta, index, offset, checksum, request.stream)
+        return jsonify({
+            'success': True,
+            'index': index,
+            'length': length
         })
 
+    except resumable_uploads.UploadError as e:
+        return upload_error_response(e)
+
+
+@app.route('/uploads/sessions/<upload_id>', methods=['GET'])
+def get_upload_session(upload_id):
+    """받은 청크 목록 조회 - 끊긴 업로드를 이어서 보낼 때 사용"""
+    try:
+        meta = resumable_uploads.load_session(app.config['UPLOAD_FOLDER'], upload_id, session.get('user_id', 'anonymous'))
+        return jsonify(dict(resumable_uploads.session_status(app.config['UPLOAD_FOLDER'], meta), success=True))
+
+    except resumable_uploads.UploadError as e:
+        return upload_error_response(e)
+
+
+@app.route('/uploads/sessions/<upload_id>/complete', methods=['POST'])
+@idempotent
+def complete_upload_session(upload_id):
+    """청크를 하나의 파일로 합치고 음악 생성 작업 등록"""
+    try:
+        meta = resumable_uploads.load_session(app.config['UPLOAD_FOLDER'], upload_id, session.get('user_id', 'anonymous'))
+
+        rejected = admit_generation()
+        if rejected is not None:
+            return rejected
+
+        file_path = os.path.join(upload_store.tmp_dir, meta['upload_id'])
+        resumable_uploads.assemble(app.config['UPLOAD_FOLDER'], meta, file_path)
+        digest, _ = upload_store.put_file(file_path)
+
+        job = submit_upload_generation(meta['kind'], digest, meta['filename'], meta['content_type'])
+        return generation_job_response(job)
+
+    except resumable_uploads.UploadError as e:
+        return upload_error_response(e)
     except Exception as e:
-        print(f"🚨 동영상 음악 생성 오류: {str(e)}")
+        print(f"🚨 이어받기 업로드 완료 오류: {str(e)}")
         return jsonify({
             'success': False,
             'error': f'서버 오류: {str(e)}'
         }), 500
 
 
-@app.route('/playlist')
-def playlist():
-    """플레이리스트 페이지"""
-    try:
-        # 백엔드 연결 시도
-        if check_backend_connection():
-            try:
-                headers = get_auth_headers()
+@app.route('/jobs/<job_id>')
+def get_generation_job(job_id):
+    """음악 생성 작업 상태 조회"""
+    job = generation_jobs.jobs.get(job_id)
+    if job is None or job.owner != session.get('user_id', 'anonymous'):
+        return jsonify({
+            'success': False,
+            'error': '작업을 찾을 수 없습니다.'
+        }), 404
 
-                if 'access_token' in session:
-                    response = requests.get(
-                        f'{BACKEND_API_URL}/myplaylist',
-                        headers=headers,
-                        timeout=10
-                    )
-                else:
-                    response = requests.get(
-                        f'{BACKEND_API_URL}/playlist',
-                        headers={'Content-Type': 'application/json'},
-                        timeout=10
-                    )
+    return jsonify(dict(job.to_dict(), success=True))
 
-                if response.status_code == 200:
-                    result = response.json()
-                    if result.get('success'):
-                        data = result.get('data', {})
-                        music_list = data.get('musicList', [])
-
-                        # 백엔드 데이터 형식에 맞게 변환
-                        converted_music_list = []
-                        for music in music_list:
-                            converted_music = {
-                                'id': music.get('id'),
-                                'title': music.get('title'),
-                                'music_url': music.get('musicUrl'),
-                                'created_at': music.get('createdAt'),  # 날짜 형식 그대로 사용
-                                'user_id': session.get('user_id', 'anonymous')
-                            }
-                            converted_music_list.append(converted_music)
-
-                        music_list = converted_music_list
-
-                        music_id = request.args.get('music_id')
-                        selected_music = None
-                        if music_id:
-                            for music in music_list:
-                                if str(music.get('id')) == music_id:
-                                    selected_music = music
-                                    break
-
-                        print(f"✓ 백엔드에서 플레이리스트 로드 성공: {len(music_list)}개 음악")
-                        return render_template('playlist.html', music_list=music_list, music=selected_music)
-            except requests.RequestException as e:
-                print(f"백엔드 플레이리스트 요청 오류: {e}")
-            except Exception as e:
-                print(f"백엔드 플레이리스트 처리 오류: {e}")
 
-        # 로컬 데이터 사용
-        print("백엔드 연결 실패. 로컬 플레이리스트를 사용합니다.")
-        music_list = load_music_data()
+@app.route('/jobs/<job_id>/events')
+def stream_generation_job(job_id):
+    """음악 생성 진행 상황 스트림 (Server-Sent Events)"""
+    job = generation_jobs.jobs.get(job_id)
+    if job is None or job.owner != session.get('user_id', 'anonymous'):
+        return jsonify({
+            'success': False,
+            'error': '작업을 찾을 수 없습니다.'
+        }), 404
 
-        # 로그인한 사용자의 음악만 필터링
-        if 'user_id' in session:
-            music_list = [music for music in music_list if music['user_id'] == session['user_id']]
+    return Response(
+        generation_jobs.jobs.events(job),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
 
-        # 생성일 기준 내림차순 정렬 (created_at이 있는 경우에만)
-        music_list = [music for music in music_list if 'created_at' in music]
-        music_list.sort(key=lambda x: x['created_at'], reverse=True)
 
-        # URL 파라미터에서 music_id 확인하여 선택된 음악 찾기
-        music_id = request.args.get('music_id')
-        selected_music = None
-        if music_id:
-            for music in music_list:
-                if music['id'] == music_id:
-                    selected_music = music
-                    break
+def convert_backend_music(music, source):
+    """백엔드 음악 항목을 플레이리스트 템플릿 형식으로 변환 (생성일은 datetime으로)"""
+    created_at = music.get('createdAt')
+    return {
+        'id': music.get('id'),
+        'title': music.get('title'),
+        'music_url': music.get('musicUrl'),
+        'created_at': date_parser.parse(created_at, source) or created_at,
+        'user_id': session.get('user_id', 'anonymous')
+    }
+
 
-        return render_template('playlist.html', music_list=music_list, music=selected_music)
+def load_playlist_page(after=None, limit=pagination.PLAYLIST_PAGE_SIZE, music_id=None):
+    """플레이리스트 한 페이지 로드 (백엔드 우선, 실패 시 로컬) - /playlist와 /playlist/items 공용
+
+    반환값: (music_list, next_cursor, selected_music, stale_data, version)
+    version은 페이지 내용을 결정하는 원본의 버전 (백엔드 응답 ETag 또는 로컬 저장소 버전)
+    """
+    if check_backend_connection():
+        try:
+            headers = get_auth_headers()
+
+            if 'access_token' in session:
+                path = '/myplaylist'
+                result, stale_data, etag = fetch_backend_json_swr(path, headers)
+            else:
+                path = '/playlist'
+                result, stale_data, etag = fetch_backend_json_swr(path, {'Content-Type': 'application/json'})
+
+            if result is not None and result.get('success'):
+                index = backend_page_index(result.get('data', {}).get('musicList', []))
+                page, next_cursor = index.page(after, limit)
+
+                # 백엔드 데이터 형식에 맞게 변환
+                music_list = [convert_backend_music(music, path) for music in page]
+
+                selected_music = None
+                if music_id and music_id in index.by_id:
+                    selected_music = convert_backend_music(index.by_id[music_id], path)
+
+                print(f"✓ 백엔드에서 플레이리스트 로드 성공: {len(music_list)}/{len(index)}개 음악{' (캐시)' if stale_data else ''}")
+                return music_list, next_cursor, selected_music, stale_data, (path, etag)
+        except requests.RequestException as e:
+            print(f"백엔드 플레이리스트 요청 오류: {e}")
+        except pagination.PageError:
+            raise
+        except Exception as e:
+            print(f"백엔드 플레이리스트 처리 오류: {e}")
+
+    # 로컬 데이터 사용
+    print("백엔드 연결 실패. 로컬 플레이리스트를 사용합니다.")
+    # 로그인한 사용자의 음악만, 생성일 기준 내림차순 (created_at이 있는 경우에만)
+    # 버전은 페이지보다 먼저 읽음 - 사이에 저장이 끼어들면 다음 요청에서 ETag가 바뀐다
+    version = ('local', local_music.version(), session.get('user_id'))
+    music_list, next_cursor = local_music.page(session.get('user_id'), after, limit)
+    for music in music_list:
+        music['created_at'] = date_parser.parse(music['created_at'], 'local') or music['created_at']
+
+    # URL 파라미터의 music_id로 선택된 음악 찾기
+    selected_music = None
+    if music_id:
+        selected_music = local_music.get(music_id)
+        if selected_music and 'user_id' in session and selected_music.get('user_id') != session['user_id']:
+            selected_music = None
+
+    return music_list, next_cursor, selected_music, False, version
+
+
+@app.route('/playlist')
+def playlist():
+    """플레이리스트 페이지 - 첫 페이지만 렌더링하고 나머지는 스크롤 시 /playlist/items로 로드
+
+    원본 버전이 같으면 렌더링하지 않고 304로 응답한다.
+    """
+    try:
+        music_id = request.args.get('music_id')
+        music_list, next_cursor, selected_music, stale_data, version = load_playlist_page(music_id=music_id)
+        etag = view_etag(TEMPLATE_VERSION, version, music_id, stale_data, session_view_parts())
+        return conditional_response(etag, lambda: render_template(
+            'playlist.html', music_list=music_list, music=selected_music,
+            next_cursor=next_cursor, stale_data=stale_data
+        ))
 
     except Exception as e:
         print(f"플레이리스트 로드 오류: {e}")
         return render_template('playlist.html', music_list=[], music=None)
 
 
+@app.route('/playlist/items')
+def playlist_items():
+    """플레이리스트 다음 페이지 (무한 스크롤용) - ?after=커서&limit=개수"""
+    try:
+        after = pagination.decode_cursor(request.args.get('after'))
+        limit = pagination.parse_limit(request.args.get('limit'))
+        music_list, next_cursor, _, stale_data, _ = load_playlist_page(after, limit)
+    except pagination.PageError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    return jsonify({
+        'success': True,
+        'items': [
+            {
+                'id': music.get('id'),
+                'title': music.get('title'),
+                'tempo': music.get('tempo'),
+                'created_at': format_date(music['created_at']) if music.get('created_at') else ''
+            }
+            for music in music_list
+        ],
+        'next_cursor': next_cursor,
+        'stale_data': stale_data
+    })
+
+
 # app.py의 playlist_main 라우트를 다음과 같이 수정하세요
 @app.route('/playlist-main')
 def playlist_main():
@@ -639,42 +1292,35 @@ def playlist_main():
         
         recent_music_list = []
         popular_music_list = []
+        stale_data = False
+        versions = {}
         
         # 백엔드 연결 시도
         if check_backend_connection():
             try:
                 headers = get_auth_headers()
-                
-                # 최신 음악 데이터 가져오기
-                recent_response = requests.get(
-                    f'{BACKEND_API_URL}/playlist',
-                    headers=headers,
-                    timeout=10
-                )
-                
-                # 인기 음악 데이터 가져오기  
-                popular_response = requests.get(
-                    f'{BACKEND_API_URL}/popular-playlist',
-                    headers=headers,
-                    timeout=10
-                )
-                
-                # 최신 음악 데이터 처리
-                if recent_response.status_code == 200:
-                    recent_result = recent_response.json()
-                    if recent_result.get('success'):
-                        recent_data = recent_result.get('data', {})
-                        recent_music_list = recent_data.get('musicList', [])
-                        print(f"✅ 백엔드에서 최신 음악 {len(recent_music_list)}개 로드 성공")
-                
-                # 인기 음악 데이터 처리
-                if popular_response.status_code == 200:
-                    popular_result = popular_response.json()
-                    if popular_result.get('success'):
-                        popular_data = popular_result.get('data', {})
-                        popular_music_list = popular_data.get('musicList', [])
-                        print(f"✅ 백엔드에서 인기 음악 {len(popular_music_list)}개 로드 성공")
-                        
+
+                # 최신 음악 / 인기 음악을 병렬로 가져오기 (한쪽이 늦어도 나머지는 사용)
+                results, errors = backend_fanout.run_parallel({
+                    'recent': lambda: fetch_backend_music_list('/playlist', headers),
+                    'popular': lambda: fetch_backend_music_list('/popular-playlist', headers),
+                })
+
+                for name, error in errors.items():
+                    print(f"백엔드 {name} 음악 요청 실패: {error}")
+
+                recent, recent_stale, versions['recent'] = results.get('recent', (None, False, None))
+                if recent is not None:
+                    recent_music_list = with_parsed_dates(recent, '/playlist')
+                    stale_data = stale_data or recent_stale
+                    print(f"✅ 백엔드에서 최신 음악 {len(recent_music_list)}개 로드 성공")
+
+                popular, popular_stale, versions['popular'] = results.get('popular', (None, False, None))
+                if popular is not None:
+                    popular_music_list = with_parsed_dates(popular, '/popular-playlist')
+                    stale_data = stale_data or popular_stale
+                    print(f"✅ 백엔드에서 인기 음악 {len(popular_music_list)}개 로드 성공")
+
             except requests.RequestException as e:
                 print(f"백엔드 API 요청 오류: {e}")
             except Exception as e:
@@ -684,12 +1330,17 @@ def playlist_main():
         if not recent_music_list and not popular_music_list:
             print("⚠️ 백엔드 서버에 연결할 수 없습니다.")
 
-        return render_template('playlist_main.html',
-                            logged_in=logged_in,
-                            user_name=user_name,
-                            user_picture=user_picture,
-                            recent_music_list=recent_music_list,
-                            popular_music_list=popular_music_list)
+        etag = view_etag(TEMPLATE_VERSION, versions.get('recent'), versions.get('popular'),
+                         logged_in, user_name, user_picture, stale_data, session_view_parts())
+        return conditional_response(etag, lambda: render_template(
+            'playlist_main.html',
+            logged_in=logged_in,
+            user_name=user_name,
+            user_picture=user_picture,
+            recent_music_list=recent_music_list,
+            popular_music_list=popular_music_list,
+            stale_data=stale_data
+        ))
                             
     except Exception as e:
         print(f"플레이리스트 메인 페이지 오류: {e}")
@@ -720,10 +1371,10 @@ def upload_file():
         return jsonify({'error': '선택된 파일이 없습니다'}), 400
 
     if file and allowed_file(file.filename):
-        filename = secure_filename(file.filename)
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(file_path)
-        return jsonify({'success': True, 'filename': filename})
+        digest, _ = upload_store.put_stream(file.stream)
+        # 이 파일을 참조하는 기록이 없으므로 참조를 바로 풀어 정리 대상이 되게 함
+        upload_store.release(digest)
+        return jsonify({'success': True, 'digest': digest})
 
     return jsonify({'error': '허용되지 않는 파일 형식입니다'}), 400
 
@@ -775,6 +1426,8 @@ def download_music(music_id):
 
 
 @app.route('/delete/<music_id>', methods=['DELETE'])
+@idempotent
+@rate_limited('delete', error_key='error')
 def delete_music(music_id):
     """음악 삭제 - 백엔드 API 호출"""
     try:
@@ -790,8 +1443,8 @@ def delete_music(music_id):
             try:
                 headers = get_auth_headers()
                 
-                response = requests.delete(
-                    f'{BACKEND_API_URL}/music/{music_id}',
+                response = backend_client.delete(
+                    f'/music/{music_id}',
                     headers=headers,
                     timeout=10
                 )
@@ -802,6 +1455,9 @@ def delete_music(music_id):
                     result = response.json()
                     if result.get('success'):
                         print(f"✓ 백엔드에서 음악 삭제 성공: 음악 ID {music_id}")
+                        backend_cache.invalidate_music_lists()
+                        generation_cache.cache.invalidate_music(music_id)
+                        upload_store.forget_backend_result(session.get('user_id'), music_id)
                         return jsonify({
                             'success': True,
                             'message': '음악이 삭제되었습니다.'
@@ -838,18 +1494,16 @@ def delete_music(music_id):
 
         # 로컬 처리 (백엔드 연결 실패 시)
         print("백엔드 연결 실패. 로컬 삭제 처리를 시도합니다.")
-        music_list = load_music_data()
-        
-        for i, music in enumerate(music_list):
-            if music['id'] == music_id:
-                if 'user_id' in session and music['user_id'] != session['user_id']:
-                    return jsonify({
-                        'success': False,
-                        'error': '이 음악을 삭제할 권한이 없습니다.'
-                    }), 403
+        music = local_music.get(music_id)
+        if music:
+            if 'user_id' in session and music.get('user_id') != session['user_id']:
+                return jsonify({
+                    'success': False,
+                    'error': '이 음악을 삭제할 권한이 없습니다.'
+                }), 403
 
-                del music_list[i]
-                save_music_data(music_list)
+            if local_music.delete(music_id):
+                upload_store.release(music.get('source_digest'))
                 print(f"✓ 로컬에서 음악 삭제 성공: 음악 ID {music_id}")
                 return jsonify({
                     'success': True,
@@ -933,36 +1587,120 @@ def debug_session():
 def debug_backend_test():
     """백엔드 연결 테스트"""
     try:
-        # 1. Health check
-        health_response = requests.get(f'{BACKEND_API_URL}/health', timeout=5)
-
-        # 2. 토큰 있을 때와 없을 때 playlist 요청 테스트
         headers_without_token = {'Content-Type': 'application/json'}
-        playlist_without_token = requests.get(f'{BACKEND_API_URL}/playlist', headers=headers_without_token, timeout=5)
-
         headers_with_token = get_auth_headers()
-        playlist_with_token = requests.get(f'{BACKEND_API_URL}/playlist', headers=headers_with_token, timeout=5)
 
-        return jsonify({
-            'health_check': {
-                'status': health_response.status_code,
-                'response': health_response.json() if health_response.status_code == 200 else health_response.text
-            },
-            'playlist_without_token': {
-                'status': playlist_without_token.status_code,
-                'response': playlist_without_token.json() if playlist_without_token.status_code == 200 else playlist_without_token.text
-            },
-            'playlist_with_token': {
-                'status': playlist_with_token.status_code,
-                'response': playlist_with_token.json() if playlist_with_token.status_code == 200 else playlist_with_token.text,
-                'headers_sent': headers_with_token
+        # 1. Health check, 2. 토큰 있을 때와 없을 때 playlist 요청 테스트 - 병렬 실행
+        results, errors = backend_fanout.run_parallel({
+            'health': lambda: backend_client.get('/health', timeout=5),
+            'without_token': lambda: backend_client.get('/playlist', headers=headers_without_token, timeout=5),
+            'with_token': lambda: backend_client.get('/playlist', headers=headers_with_token, timeout=5),
+        }, deadline=5)
+
+        def describe(name):
+            if name in errors:
+                return {'status': None, 'error': str(errors[name])}
+            response = results[name]
+            return {
+                'status': response.status_code,
+                'response': response.json() if response.status_code == 200 else response.text
             }
+
+        return jsonify({
+            'health_check': describe('health'),
+            'playlist_without_token': describe('without_token'),
+            'playlist_with_token': dict(describe('with_token'), headers_sent=headers_with_token)
         })
     except Exception as e:
         return jsonify({'error': str(e)})
 
 
+@app.route('/debug/backend-health')
+def debug_backend_health():
+    """백엔드 헬스 모니터 / 서킷 브레이커 상태"""
+    return jsonify(backend_health.monitor.snapshot())
+
+
+@app.route('/debug/jobs')
+def debug_jobs():
+    """음악 생성 작업 / 진행 상황 스트림 현황"""
+    return jsonify(generation_jobs.jobs.stats())
+
+
+@app.route('/debug/upload-store')
+def debug_upload_store():
+    """업로드 저장소 사용량"""
+    return jsonify(upload_store.stats())
+
+
+@app.route('/debug/local-music')
+def debug_local_music():
+    """로컬 음악 저장소 인덱스/커밋 상태"""
+    return jsonify(local_music.stats())
+
+
+@app.route('/debug/date-parser')
+def debug_date_parser():
+    """날짜 파서 캐시 상태"""
+    return jsonify(date_parser.parser.stats())
+
+
+@app.route('/debug/single-flight')
+def debug_single_flight():
+    """동일 백엔드 요청 합치기 통계"""
+    return jsonify(single_flight.flights.stats())
+
+
+@app.route('/debug/generation-cache')
+def debug_generation_cache():
+    """음악 생성 결과 캐시 적중/미스 통계"""
+    return jsonify(generation_cache.cache.stats())
+
+
+@app.route('/debug/idempotency')
+def debug_idempotency():
+    """Idempotency-Key 저장소 현황"""
+    return jsonify(idempotency.store.stats())
+
+
+@app.route('/debug/admission')
+def debug_admission():
+    """음악 생성 입장 제어 현황 (진행 중 / 대기열 / 거절 수)"""
+    return jsonify(admission.controller.stats())
+
+
+@app.route('/debug/rate-limit')
+def debug_rate_limit():
+    """좋아요/삭제 요청 속도 제한 현황"""
+    return jsonify(rate_limit.limiter.stats())
+
+
+@app.route('/debug/likes')
+def debug_likes():
+    """좋아요 모아 보내기 버퍼 현황 (클릭 수 대비 백엔드 쓰기 수)"""
+    return jsonify(likes.stats())
+
+
+@app.route('/debug/backend-hedging')
+def debug_backend_hedging():
+    """백엔드 GET 헤징/재시도 비율과 재시도 예산"""
+    return jsonify(backend_hedging.client.stats())
+
+
+@app.route('/debug/deadlines')
+def debug_deadlines():
+    """라우트별 응답 시간 예산과 초과 횟수, 마감 때문에 건너뛰거나 줄인 백엔드 호출 수"""
+    return jsonify(deadlines.routes.stats())
+
+
+@app.route('/debug/cache-stats')
+def debug_cache_stats():
+    """백엔드 응답 캐시 적중/미스 통계"""
+    return jsonify(backend_cache.cache.stats())
+
+
 @app.route('/api/music/<int:music_id>/like', methods=['POST'])
+@rate_limited('like')
 def like_music(music_id):
     """음악 좋아요 추가"""
     try:
@@ -972,23 +1710,25 @@ def like_music(music_id):
                 'success': False,
                 'message': '로그인이 필요합니다.'
             }), 401
-        
+
+        if like_buffer.LIKE_WRITE_BEHIND:
+            return buffered_like_response(music_id, True)
+
         # 백엔드 연결 시도
         if check_backend_connection():
             try:
                 headers = get_auth_headers()
-                response = requests.post(
-                    f'{BACKEND_API_URL}/music/{music_id}/like',
+                response = backend_client.post(
+                    f'/music/{music_id}/like',
                     headers=headers,
-                    timeout=10
+                    timeout=10,
+                    stream=True
                 )
-                
+
                 if response.status_code == 200:
-                    result = response.json()
-                    return jsonify(result)
-                else:
-                    result = response.json()
-                    return jsonify(result), response.status_code
+                    backend_cache.invalidate_music_lists()
+                # 상태 코드와 본문을 그대로 전달
+                return proxy_response(response)
                     
             except requests.RequestException as e:
                 print(f"백엔드 좋아요 요청 오류: {e}")
@@ -1008,6 +1748,7 @@ def like_music(music_id):
 
 
 @app.route('/api/music/<int:music_id>/like', methods=['DELETE'])
+@rate_limited('unlike')
 def unlike_music(music_id):
     """음악 좋아요 취소"""
     try:
@@ -1017,23 +1758,25 @@ def unlike_music(music_id):
                 'success': False,
                 'message': '로그인이 필요합니다.'
             }), 401
-        
+
+        if like_buffer.LIKE_WRITE_BEHIND:
+            return buffered_like_response(music_id, False)
+
         # 백엔드 연결 시도
         if check_backend_connection():
             try:
                 headers = get_auth_headers()
-                response = requests.delete(
-                    f'{BACKEND_API_URL}/music/{music_id}/like',
+                response = backend_client.delete(
+                    f'/music/{music_id}/like',
                     headers=headers,
-                    timeout=10
+                    timeout=10,
+                    stream=True
                 )
-                
+
                 if response.status_code == 200:
-                    result = response.json()
-                    return jsonify(result)
-                else:
-                    result = response.json()
-                    return jsonify(result), response.status_code
+                    backend_cache.invalidate_music_lists()
+                # 상태 코드와 본문을 그대로 전달
+                return proxy_response(response)
                     
             except requests.RequestException as e:
                 print(f"백엔드 좋아요 취소 요청 오류: {e}")
@@ -1052,34 +1795,94 @@ def unlike_music(music_id):
         }), 500
 
 
+def write_like(music_id, liked, headers):
+    """모아 둔 좋아요 상태 하나를 백엔드에 반영 (like_buffer 스레드에서 호출) - 상태 코드 반환"""
+    send = backend_client.post if liked else backend_client.delete
+    response = send(f'/music/{music_id}/like', headers=headers, timeout=10)
+    response.close()
+    return response.status_code
+
+
+likes = like_buffer.LikeBuffer(write_like, on_flushed=backend_cache.invalidate_music_lists)
+
+
+def buffered_like_response(music_id, liked):
+    """좋아요/취소를 버퍼에 넣고 낙관적 상태로 바로 응답 (백엔드에는 모아서 반영)"""
+    if not check_backend_connection():
+        return jsonify({
+            'success': False,
+            'message': '백엔드 서버에 연결할 수 없습니다.'
+        }), 503
+
+    data = likes.toggle(session.get('user_id'), music_id, liked, get_auth_headers())
+    return jsonify({
+        'success': True,
+        'data': dict(data, flushWindow=likes.window)
+    })
+
+
+@app.route('/api/likes/reconcile', methods=['GET'])
+def reconcile_likes():
+    """백엔드에 반영하지 못한 좋아요의 실제 상태 조회 - 클라이언트가 낙관적 상태를 되돌리는 데 사용"""
+    if not is_user_logged_in():
+        return jsonify({
+            'success': False,
+            'message': '로그인이 필요합니다.'
+        }), 401
+
+    return jsonify({
+        'success': True,
+        'data': dict(likes.reconcile(session.get('user_id')), flushWindow=likes.window)
+    })
+
+
 @app.route('/api/playlist', methods=['GET'])
 def api_get_playlist():
-    """API - 전체 플레이리스트 조회"""
+    """API - 전체 플레이리스트 조회
+
+    limit 또는 after(이전 응답의 nextCursor)를 주면 생성일 내림차순으로 한 페이지만 반환한다.
+    """
     try:
+        paginated = 'limit' in request.args or 'after' in request.args
+        try:
+            after = pagination.decode_cursor(request.args.get('after'))
+            limit = pagination.parse_limit(request.args.get('limit'))
+        except pagination.PageError as e:
+            return jsonify({
+                'success': False,
+                'message': str(e)
+            }), 400
+
         # 백엔드 연결 시도
         if check_backend_connection():
             try:
                 headers = get_auth_headers()
-                response = requests.get(
-                    f'{BACKEND_API_URL}/playlist',
-                    headers=headers,
-                    timeout=10
+                payload = fetch_backend_payload('/playlist', headers)
+
+                # 페이지를 나눌 때만 본문을 파싱하고, 아니면 백엔드 응답을 그대로 전달
+                if payload.status_code != 200 or not paginated:
+                    return payload_response(payload)
+
+                result = payload.json()
+                if not result.get('success'):
+                    return payload_response(payload)
+
+                data = result.get('data', {})
+                page, next_cursor = backend_page_index(data.get('musicList', [])).page(after, limit)
+                return conditional_response(
+                    view_etag(payload.etag, after, limit),
+                    lambda: jsonify(dict(result, data=dict(data, musicList=page, nextCursor=next_cursor)))
                 )
-                
-                if response.status_code == 200:
-                    return jsonify(response.json())
-                else:
-                    print(f"백엔드 플레이리스트 오류: {response.status_code}")
-                    
+
             except requests.RequestException as e:
                 print(f"백엔드 플레이리스트 요청 오류: {e}")
-        
+
         # 백엔드 연결 실패 시 오류 반환
         return jsonify({
             'success': False,
             'message': '백엔드 서버에 연결할 수 없습니다.'
         }), 503
-        
+
     except Exception as e:
         print(f"API 플레이리스트 오류: {e}")
         return jsonify({
@@ -1096,17 +1899,9 @@ def api_get_popular_playlist():
         if check_backend_connection():
             try:
                 headers = get_auth_headers()
-                response = requests.get(
-                    f'{BACKEND_API_URL}/popular-playlist',
-                    headers=headers,
-                    timeout=10
-                )
-                
-                if response.status_code == 200:
-                    return jsonify(response.json())
-                else:
-                    print(f"백엔드 인기 플레이리스트 오류: {response.status_code}")
-                    
+                # 백엔드 응답을 파싱하지 않고 그대로 전달
+                return payload_response(fetch_backend_payload('/popular-playlist', headers))
+
             except requests.RequestException as e:
                 print(f"백엔드 인기 플레이리스트 요청 오류: {e}")
         
@@ -0,0 +1,210 @@
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+import backend_fanout
+
+# 응답 캐시 설정
+# - BACKEND_CACHE_MAX_ENTRIES: 캐시에 보관할 최대 응답 수 (초과 시 LRU 제거)
+# - BACKEND_CACHE_TTLS: 엔드포인트별 TTL (초) 재정의 ("/playlist=15,/popular-playlist=60")
+# - BACKEND_CACHE_MAX_STALE: TTL이 지난 뒤에도 페이지에 즉시 보여줄 수 있는 최대 시간 (초)
+BACKEND_CACHE_MAX_ENTRIES = int(os.getenv('BACKEND_CACHE_MAX_ENTRIES', '512'))
+BACKEND_CACHE_MAX_STALE = float(os.getenv('BACKEND_CACHE_MAX_STALE', '300'))
+
+DEFAULT_TTLS = {
+    '/playlist': 15,
+    '/myplaylist': 15,
+    '/popular-playlist': 60,
+}
+
+
+def _parse_ttls(value):
+    """'path=seconds,path=seconds' 형식의 환경변수를 dict로 변환"""
+    ttls = dict(DEFAULT_TTLS)
+    for item in value.split(','):
+        if '=' not in item:
+            continue
+        path, seconds = item.split('=', 1)
+        try:
+            ttls[path.strip()] = float(seconds)
+        except ValueError:
+            print(f"⚠️ 잘못된 캐시 TTL 설정 무시: {item}")
+    return ttls
+
+
+def identity_from_headers(headers):
+    """인증 헤더로 캐시 사용자 구분값 생성 (토큰 원문은 저장하지 않음)"""
+    authorization = (headers or {}).get('Authorization')
+    if not authorization:
+        return 'anonymous'
+    return hashlib.sha256(authorization.encode('utf-8')).hexdigest()[:16]
+
+
+class ResponseCache:
+    """(엔드포인트, 사용자)별 백엔드 응답 캐시 - TTL + LRU
+
+    TTL이 지난 항목도 max_stale 동안은 남겨 두어 stale-while-revalidate에 사용한다.
+    저장된 값은 여러 요청이 공유하므로 꺼낸 뒤 수정하면 안 된다.
+    """
+
+    def __init__(self, ttls, max_entries=BACKEND_CACHE_MAX_ENTRIES, max_stale=BACKEND_CACHE_MAX_STALE):
+        self.ttls = ttls
+        self.max_entries = max_entries
+        self.max_stale = max_stale
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        # 무효화할 때마다 증가 - 무효화 이전에 시작된 요청의 응답이 다시 저장되지 않도록 함
+        self._generation = 0
+
+    def is_cacheable(self, endpoint):
+        return self.ttls.get(endpoint, 0) > 0
+
+    def get(self, endpoint, identity):
+        key = (endpoint, identity)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            fresh_until, stale_until, value = entry
+            now = time.monotonic()
+            if fresh_until <= now:
+                if stale_until <= now:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def get_stale(self, endpoint, identity):
+        """TTL이 지났더라도 max_stale 이내면 (value, is_stale) 반환, 없으면 None"""
+        key = (endpoint, identity)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            fresh_until, stale_until, value = entry
+            now = time.monotonic()
+            if stale_until <= now:
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            is_stale = fresh_until <= now
+            if is_stale:
+                self.stale_hits += 1
+            else:
+                self.hits += 1
+            return value, is_stale
+
+    def peek(self, endpoint, identity):
+        """만료 여부와 관계없이 남아 있는 값 반환 (통계/순서 변경 없음) - 백엔드 재검증용"""
+        with self._lock:
+            entry = self._entries.get((endpoint, identity))
+        return entry[2] if entry is not None else None
+
+    def refresh_async(self, endpoint, identity, loader):
+        """백그라운드에서 loader()로 항목을 갱신 (같은 키는 동시에 한 번만)"""
+        key = (endpoint, identity)
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                loader()
+                with self._lock:
+                    self.refreshes += 1
+            except Exception as e:
+                print(f"⚠️ 백그라운드 캐시 갱신 실패 {endpoint}: {e}")
+                with self._lock:
+                    self.refresh_failures += 1
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        backend_fanout.submit(run)
+        return True
+
+    @property
+    def generation(self):
+        return self._generation
+
+    def set(self, endpoint, identity, value, generation=None):
+        """응답 저장 - generation을 넘기면 그 사이 무효화가 있었을 때 저장하지 않음"""
+        ttl = self.ttls.get(endpoint, 0)
+        if ttl <= 0:
+            return
+        key = (endpoint, identity)
+        now = time.monotonic()
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (now + ttl, now + ttl + self.max_stale, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, endpoints=None, identity=None):
+        """엔드포인트/사용자 조건에 맞는 캐시 삭제 (None이면 전체)"""
+        with self._lock:
+            keys = [
+                key for key in self._entries
+                if (endpoints is None or key[0] in endpoints)
+                and (identity is None or key[1] == identity)
+            ]
+            for key in keys:
+                del self._entries[key]
+            self.invalidations += len(keys)
+            self._generation += 1
+        if keys:
+            print(f"🧹 응답 캐시 {len(keys)}건 무효화: {endpoints or '전체'}")
+        return len(keys)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttls': self.ttls,
+                'max_stale': self.max_stale,
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'hit_ratio': round((self.hits + self.stale_hits) / lookups, 4) if lookups else None,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'refreshes': self.refreshes,
+                'refresh_failures': self.refresh_failures,
+                'refreshing': len(self._refreshing),
+            }
+
+
+cache = ResponseCache(_parse_ttls(os.getenv('BACKEND_CACHE_TTLS', '')))
+
+# 음악 목록 관련 엔드포인트 (좋아요/삭제/생성 시 무효화 대상)
+MUSIC_LIST_ENDPOINTS = ('/playlist', '/myplaylist', '/popular-playlist')
+
+
+def invalidate_music_lists():
+    """음악 목록이 바뀌는 작업 후 호출 - 좋아요 수 등은 모든 사용자에게 보이므로 전체 무효화"""
+    return cache.invalidate(MUSIC_LIST_ENDPOINTS)
@@ -0,0 +1,378 @@
+import os
+import json
+import uuid
+import hashlib
+import threading
+import http.cookiejar
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.fields import RequestField
+from dotenv import load_dotenv
+
+import deadlines
+
+# .env 파일 로드
+load_dotenv()
+
+# 백엔드 API URL 설정
+BACKEND_API_URL = os.getenv('BACKEND_API_URL', 'http://localhost:8000/api')
+
+# 커넥션 풀 설정
+# - BACKEND_POOL_CONNECTIONS: 호스트별로 캐시할 풀 개수
+# - BACKEND_POOL_MAXSIZE: 호스트 하나당 유지할 keep-alive 커넥션 수 (WSGI 스레드 수 이상 권장)
+# - BACKEND_HOST_POOL_SIZES: 호스트별 풀 크기 재정의 ("api.example.com=32,cdn.example.com=8")
+BACKEND_POOL_CONNECTIONS = int(os.getenv('BACKEND_POOL_CONNECTIONS', '10'))
+BACKEND_POOL_MAXSIZE = int(os.getenv('BACKEND_POOL_MAXSIZE', '20'))
+BACKEND_HOST_POOL_SIZES = os.getenv('BACKEND_HOST_POOL_SIZES', '')
+
+# 재시도 설정 (멱등 메서드만 재시도, POST 음악 생성은 재시도하지 않음)
+BACKEND_MAX_RETRIES = int(os.getenv('BACKEND_MAX_RETRIES', '2'))
+BACKEND_RETRY_BACKOFF = float(os.getenv('BACKEND_RETRY_BACKOFF', '0.3'))
+BACKEND_RETRY_STATUSES = (502, 503, 504)
+
+# 타임아웃 설정 (초) - 호출부에서 timeout을 넘기면 읽기 타임아웃으로 사용
+BACKEND_CONNECT_TIMEOUT = float(os.getenv('BACKEND_CONNECT_TIMEOUT', '3'))
+BACKEND_READ_TIMEOUT = float(os.getenv('BACKEND_READ_TIMEOUT', '10'))
+
+# 파일 업로드 스트리밍 시 한 번에 읽는 크기 (바이트)
+BACKEND_UPLOAD_CHUNK_SIZE = int(os.getenv('BACKEND_UPLOAD_CHUNK_SIZE', str(64 * 1024)))
+
+# 백엔드 응답을 그대로 전달할 때 한 번에 읽는 크기 (바이트)
+BACKEND_PROXY_CHUNK_SIZE = int(os.getenv('BACKEND_PROXY_CHUNK_SIZE', str(64 * 1024)))
+
+# 클라이언트에 그대로 전달하는 백엔드 응답 헤더
+# (Content-Length/Content-Encoding은 requests가 압축을 풀기 때문에 전달하지 않음)
+PASSTHROUGH_HEADERS = ('Content-Type', 'ETag', 'Cache-Control', 'Last-Modified', 'Expires', 'Vary')
+
+
+class _NoCookiePolicy(http.cookiejar.DefaultCookiePolicy):
+    """여러 사용자가 세션을 공유하므로 백엔드 쿠키를 저장하지 않음"""
+
+    def set_ok(self, cookie, request):
+        return False
+
+
+def _parse_host_pool_sizes(value):
+    """'host=size,host=size' 형식의 환경변수를 dict로 변환"""
+    sizes = {}
+    for item in value.split(','):
+        if '=' not in item:
+            continue
+        host, size = item.split('=', 1)
+        try:
+            sizes[host.strip()] = int(size)
+        except ValueError:
+            print(f"⚠️ 잘못된 풀 크기 설정 무시: {item}")
+    return sizes
+
+
+def _build_retry():
+    return Retry(
+        total=BACKEND_MAX_RETRIES,
+        connect=BACKEND_MAX_RETRIES,
+        read=BACKEND_MAX_RETRIES,
+        status=BACKEND_MAX_RETRIES,
+        backoff_factor=BACKEND_RETRY_BACKOFF,
+        status_forcelist=BACKEND_RETRY_STATUSES,
+        allowed_methods=frozenset(['GET', 'HEAD', 'OPTIONS', 'DELETE']),
+        raise_on_status=False,
+    )
+
+
+def _build_adapter(pool_maxsize, retry=True):
+    return HTTPAdapter(
+        pool_connections=BACKEND_POOL_CONNECTIONS,
+        pool_maxsize=pool_maxsize,
+        max_retries=_build_retry() if retry else 0,
+        pool_block=False,
+    )
+
+
+def _host_prefixes(url):
+    """URL의 'scheme://host[:port]/' 마운트 접두사"""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}/"
+
+
+# 어댑터(= urllib3 커넥션 풀)는 모든 스레드가 공유하고, Session 객체만 스레드별로 둔다.
+# urllib3 PoolManager는 스레드 안전하므로 keep-alive 커넥션을 스레드 간에 재사용할 수 있다.
+_default_adapter = _build_adapter(BACKEND_POOL_MAXSIZE)
+_host_adapters = {
+    _host_prefixes(BACKEND_API_URL): _build_adapter(BACKEND_POOL_MAXSIZE),
+}
+for _host, _size in _parse_host_pool_sizes(BACKEND_HOST_POOL_SIZES).items():
+    if '://' not in _host:
+        _host = f"{urlsplit(BACKEND_API_URL).scheme}://{_host}"
+    _host_adapters[_host_prefixes(_host)] = _build_adapter(_size)
+
+# 재시도를 호출부(backend_hedging)가 직접 하는 요청용 - 어댑터 재시도와 겹치지 않게 따로 둠
+_no_retry_adapter = _build_adapter(BACKEND_POOL_MAXSIZE, retry=False)
+
+_local = threading.local()
+
+# 실제 호출 결과를 구독하는 리스너 (예: backend_health의 서킷 브레이커)
+_outcome_listeners = []
+
+
+def add_outcome_listener(listener):
+    """listener(success, error) 형태의 콜백 등록"""
+    _outcome_listeners.append(listener)
+
+
+def _notify_outcome(success, error=None):
+    for listener in _outcome_listeners:
+        try:
+            listener(success, error)
+        except Exception as e:
+            print(f"⚠️ 백엔드 결과 리스너 오류: {e}")
+
+
+def _new_session(retry=True):
+    http_session = requests.Session()
+    http_session.cookies.set_policy(_NoCookiePolicy())
+    if retry:
+        http_session.mount('http://', _default_adapter)
+        http_session.mount('https://', _default_adapter)
+        for prefix, adapter in _host_adapters.items():
+            http_session.mount(prefix, adapter)
+    else:
+        http_session.mount('http://', _no_retry_adapter)
+        http_session.mount('https://', _no_retry_adapter)
+    return http_session
+
+
+def get_session(retry=True):
+    """현재 스레드의 requests.Session 반환 (풀은 공유) - retry=False면 어댑터 재시도 없음"""
+    attr = 'session' if retry else 'no_retry_session'
+    http_session = getattr(_local, attr, None)
+    if http_session is None:
+        http_session = _new_session(retry)
+        setattr(_local, attr, http_session)
+    return http_session
+
+
+def backend_url(path):
+    """백엔드 경로를 절대 URL로 변환 (이미 절대 URL이면 그대로 사용)"""
+    if path.startswith('http://') or path.startswith('https://'):
+        return path
+    return f"{BACKEND_API_URL}/{path.lstrip('/')}"
+
+
+def _resolve_timeout(timeout):
+    """숫자 timeout은 읽기 타임아웃으로 보고 연결 타임아웃과 묶음"""
+    if timeout is None:
+        return (BACKEND_CONNECT_TIMEOUT, BACKEND_READ_TIMEOUT)
+    if isinstance(timeout, (tuple, list)):
+        return tuple(timeout)
+    return (min(BACKEND_CONNECT_TIMEOUT, timeout), timeout)
+
+
+def _expired_by_deadline(error, requested, timeout):
+    """요청 마감 시간이 실제로 끝나서 난 타임아웃인지 - 이런 타임아웃은 백엔드 장애로 세지 않음
+
+    줄이지 않은 연결 타임아웃은 마감과 관계없이 백엔드 문제이므로 항상 실패로 센다.
+    """
+    if not isinstance(error, requests.Timeout):
+        return False
+    if isinstance(error, requests.ConnectTimeout) and timeout[0] == requested[0]:
+        return False
+    left = deadlines.remaining()
+    return left is not None and left <= 0
+
+
+def request(method, path, timeout=None, record_outcome=True, retry=True, **kwargs):
+    """풀링된 커넥션으로 백엔드 요청 전송
+
+    연결 오류/타임아웃/5xx 응답은 실패로, 그 외 응답은 성공으로 리스너에 알린다.
+    retry=False면 어댑터의 자동 재시도 없이 한 번만 보낸다.
+
+    요청 마감 시간(deadlines)이 있으면 타임아웃을 남은 시간 이하로 줄이고 남은 시간을
+    헤더로 백엔드에 알린다. 이미 지났으면 보내지 않고 DeadlineExceeded.
+    """
+    requested = _resolve_timeout(timeout)
+    timeout, left = deadlines.bound_timeout(requested)
+    if timeout != requested:
+        # 남은 시간 안에 어댑터 재시도까지 할 여유는 없음
+        retry = False
+    if left is not None:
+        kwargs['headers'] = dict(kwargs.get('headers') or {}, **{
+            deadlines.BACKEND_DEADLINE_HEADER: str(max(int(left * 1000), 1))
+        })
+    try:
+        response = get_session(retry).request(
+            method,
+            backend_url(path),
+            timeout=timeout,
+            **kwargs
+        )
+    except requests.RequestException as e:
+        if record_outcome and not _expired_by_deadline(e, requested, timeout):
+            _notify_outcome(False, str(e))
+        raise
+
+    if record_outcome:
+        if response.status_code >= 500:
+            _notify_outcome(False, f"HTTP {response.status_code}")
+        else:
+            _notify_outcome(True)
+    return response
+
+
+def get(path, **kwargs):
+    return request('GET', path, **kwargs)
+
+
+def post(path, **kwargs):
+    return request('POST', path, **kwargs)
+
+
+def delete(path, **kwargs):
+    return request('DELETE', path, **kwargs)
+
+
+def passthrough_headers(response):
+    return {name: response.headers[name] for name in PASSTHROUGH_HEADERS if name in response.headers}
+
+
+def iter_body(response, chunk_size=BACKEND_PROXY_CHUNK_SIZE):
+    """stream=True 응답 본문을 청크 단위로 내보내고 끝나면 커넥션 반환"""
+    try:
+        for chunk in response.iter_content(chunk_size):
+            yield chunk
+    finally:
+        response.close()
+
+
+class Payload:
+    """백엔드 응답 본문(바이트)과 전달할 헤더 - JSON은 필요할 때 한 번만 파싱
+
+    응답 캐시에 이 객체를 저장하므로, 그대로 전달하는 API는 파싱/직렬화 없이 바이트를
+    보내고 페이지 렌더링처럼 내용이 필요한 곳만 json()을 호출한다.
+    json()이 돌려주는 값은 여러 요청이 공유하므로 수정하면 안 된다.
+    """
+
+    __slots__ = ('status_code', 'body', 'headers', '_json', '_etag', '_lock')
+
+    def __init__(self, status_code, body, headers):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers
+        self._json = None
+        self._etag = None
+        self._lock = threading.Lock()
+
+    @property
+    def upstream_etag(self):
+        """백엔드가 보낸 ETag 원문 (재검증 요청의 If-None-Match에 사용)"""
+        return self.headers.get('ETag')
+
+    @property
+    def etag(self):
+        """강한 ETag 값 (따옴표 제외) - 백엔드의 강한 ETag가 있으면 그대로, 없으면 본문 해시"""
+        if self._etag is None:
+            upstream = self.upstream_etag
+            if upstream and not upstream.startswith('W/'):
+                self._etag = upstream.strip('"')
+            else:
+                self._etag = hashlib.sha256(self.body).hexdigest()[:32]
+        return self._etag
+
+    @classmethod
+    def from_response(cls, response):
+        return cls(response.status_code, response.content, passthrough_headers(response))
+
+    def json(self):
+        if self._json is None:
+            with self._lock:
+                if self._json is None:
+                    self._json = json.loads(self.body)
+        return self._json
+
+
+class MultipartStream:
+    """디스크의 파일을 청크 단위로 읽어 보내는 multipart/form-data 본문
+
+    requests의 files= 는 본문 전체를 메모리에서 만들지만, 이 객체는 read()가
+    불릴 때마다 필요한 만큼만 읽으므로 파일 크기와 관계없이 메모리 사용량이 일정하다.
+    길이를 미리 계산해 두어 Content-Length 헤더로 전송된다.
+
+    files: {필드명: (파일명, 경로, content_type)}
+    on_complete: 본문을 끝까지 보낸 뒤 한 번 호출 (업로드 완료 → 응답 대기 단계 표시용)
+    """
+
+    def __init__(self, files, fields=None, chunk_size=BACKEND_UPLOAD_CHUNK_SIZE, on_complete=None):
+        self.boundary = uuid.uuid4().hex
+        self.content_type = f'multipart/form-data; boundary={self.boundary}'
+        self.chunk_size = chunk_size
+        self._on_complete = on_complete
+        self._parts = []
+
+        for name, value in (fields or {}).items():
+            self._parts.append(self._part_header(name) + str(value).encode('utf-8') + b'\r\n')
+        for name, (filename, path, content_type) in files.items():
+            self._parts.append(self._part_header(name, filename, content_type))
+            self._parts.append(path)
+            self._parts.append(b'\r\n')
+        self._parts.append(f'--{self.boundary}--\r\n'.encode('ascii'))
+
+        self.len = sum(
+            len(part) if isinstance(part, bytes) else os.path.getsize(part)
+            for part in self._parts
+        )
+        self._index = 0
+        self._buffer = b''
+        self._file = None
+        self._completed = False
+
+    def _part_header(self, name, filename=None, content_type=None):
+        field = RequestField(name=name, data=b'', filename=filename)
+        field.make_multipart(content_type=content_type or ('application/octet-stream' if filename else None))
+        return f'--{self.boundary}\r\n'.encode('ascii') + field.render_headers().encode('utf-8')
+
+    def _next_chunk(self):
+        """다음 청크 반환 (끝이면 b'')"""
+        while self._index < len(self._parts):
+            part = self._parts[self._index]
+            if isinstance(part, bytes):
+                self._index += 1
+                return part
+
+            if self._file is None:
+                self._file = open(part, 'rb')
+            chunk = self._file.read(self.chunk_size)
+            if chunk:
+                return chunk
+            self._file.close()
+            self._file = None
+            self._index += 1
+        return b''
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self.chunk_size
+        while len(self._buffer) < size:
+            chunk = self._next_chunk()
+            if not chunk:
+                break
+            self._buffer += chunk
+
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        if not data and not self._completed:
+            self._completed = True
+            if self._on_complete:
+                self._on_complete()
+        return data
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,60 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import deadlines
+
+# 병렬 호출 설정
+# - BACKEND_FANOUT_WORKERS: 모든 요청이 공유하는 백엔드 호출 스레드 수 (상한)
+# - BACKEND_FANOUT_DEADLINE: 페이지 하나에서 병렬 호출 전체에 허용하는 시간 (초)
+BACKEND_FANOUT_WORKERS = int(os.getenv('BACKEND_FANOUT_WORKERS', '16'))
+BACKEND_FANOUT_DEADLINE = float(os.getenv('BACKEND_FANOUT_DEADLINE', '10'))
+
+_executor = ThreadPoolExecutor(max_workers=BACKEND_FANOUT_WORKERS, thread_name_prefix='backend-fanout')
+
+
+def submit(fn):
+    """결과를 기다리지 않는 백그라운드 작업 실행 (같은 스레드 풀 사용)"""
+    return _executor.submit(fn)
+
+
+class FanoutTimeout(Exception):
+    """전체 마감 시간 안에 끝나지 않은 호출"""
+
+
+def run_parallel(calls, deadline=BACKEND_FANOUT_DEADLINE, executor=None):
+    """독립적인 백엔드 호출들을 병렬 실행하고 마감 시간까지 끝난 결과만 반환
+
+    calls: {이름: 인자 없는 함수}. 함수는 워커 스레드에서 실행되므로 Flask의
+    request/session에 접근하지 말고 필요한 헤더 등은 미리 만들어 넘겨야 한다.
+
+    반환값: (results, errors) - results는 성공한 호출의 반환값,
+    errors는 실패하거나 시간 초과된 호출의 예외. 일부만 성공해도 그대로 반환한다.
+    요청 마감 시간이 있으면 워커 스레드의 호출에도 전달하고, 그보다 오래 기다리지 않는다.
+    executor를 주면 공용 풀 대신 그 풀에서 실행한다 (페이지 요청과 겹치지 않아야 하는 백그라운드 작업용).
+    """
+    started = time.monotonic()
+    left = deadlines.remaining()
+    if left is not None:
+        deadline = max(min(deadline, left), 0)
+    executor = executor or _executor
+    futures = {name: executor.submit(deadlines.propagate(fn)) for name, fn in calls.items()}
+    done, _ = wait(futures.values(), timeout=deadline)
+
+    results = {}
+    errors = {}
+    for name, future in futures.items():
+        if future not in done:
+            # 아직 시작 전이면 취소, 실행 중이면 결과를 버림
+            future.cancel()
+            errors[name] = FanoutTimeout(f"{name}: {deadline:.2f}초 안에 응답 없음")
+            continue
+        error = future.exception()
+        if error is not None:
+            errors[name] = error
+        else:
+            results[name] = future.result()
+
+    elapsed = time.monotonic() - started
+    print(f"⚡ 병렬 백엔드 호출 {len(calls)}건: 성공 {len(results)}, 실패 {len(errors)} ({elapsed:.2f}초)")
+    return results, errors
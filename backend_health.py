@@ -0,0 +1,169 @@
+import os
+import time
+import threading
+
+import requests
+import backend_client
+
+# 헬스 체크 / 서킷 브레이커 설정
+# - BACKEND_HEALTH_INTERVAL: 백그라운드 /health 확인 주기 (초)
+# - BACKEND_HEALTH_TIMEOUT: /health 요청 타임아웃 (초)
+# - BACKEND_FAILURE_THRESHOLD: 연속 실패 몇 번이면 차단(open)할지
+# - BACKEND_OPEN_SECONDS: 차단 후 시험 요청(half-open)을 허용하기까지 대기 시간 (초)
+BACKEND_HEALTH_INTERVAL = float(os.getenv('BACKEND_HEALTH_INTERVAL', '10'))
+BACKEND_HEALTH_TIMEOUT = float(os.getenv('BACKEND_HEALTH_TIMEOUT', '5'))
+BACKEND_FAILURE_THRESHOLD = int(os.getenv('BACKEND_FAILURE_THRESHOLD', '3'))
+BACKEND_OPEN_SECONDS = float(os.getenv('BACKEND_OPEN_SECONDS', '15'))
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """백엔드 상태를 캐시하는 closed / open / half-open 서킷 브레이커"""
+
+    def __init__(self, failure_threshold=BACKEND_FAILURE_THRESHOLD, open_seconds=BACKEND_OPEN_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_started_at = 0.0
+        self._last_success_at = None
+        self._last_failure_at = None
+        self._last_error = None
+        self._rejected = 0
+
+    @property
+    def state(self):
+        return self._state
+
+    def allow_request(self):
+        """백엔드 호출을 시도해도 되는지 즉시 판단 (네트워크 호출 없음)"""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+
+            now = time.monotonic()
+            if self._state == OPEN:
+                if now - self._opened_at >= self.open_seconds:
+                    # 시험 요청 하나만 통과시킴
+                    self._state = HALF_OPEN
+                    self._trial_started_at = now
+                    return True
+            elif now - self._trial_started_at >= self.open_seconds:
+                # 시험 요청 결과가 오지 않으면 다음 시험 요청 허용
+                self._trial_started_at = now
+                return True
+
+            self._rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self._state != CLOSED:
+                print("✅ 백엔드 복구됨: 서킷 브레이커 closed")
+            self._state = CLOSED
+            self._failures = 0
+            self._last_success_at = time.time()
+
+    def record_failure(self, error=None):
+        with self._lock:
+            self._failures += 1
+            self._last_failure_at = time.time()
+            self._last_error = error
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    print(f"🚫 백엔드 차단: 서킷 브레이커 open ({error})")
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+
+    def record(self, success, error=None):
+        if success:
+            self.record_success()
+        else:
+            self.record_failure(error)
+
+    def snapshot(self):
+        with self._lock:
+            retry_in = None
+            if self._state == OPEN:
+                retry_in = max(0.0, self.open_seconds - (time.monotonic() - self._opened_at))
+            return {
+                'state': self._state,
+                'consecutive_failures': self._failures,
+                'failure_threshold': self.failure_threshold,
+                'open_seconds': self.open_seconds,
+                'retry_in_seconds': retry_in,
+                'last_success_at': self._last_success_at,
+                'last_failure_at': self._last_failure_at,
+                'last_error': self._last_error,
+                'rejected_requests': self._rejected,
+            }
+
+
+class HealthMonitor:
+    """백그라운드 /health 확인과 실제 호출 결과로 백엔드 상태를 갱신"""
+
+    def __init__(self, breaker, interval=BACKEND_HEALTH_INTERVAL, timeout=BACKEND_HEALTH_TIMEOUT):
+        self.breaker = breaker
+        self.interval = interval
+        self.timeout = timeout
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._last_probe_at = None
+        self._last_probe_ok = None
+
+    def start(self):
+        """프로버 스레드를 한 번만 시작"""
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='backend-health-prober', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self.probe()
+            time.sleep(self.interval)
+
+    def probe(self):
+        """/health 한 번 확인하고 결과를 브레이커에 반영"""
+        try:
+            response = backend_client.get('/health', timeout=self.timeout, record_outcome=False)
+            ok = response.status_code == 200
+            error = None if ok else f"HTTP {response.status_code}"
+        except requests.RequestException as e:
+            ok = False
+            error = str(e)
+
+        self._last_probe_at = time.time()
+        self._last_probe_ok = ok
+        self.breaker.record(ok, error)
+        return ok
+
+    def is_available(self):
+        """라우트에서 백엔드 호출 여부를 즉시 결정"""
+        self.start()
+        return self.breaker.allow_request()
+
+    def snapshot(self):
+        data = self.breaker.snapshot()
+        data.update({
+            'probe_interval': self.interval,
+            'prober_running': self._thread is not None and self._thread.is_alive(),
+            'last_probe_at': self._last_probe_at,
+            'last_probe_ok': self._last_probe_ok,
+        })
+        return data
+
+
+breaker = CircuitBreaker()
+monitor = HealthMonitor(breaker)
+
+# 실제 백엔드 호출 결과도 브레이커에 반영
+backend_client.add_outcome_listener(breaker.record)
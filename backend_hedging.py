@@ -0,0 +1,316 @@
+import os
+import time
+import random
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import requests
+
+import backend_client
+import deadlines
+
+# 백엔드 GET 헤징/재시도 설정
+# - BACKEND_HEDGE_POLICIES: 엔드포인트별 정책 "경로=헤징 백분위:최대 시도 수" ("/playlist=95:3")
+#   백분위를 0으로 두면 헤징 없이 재시도만 한다. 정책이 없는 경로는 예전처럼 한 번만 호출
+# - BACKEND_HEDGE_MIN_DELAY: 지연 기록이 적거나 매우 빠를 때도 최소 이만큼은 기다린 뒤 헤징 (초)
+# - BACKEND_RETRY_BASE_DELAY / BACKEND_RETRY_MAX_DELAY: 재시도 지수 백오프 시작/상한 (초, full jitter)
+# - BACKEND_RETRY_BUDGET_RATIO: 일반 요청 대비 추가 요청(헤징+재시도) 비율 상한
+# - BACKEND_RETRY_BUDGET_MIN: 요청이 적을 때도 허용하는 초당 추가 요청 수
+# - BACKEND_HEDGE_WORKERS: 헤징 요청을 보내는 스레드 수
+BACKEND_HEDGE_MIN_DELAY = float(os.getenv('BACKEND_HEDGE_MIN_DELAY', '0.05'))
+BACKEND_RETRY_BASE_DELAY = float(os.getenv('BACKEND_RETRY_BASE_DELAY', '0.1'))
+BACKEND_RETRY_MAX_DELAY = float(os.getenv('BACKEND_RETRY_MAX_DELAY', '1'))
+BACKEND_RETRY_BUDGET_RATIO = float(os.getenv('BACKEND_RETRY_BUDGET_RATIO', '0.1'))
+BACKEND_RETRY_BUDGET_MIN = float(os.getenv('BACKEND_RETRY_BUDGET_MIN', '1'))
+BACKEND_HEDGE_WORKERS = int(os.getenv('BACKEND_HEDGE_WORKERS', '16'))
+
+DEFAULT_POLICIES = {
+    '/playlist': (95, 3),
+    '/popular-playlist': (95, 3),
+    '/myplaylist': (95, 3),
+}
+
+# 백분위 계산에 쓰는 최근 응답 수 / 헤징을 시작하는 최소 기록 수 / 백분위를 다시 계산하는 주기
+LATENCY_WINDOW = 256
+MIN_LATENCY_SAMPLES = 20
+RECOMPUTE_EVERY = 16
+
+_executor = ThreadPoolExecutor(max_workers=BACKEND_HEDGE_WORKERS, thread_name_prefix='backend-hedge')
+# 비어 있는 워커 수 - 요청이 풀 대기열에서 기다리지 않도록 자리가 있을 때만 풀에 넘김
+_idle_workers = threading.BoundedSemaphore(BACKEND_HEDGE_WORKERS)
+
+
+def _parse_policies(value):
+    """'path=percentile:attempts,...' 형식의 환경변수를 {path: (percentile, attempts)}로 변환"""
+    policies = dict(DEFAULT_POLICIES)
+    for item in value.split(','):
+        if '=' not in item:
+            continue
+        path, spec = item.split('=', 1)
+        try:
+            percentile, attempts = spec.split(':', 1)
+            policies[path.strip()] = (float(percentile), max(int(attempts), 1))
+        except ValueError:
+            print(f"⚠️ 잘못된 헤징 정책 설정 무시: {item}")
+    return policies
+
+
+class RetryBudget:
+    """추가 요청(헤징/재시도) 예산 - 일반 요청마다 ratio만큼 쌓이고 추가 요청마다 1씩 사용
+
+    백엔드가 전부 실패해도 추가 요청은 일반 요청의 ratio 배 + 초당 min_per_second를
+    넘지 않으므로 장애를 키우지 않는다.
+    """
+
+    def __init__(self, ratio=BACKEND_RETRY_BUDGET_RATIO, min_per_second=BACKEND_RETRY_BUDGET_MIN):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        # 쌓아 둘 수 있는 상한 - 조용하던 뒤 몰려오는 재시도를 막음
+        self.max_tokens = max(10 * min_per_second, 10)
+        self._tokens = self.max_tokens
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.exhausted = 0
+
+    def _refill_locked(self):
+        now = time.monotonic()
+        self._tokens = min(self.max_tokens, self._tokens + (now - self._updated) * self.min_per_second)
+        self._updated = now
+
+    def deposit(self):
+        with self._lock:
+            self._refill_locked()
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self):
+        with self._lock:
+            self._refill_locked()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            self.exhausted += 1
+            return False
+
+    def tokens(self):
+        with self._lock:
+            self._refill_locked()
+            return round(self._tokens, 2)
+
+
+class EndpointStats:
+    """엔드포인트별 최근 응답 시간과 헤징/재시도 횟수"""
+
+    def __init__(self, percentile):
+        self.percentile = percentile
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._since_recompute = 0
+        self._threshold = None
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.retries = 0
+        self.failures = 0
+        # 헤징 풀이 가득 차서 헤징 없이 보낸 횟수
+        self.saturated = 0
+
+    def record_latency_locked(self, seconds):
+        self._latencies.append(seconds)
+        self._since_recompute += 1
+        if self._since_recompute >= RECOMPUTE_EVERY or self._threshold is None:
+            self._since_recompute = 0
+            if len(self._latencies) >= MIN_LATENCY_SAMPLES:
+                ordered = sorted(self._latencies)
+                index = min(int(len(ordered) * self.percentile / 100), len(ordered) - 1)
+                self._threshold = ordered[index]
+
+    def hedge_delay_locked(self):
+        """헤징 요청을 보낼 때까지 기다릴 시간 (기록이 부족하거나 헤징을 안 하면 None)"""
+        if self.percentile <= 0 or self._threshold is None:
+            return None
+        return max(self._threshold, BACKEND_HEDGE_MIN_DELAY)
+
+    def to_dict_locked(self):
+        return {
+            'percentile': self.percentile,
+            'hedge_delay': round(self._threshold, 4) if self._threshold is not None else None,
+            'samples': len(self._latencies),
+            'requests': self.requests,
+            'hedges': self.hedges,
+            'hedge_wins': self.hedge_wins,
+            'hedge_rate': round(self.hedges / self.requests, 4) if self.requests else None,
+            'retries': self.retries,
+            'retry_rate': round(self.retries / self.requests, 4) if self.requests else None,
+            'failures': self.failures,
+            'saturated': self.saturated,
+        }
+
+
+def _retryable(response):
+    return response.status_code >= 500
+
+
+def _reserve_worker():
+    """비어 있는 워커 하나를 잡음 (없으면 False) - 잡은 자리는 _submit_reserved로 사용"""
+    return _idle_workers.acquire(blocking=False)
+
+
+def _submit_reserved(fn, *args):
+    """_reserve_worker로 잡은 자리에서 fn 실행 - 끝나면 자리 반환"""
+    def run():
+        try:
+            return fn(*args)
+        finally:
+            _idle_workers.release()
+    return _executor.submit(run)
+
+
+def _close_when_done(future):
+    """버려진 헤징 요청의 응답이 도착하면 커넥션을 풀로 돌려줌"""
+    def close(done):
+        if not done.cancelled() and done.exception() is None:
+            done.result().close()
+    future.add_done_callback(close)
+
+
+class HedgedClient:
+    """정책이 있는 엔드포인트의 GET을 헤징 + 백오프 재시도로 호출"""
+
+    def __init__(self, policies, budget=None):
+        self.policies = policies
+        self.budget = budget or RetryBudget()
+        self._stats = {path: EndpointStats(percentile) for path, (percentile, _) in policies.items()}
+        self._lock = threading.Lock()
+
+    def get(self, path, **kwargs):
+        """backend_client.get과 같은 사용법 - 정책이 없는 경로는 그대로 한 번 호출"""
+        policy = self.policies.get(path)
+        if policy is None:
+            return backend_client.get(path, **kwargs)
+
+        _, max_attempts = policy
+        stats = self._stats[path]
+        with self._lock:
+            stats.requests += 1
+        self.budget.deposit()
+
+        attempt = 1
+        while True:
+            try:
+                response = self._hedged_attempt(path, stats, kwargs)
+                if not _retryable(response) or attempt >= max_attempts:
+                    return response
+                error = f"HTTP {response.status_code}"
+            except requests.RequestException as e:
+                if attempt >= max_attempts:
+                    with self._lock:
+                        stats.failures += 1
+                    raise
+                response, error = None, e
+
+            if not self.budget.withdraw():
+                print(f"⚠️ 재시도 예산 소진 - {path} 재시도하지 않음 ({error})")
+                if response is not None:
+                    return response
+                with self._lock:
+                    stats.failures += 1
+                raise error
+
+            # full jitter 지수 백오프 - 요청 마감 시간 안에 다시 보낼 수 없으면 포기
+            delay = random.uniform(0, min(BACKEND_RETRY_MAX_DELAY, BACKEND_RETRY_BASE_DELAY * 2 ** (attempt - 1)))
+            left = deadlines.remaining()
+            if left is not None and left <= delay:
+                print(f"⏱️ 요청 마감 시간이 부족해 {path} 재시도하지 않음 ({error})")
+                if response is not None:
+                    return response
+                with self._lock:
+                    stats.failures += 1
+                raise error
+
+            if response is not None:
+                response.close()
+            print(f"🔁 백엔드 {path} 재시도 {attempt}/{max_attempts - 1} ({error}) - {delay:.2f}초 후")
+            with self._lock:
+                stats.retries += 1
+            time.sleep(delay)
+            attempt += 1
+
+    def _timed_get(self, path, stats, kwargs):
+        started = time.monotonic()
+        # 재시도는 여기서 예산 안에서만 하므로 어댑터 재시도는 끔
+        response = backend_client.get(path, retry=False, **kwargs)
+        if not _retryable(response):
+            with self._lock:
+                stats.record_latency_locked(time.monotonic() - started)
+        return response
+
+    def _hedged_attempt(self, path, stats, kwargs):
+        """요청 하나를 보내고, 최근 지연 백분위 안에 응답이 없으면 같은 요청을 하나 더 보내 빠른 쪽 사용
+
+        헤징 풀의 워커가 모두 바쁘면 풀에서 기다리는 시간이 헤징 지연에 섞이고 헤징 요청도
+        밀리므로, 이때는 헤징 없이 호출한 스레드에서 바로 보낸다.
+        """
+        with self._lock:
+            hedge_delay = stats.hedge_delay_locked()
+        if hedge_delay is None:
+            return self._timed_get(path, stats, kwargs)
+
+        if not _reserve_worker():
+            with self._lock:
+                stats.saturated += 1
+            return self._timed_get(path, stats, kwargs)
+        primary = _submit_reserved(deadlines.propagate(self._timed_get), path, stats, kwargs)
+        done, _ = wait([primary], timeout=hedge_delay)
+        if done:
+            return primary.result()
+
+        if not _reserve_worker():
+            with self._lock:
+                stats.saturated += 1
+            return primary.result()
+        if not self.budget.withdraw():
+            _idle_workers.release()
+            return primary.result()
+        with self._lock:
+            stats.hedges += 1
+        hedge = _submit_reserved(deadlines.propagate(self._timed_get), path, stats, kwargs)
+        pending = {primary, hedge}
+        finished = []
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            finished.extend(done)
+            # 정상 응답이 하나라도 오면 사용, 5xx/오류면 다른 쪽을 기다림
+            winner = next((f for f in finished if f.exception() is None and not _retryable(f.result())), None)
+            if winner is not None:
+                break
+        else:
+            winner = next((f for f in finished if f.exception() is None), None)
+            if winner is None:
+                raise finished[-1].exception()
+
+        for future in finished:
+            if future is not winner and future.exception() is None:
+                future.result().close()
+        for future in pending:
+            _close_when_done(future)
+        if winner is hedge:
+            with self._lock:
+                stats.hedge_wins += 1
+        return winner.result()
+
+    def stats(self):
+        with self._lock:
+            endpoints = {path: stats.to_dict_locked() for path, stats in self._stats.items()}
+        return {
+            'endpoints': endpoints,
+            'budget_tokens': self.budget.tokens(),
+            'budget_ratio': self.budget.ratio,
+            'budget_exhausted': self.budget.exhausted,
+        }
+
+
+client = HedgedClient(_parse_policies(os.getenv('BACKEND_HEDGE_POLICIES', '')))
+
+
+def get(path, **kwargs):
+    return client.get(path, **kwargs)
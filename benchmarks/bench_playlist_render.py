@@ -0,0 +1,119 @@
+"""5천 곡 플레이리스트 렌더링 마이크로벤치마크
+
+예전 format_date(매 행마다 형식을 차례로 시도)와 date_parser 기반 경로를 비교한다.
+
+    python benchmarks/bench_playlist_render.py [행 수] [반복 횟수]
+"""
+import os
+import sys
+import time
+import datetime
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# app을 가져오면 업로드 폴더와 로컬 DB를 현재 디렉터리에 만들므로 임시 디렉터리에서 실행
+os.chdir(tempfile.mkdtemp(prefix='bench-playlist-'))
+
+import app as app_module  # noqa: E402
+import date_parser  # noqa: E402
+
+
+def legacy_format_date(value, format='%Y년 %m월 %d일 %H:%M'):
+    """변경 전 format_date 그대로 (비교 기준)"""
+    if isinstance(value, str):
+        try:
+            value = datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            try:
+                value = datetime.datetime.strptime(value, '%a, %d %b %Y %H:%M:%S %Z')
+            except ValueError:
+                for fmt in ['%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d']:
+                    try:
+                        value = datetime.datetime.strptime(value, fmt)
+                        break
+                    except ValueError:
+                        continue
+                else:
+                    value = datetime.datetime.now()
+    return value.strftime(format)
+
+
+def backend_rows(count):
+    """백엔드가 보내는 GMT 형식 createdAt 목록 (ISO 시도가 항상 실패하는 경우)"""
+    start = datetime.datetime(2025, 5, 26, 3, 36, 17)
+    return [
+        {
+            'id': i,
+            'title': f'음악 {i}',
+            'musicUrl': f'https://example.com/{i}.mp3',
+            'createdAt': (start - datetime.timedelta(minutes=i)).strftime('%a, %d %b %Y %H:%M:%S GMT'),
+        }
+        for i in range(count)
+    ]
+
+
+def render(rows):
+    with app_module.app.test_request_context('/playlist'):
+        return app_module.render_template('playlist.html', music_list=rows, music=None)
+
+
+def timed(label, fn, repeat):
+    fn()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = (time.perf_counter() - started) / repeat
+    print(f"{label:<40} {elapsed * 1000:8.2f} ms")
+    return elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    backend = backend_rows(count)
+
+    raw_rows = [
+        {'id': m['id'], 'title': m['title'], 'created_at': m['createdAt']}
+        for m in backend
+    ]
+
+    print(f"{count}행, {repeat}회 평균")
+
+    # 변경 전: 템플릿이 행마다 문자열을 파싱
+    app_module.app.jinja_env.filters['format_date'] = legacy_format_date
+    before = timed('렌더링 (예전 format_date)', lambda: render(raw_rows), repeat)
+
+    # 변경 후: 목록이 들어올 때 한 번 변환하고 템플릿에는 datetime 전달
+    app_module.app.jinja_env.filters['format_date'] = app_module.format_date
+
+    def ingest_and_render():
+        rows = [
+            {'id': m['id'], 'title': m['title'],
+             'created_at': date_parser.parse(m['createdAt'], '/myplaylist')}
+            for m in backend
+        ]
+        return render(rows)
+
+    def cold_ingest_and_render():
+        date_parser.parser = date_parser.DateParser()
+        return ingest_and_render()
+
+    first = timed('변환(캐시 없음) + 렌더링', cold_ingest_and_render, repeat)
+    after = timed('변환(LRU 적중) + 렌더링', ingest_and_render, repeat)
+
+    print(f"예전 대비: 캐시 없음 {before / first:.1f}배, LRU 적중 {before / after:.1f}배")
+
+    # 날짜 처리만 따로 (렌더링 비용 제외)
+    strings = [m['createdAt'] for m in backend]
+    legacy_only = timed('날짜 처리만 (예전 format_date)', lambda: [legacy_format_date(v) for v in strings], repeat)
+    parsed_only = timed('날짜 처리만 (LRU 변환 + format_date)', lambda: [
+        app_module.format_date(date_parser.parse(v, '/myplaylist')) for v in strings
+    ], repeat)
+    print(f"날짜 처리 예전 대비: {legacy_only / parsed_only:.1f}배")
+    print(date_parser.parser.stats())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,246 @@
+import os
+import time
+import uuid
+import hashlib
+import sqlite3
+from contextlib import contextmanager
+
+# 업로드 저장소 설정
+# - BLOB_STORE_MAX_BYTES: 참조되지 않는 파일을 지우기 시작하는 전체 크기 (바이트)
+# - BLOB_REUSE_BACKEND_RESULT: 같은 사용자가 같은 파일을 다시 올리면 백엔드에 다시 보내지 않고 이전 생성 결과 재사용
+#   (다른 사용자나 익명 사용자의 결과는 재사용하지 않음)
+BLOB_STORE_MAX_BYTES = int(os.getenv('BLOB_STORE_MAX_BYTES', str(2 * 1024 * 1024 * 1024)))
+BLOB_REUSE_BACKEND_RESULT = os.getenv('BLOB_REUSE_BACKEND_RESULT', '1') == '1'
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def _hash_stream(stream):
+    """스트림 끝까지 읽으며 (sha256 hex, 크기) 계산"""
+    digest = hashlib.sha256()
+    size = 0
+    while True:
+        data = stream.read(READ_CHUNK_SIZE)
+        if not data:
+            break
+        digest.update(data)
+        size += len(data)
+    return digest.hexdigest(), size
+
+
+class BlobStore:
+    """sha256 기준으로 파일을 한 번만 저장하는 업로드 저장소
+
+    파일은 root/ab/cd/<sha256> 형태로 나눠 저장하고, 참조 수와 마지막 사용 시각은
+    SQLite 인덱스에 둔다 (여러 스레드/프로세스에서 같이 사용 가능).
+    참조 수가 0인 파일은 바로 지우지 않고 중복 업로드 대비용으로 남겨 두었다가,
+    전체 크기가 max_bytes를 넘으면 오래 사용하지 않은 것부터 삭제한다.
+    """
+
+    def __init__(self, root, max_bytes=BLOB_STORE_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.tmp_dir = os.path.join(root, 'tmp')
+        self.index_path = os.path.join(root, 'index.sqlite3')
+        os.makedirs(self.tmp_dir, exist_ok=True)
+
+        with self._db() as db:
+            db.execute('''
+                CREATE TABLE IF NOT EXISTS blobs (
+                    digest TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    refcount INTEGER NOT NULL DEFAULT 0,
+                    last_used REAL NOT NULL
+                )
+            ''')
+            db.execute('CREATE INDEX IF NOT EXISTS idx_blobs_evict ON blobs (refcount, last_used)')
+            # 예전 backend_results는 사용자 구분 없이 저장했으므로 버리고 사용자별 테이블 사용
+            db.execute('DROP TABLE IF EXISTS backend_results')
+            db.execute('''
+                CREATE TABLE IF NOT EXISTS user_backend_results (
+                    owner TEXT NOT NULL,
+                    digest TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    music_id TEXT,
+                    music_url TEXT,
+                    title TEXT,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (owner, digest, kind)
+                )
+            ''')
+            db.execute('CREATE INDEX IF NOT EXISTS idx_user_backend_results_digest ON user_backend_results (digest)')
+
+    def _connect(self):
+        return sqlite3.connect(self.index_path, timeout=30, isolation_level=None)
+
+    @contextmanager
+    def _db(self):
+        db = self._connect()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def path(self, digest):
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def _acquire(self, digest, size):
+        """참조 수 +1 (없으면 등록)"""
+        with self._db() as db:
+            db.execute('''
+                INSERT INTO blobs (digest, size, refcount, last_used) VALUES (?, ?, 1, ?)
+                ON CONFLICT(digest) DO UPDATE SET refcount = refcount + 1, last_used = excluded.last_used
+            ''', (digest, size, time.time()))
+
+    def release(self, digest):
+        """참조 수 -1 - 0이 되어도 파일은 남겨 두고 정리 대상이 됨"""
+        if not digest:
+            return
+        with self._db() as db:
+            db.execute(
+                'UPDATE blobs SET refcount = MAX(refcount - 1, 0), last_used = ? WHERE digest = ?',
+                (time.time(), digest)
+            )
+
+    def _move_into_place(self, temp_path, digest):
+        """임시 파일을 저장 위치로 옮김 (이미 있으면 임시 파일 삭제)"""
+        dest = self.path(digest)
+        if os.path.exists(dest):
+            os.remove(temp_path)
+            return False
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        os.replace(temp_path, dest)
+        return True
+
+    def put_stream(self, stream):
+        """업로드 스트림 저장 후 (digest, 새로 저장했는지) 반환 - 참조 1개를 잡음
+
+        되감을 수 있는 스트림은 먼저 해시만 계산해서 이미 있는 파일이면 디스크에 쓰지 않는다.
+        """
+        if hasattr(stream, 'seekable') and stream.seekable():
+            start = stream.tell()
+            digest, size = _hash_stream(stream)
+
+            self._acquire(digest, size)
+            if os.path.exists(self.path(digest)):
+                print(f"♻️ 중복 업로드 - 저장 생략: {digest[:12]}")
+                return digest, False
+
+            stream.seek(start)
+            temp_path = self._write_temp(stream)[0]
+        else:
+            temp_path, digest, size = self._write_temp(stream)
+            self._acquire(digest, size)
+
+        created = self._move_into_place(temp_path, digest)
+        self.collect_garbage()
+        return digest, created
+
+    def put_file(self, path):
+        """이미 디스크에 있는 파일(예: 조립된 이어받기 업로드)을 저장소로 옮김 - 참조 1개를 잡음"""
+        with open(path, 'rb') as f:
+            digest, size = _hash_stream(f)
+
+        self._acquire(digest, size)
+        created = self._move_into_place(path, digest)
+        if not created:
+            print(f"♻️ 중복 업로드 - 저장 생략: {digest[:12]}")
+        self.collect_garbage()
+        return digest, created
+
+    def _write_temp(self, stream):
+        """스트림을 임시 파일로 쓰면서 해시 계산"""
+        temp_path = os.path.join(self.tmp_dir, uuid.uuid4().hex)
+        digest = hashlib.sha256()
+        size = 0
+        with open(temp_path, 'wb') as f:
+            while True:
+                data = stream.read(READ_CHUNK_SIZE)
+                if not data:
+                    break
+                digest.update(data)
+                size += len(data)
+                f.write(data)
+        return temp_path, digest.hexdigest(), size
+
+    def backend_result(self, owner, digest, kind):
+        """같은 사용자가 같은 파일로 이전에 백엔드에서 생성한 결과 (없거나 익명이면 None)"""
+        if not BLOB_REUSE_BACKEND_RESULT or not owner or owner == 'anonymous':
+            return None
+        with self._db() as db:
+            row = db.execute(
+                'SELECT music_id, music_url, title FROM user_backend_results WHERE owner = ? AND digest = ? AND kind = ?',
+                (owner, digest, kind)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'id': row[0], 'musicUrl': row[1], 'title': row[2]}
+
+    def save_backend_result(self, owner, digest, kind, music_data):
+        if not owner or owner == 'anonymous':
+            return
+        with self._db() as db:
+            db.execute('''
+                INSERT OR REPLACE INTO user_backend_results (owner, digest, kind, music_id, music_url, title, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (owner, digest, kind, music_data.get('id'), music_data.get('musicUrl'), music_data.get('title'),
+                  time.time()))
+
+    def forget_backend_result(self, owner, music_id):
+        """사용자가 지운 음악의 생성 결과를 재사용하지 않도록 삭제"""
+        if not owner:
+            return
+        with self._db() as db:
+            db.execute(
+                'DELETE FROM user_backend_results WHERE owner = ? AND music_id = ?',
+                (owner, str(music_id))
+            )
+
+    def collect_garbage(self):
+        """전체 크기가 max_bytes를 넘으면 참조 없는 파일을 오래된 순으로 삭제
+
+        삭제는 쓰기 잠금을 잡은 트랜잭션 안에서 하므로, 같은 파일을 새로 참조하는
+        업로드와 겹쳐도 참조 중인 파일이 지워지지 않는다.
+        """
+        removed = 0
+        db = self._connect()
+        try:
+            db.execute('BEGIN IMMEDIATE')
+            total = db.execute('SELECT COALESCE(SUM(size), 0) FROM blobs').fetchone()[0]
+            if total > self.max_bytes:
+                candidates = db.execute(
+                    'SELECT digest, size FROM blobs WHERE refcount = 0 ORDER BY last_used'
+                ).fetchall()
+                for digest, size in candidates:
+                    if total <= self.max_bytes:
+                        break
+                    try:
+                        os.remove(self.path(digest))
+                    except FileNotFoundError:
+                        pass
+                    db.execute('DELETE FROM blobs WHERE digest = ?', (digest,))
+                    db.execute('DELETE FROM user_backend_results WHERE digest = ?', (digest,))
+                    total -= size
+                    removed += 1
+            db.execute('COMMIT')
+        except Exception:
+            db.execute('ROLLBACK')
+            raise
+        finally:
+            db.close()
+
+        if removed:
+            print(f"🧹 참조 없는 업로드 파일 {removed}개 삭제")
+        return removed
+
+    def stats(self):
+        with self._db() as db:
+            count, total, referenced = db.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(refcount > 0), 0) FROM blobs'
+            ).fetchone()
+        return {
+            'blobs': count,
+            'referenced_blobs': referenced,
+            'total_bytes': total,
+            'max_bytes': self.max_bytes
+        }
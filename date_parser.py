@@ -0,0 +1,101 @@
+import os
+import datetime
+import threading
+from collections import OrderedDict
+
+# 날짜 파싱 설정
+# - DATE_PARSE_CACHE_SIZE: 파싱 결과를 기억해 둘 날짜 문자열 수 (LRU)
+DATE_PARSE_CACHE_SIZE = int(os.getenv('DATE_PARSE_CACHE_SIZE', '8192'))
+
+ISO_FORMAT = 'iso'
+
+# 시도 순서 - ISO, GMT ('Mon, 26 May 2025 03:36:17 GMT'), 그 밖의 일반적인 형식
+FORMATS = (
+    ISO_FORMAT,
+    '%a, %d %b %Y %H:%M:%S %Z',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%d',
+)
+
+_MISSING = object()
+
+
+def _parse_with(value, fmt):
+    try:
+        if fmt == ISO_FORMAT:
+            return datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+        return datetime.datetime.strptime(value, fmt)
+    except ValueError:
+        return None
+
+
+class DateParser:
+    """형식을 자동으로 찾는 날짜 파서 - 출처별 형식 기억 + 문자열별 LRU
+
+    같은 엔드포인트의 날짜는 보통 같은 형식이므로 출처(source)마다 마지막으로 맞은 형식을
+    먼저 시도한다. 같은 문자열은 목록을 다시 그릴 때마다 반복되므로 결과(실패 포함)를
+    LRU로 기억해서 다시 파싱하지 않는다.
+    """
+
+    def __init__(self, cache_size=DATE_PARSE_CACHE_SIZE):
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._source_formats = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.failures = 0
+
+    def parse(self, value, source=None):
+        """날짜 문자열을 datetime으로 변환 (알 수 없는 형식이면 None, datetime은 그대로)"""
+        if not isinstance(value, str):
+            return value
+
+        with self._lock:
+            result = self._cache.get(value, _MISSING)
+            if result is not _MISSING:
+                self._cache.move_to_end(value)
+                self.hits += 1
+                return result
+            self.misses += 1
+            known = self._source_formats.get(source)
+
+        result = _parse_with(value, known) if known else None
+        if result is None:
+            for fmt in FORMATS:
+                if fmt == known:
+                    continue
+                result = _parse_with(value, fmt)
+                if result is not None:
+                    with self._lock:
+                        self._source_formats[source] = fmt
+                    break
+
+        with self._lock:
+            if result is None:
+                self.failures += 1
+            self._cache[value] = result
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._cache),
+                'max_entries': self.cache_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'failures': self.failures,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else None,
+                'source_formats': {str(source): fmt for source, fmt in self._source_formats.items()},
+            }
+
+
+parser = DateParser()
+
+
+def parse(value, source=None):
+    return parser.parse(value, source)
@@ -0,0 +1,148 @@
+import os
+import time
+import threading
+import contextvars
+
+import requests
+
+# 요청 마감 시간(deadline) 설정
+# - ROUTE_BUDGETS: 라우트(Flask endpoint 이름)별 전체 응답 시간 예산 재정의 ("playlist=3,playlist_main=3")
+# - REQUEST_BUDGET_DEFAULT: 목록에 없는 라우트의 예산 (초, 0이면 마감 없음)
+# - DEADLINE_RENDER_RESERVE: 예산 중 백엔드 호출에 주지 않고 대체 경로/렌더링용으로 남겨 두는 시간 (초)
+# - BACKEND_DEADLINE_HEADER: 남은 시간(ms)을 백엔드에 알리는 헤더 이름
+REQUEST_BUDGET_DEFAULT = float(os.getenv('REQUEST_BUDGET_DEFAULT', '10'))
+DEADLINE_RENDER_RESERVE = float(os.getenv('DEADLINE_RENDER_RESERVE', '0.3'))
+BACKEND_DEADLINE_HEADER = os.getenv('BACKEND_DEADLINE_HEADER', 'X-Request-Deadline-Ms')
+
+DEFAULT_BUDGETS = {
+    'playlist': 3,
+    'playlist_items': 3,
+    'playlist_main': 3,
+    'api_get_playlist': 3,
+    'api_get_popular_playlist': 3,
+    'like_music': 3,
+    'unlike_music': 3,
+    'reconcile_likes': 3,
+    'delete_music': 5,
+    # 클라이언트가 본문을 보내는 시간이 대부분인 업로드와 오래 열려 있는 진행 상황 스트림은 예산 없음
+    'upload_file': 0,
+    'put_upload_chunk': 0,
+    'generate_music_from_image': 0,
+    'generate_music_from_video': 0,
+    'stream_generation_job': 0,
+}
+
+# 백엔드 호출에 쓸 수 있는 마감 시각 (time.monotonic 기준, 없으면 None)
+_backend_deadline = contextvars.ContextVar('backend_deadline', default=None)
+
+# 마감 때문에 건너뛴 호출 / 타임아웃을 줄인 호출 수
+_counter_lock = threading.Lock()
+_counters = {'skipped_calls': 0, 'shortened_calls': 0}
+
+
+def _count(name):
+    with _counter_lock:
+        _counters[name] += 1
+
+
+class DeadlineExceeded(requests.Timeout):
+    """마감 시간이 지나 백엔드 호출을 건너뜀 - requests.Timeout이므로 기존 대체 경로가 그대로 처리"""
+
+
+def _parse_budgets(value):
+    """'endpoint=seconds,...' 형식의 환경변수를 dict로 변환"""
+    budgets = dict(DEFAULT_BUDGETS)
+    for item in value.split(','):
+        if '=' not in item:
+            continue
+        endpoint, seconds = item.split('=', 1)
+        try:
+            budgets[endpoint.strip()] = float(seconds)
+        except ValueError:
+            print(f"⚠️ 잘못된 라우트 예산 설정 무시: {item}")
+    return budgets
+
+
+def remaining():
+    """백엔드 호출에 남은 시간 (초, 마감이 없으면 None, 지났으면 0 이하)"""
+    deadline = _backend_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def check():
+    """마감이 지났으면 DeadlineExceeded - 남은 시간 반환"""
+    left = remaining()
+    if left is not None and left <= 0:
+        _count('skipped_calls')
+        raise DeadlineExceeded('요청 마감 시간이 지나 백엔드 호출을 건너뜁니다.')
+    return left
+
+
+def bound_timeout(timeout):
+    """(connect, read) 타임아웃을 남은 시간 이하로 줄임 - (timeout, 남은 시간)"""
+    left = check()
+    if left is None:
+        return timeout, None
+    connect, read = timeout
+    if read > left:
+        _count('shortened_calls')
+    return (min(connect, left), min(read, left)), left
+
+
+def propagate(fn):
+    """현재 마감 시간을 다른 스레드에서도 쓰도록 fn을 현재 컨텍스트로 감쌈"""
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.run(fn, *args, **kwargs)
+
+
+class RouteDeadlines:
+    """라우트별 예산으로 요청마다 마감 시간을 정하고 예산 초과 여부를 기록"""
+
+    def __init__(self, budgets, default=REQUEST_BUDGET_DEFAULT, reserve=DEADLINE_RENDER_RESERVE):
+        self.budgets = budgets
+        self.default = default
+        self.reserve = reserve
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def budget(self, endpoint):
+        return self.budgets.get(endpoint, self.default)
+
+    def start(self, endpoint):
+        """요청 시작 - (시작 시각, 컨텍스트 토큰) 반환, 예산이 없으면 토큰은 None"""
+        started = time.monotonic()
+        budget = self.budget(endpoint)
+        if not budget or budget <= 0:
+            return started, None
+        # 대체 경로와 렌더링 시간을 남기도록 백엔드 마감은 예산보다 조금 앞당김
+        backend_budget = max(budget - min(self.reserve, budget / 2), 0)
+        return started, _backend_deadline.set(started + backend_budget)
+
+    def finish(self, endpoint, started, token):
+        elapsed = time.monotonic() - started
+        if token is not None:
+            try:
+                _backend_deadline.reset(token)
+            except ValueError:
+                # 다른 컨텍스트에서 끝난 경우 (스트리밍 응답 등)
+                _backend_deadline.set(None)
+        budget = self.budget(endpoint)
+        with self._lock:
+            route = self._routes.setdefault(endpoint, {'requests': 0, 'over_budget': 0, 'max_seconds': 0.0})
+            route['requests'] += 1
+            route['max_seconds'] = max(route['max_seconds'], round(elapsed, 4))
+            if budget and budget > 0 and elapsed > budget:
+                route['over_budget'] += 1
+
+    def stats(self):
+        with self._lock:
+            routes = {endpoint: dict(route, budget=self.budget(endpoint)) for endpoint, route in self._routes.items()}
+        with _counter_lock:
+            counters = dict(_counters)
+        return dict(counters, default_budget=self.default, render_reserve=self.reserve,
+                    header=BACKEND_DEADLINE_HEADER, routes=routes)
+
+
+routes = RouteDeadlines(_parse_budgets(os.getenv('ROUTE_BUDGETS', '')))
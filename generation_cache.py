@@ -0,0 +1,135 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+
+# 음악 생성 결과 캐시 설정
+# - GENERATION_CACHE_SCOPE: user(사용자별, 기본) / global(모든 사용자 공유) / off(사용 안 함)
+# - GENERATION_CACHE_TTL: 생성 결과를 재사용하는 시간 (초)
+# - GENERATION_CACHE_MAX_ENTRIES: 보관할 최대 결과 수 (초과 시 LRU 제거)
+# - GENERATION_CACHE_SPEED_BUCKET: 템포(1~100)를 이 폭으로 묶어 같은 프롬프트로 취급
+GENERATION_CACHE_SCOPE = os.getenv('GENERATION_CACHE_SCOPE', 'user')
+GENERATION_CACHE_TTL = float(os.getenv('GENERATION_CACHE_TTL', '3600'))
+GENERATION_CACHE_MAX_ENTRIES = int(os.getenv('GENERATION_CACHE_MAX_ENTRIES', '1024'))
+GENERATION_CACHE_SPEED_BUCKET = int(os.getenv('GENERATION_CACHE_SPEED_BUCKET', '10'))
+
+SCOPES = ('user', 'global', 'off')
+
+
+def normalize_text(value):
+    """공백을 하나로 줄이고 대소문자 구분 제거"""
+    return ' '.join(str(value or '').split()).casefold()
+
+
+def speed_bucket(speed, width=GENERATION_CACHE_SPEED_BUCKET):
+    """템포 값을 width 단위 구간 번호로 변환 (숫자가 아니면 None)"""
+    try:
+        return int(float(speed)) // max(width, 1)
+    except (TypeError, ValueError):
+        return None
+
+
+class GenerationCache:
+    """정규화한 프롬프트 -> 백엔드 생성 결과(musicUrl, title) 캐시 - TTL + LRU
+
+    같은 분위기/장소/템포 구간/상세 내용이면 백엔드 생성을 다시 요청하지 않고
+    이전 결과를 돌려준다. scope가 user면 같은 사용자의 요청끼리만 재사용한다.
+    """
+
+    def __init__(self, scope=GENERATION_CACHE_SCOPE, ttl=GENERATION_CACHE_TTL,
+                 max_entries=GENERATION_CACHE_MAX_ENTRIES):
+        if scope not in SCOPES:
+            print(f"⚠️ 잘못된 생성 캐시 범위 '{scope}' - user로 사용합니다.")
+            scope = 'user'
+        self.scope = scope
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self):
+        return self.scope != 'off' and self.ttl > 0 and self.max_entries > 0
+
+    def key(self, user_id, music_settings, detail_text):
+        """캐시 키 - (사용자 또는 None, 분위기, 장소, 템포 구간, 상세 내용), 사용 안 하면 None
+
+        scope가 user인데 로그인하지 않은 요청이면 서로 구분할 수 없으므로 캐시하지 않는다.
+        """
+        if not self.enabled:
+            return None
+        if self.scope == 'user' and not user_id:
+            return None
+        music_settings = music_settings or {}
+        return (
+            user_id if self.scope == 'user' else None,
+            normalize_text(music_settings.get('mood')),
+            normalize_text(music_settings.get('location')),
+            speed_bucket(music_settings.get('speed')) if music_settings else None,
+            normalize_text(detail_text),
+        )
+
+    def get(self, key):
+        """저장된 생성 결과 dict (없거나 만료되면 None)"""
+        if key is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, music_data):
+        """백엔드 생성 결과 저장 - id나 musicUrl이 없는 결과는 저장하지 않음"""
+        if key is None or not music_data.get('id') or not music_data.get('musicUrl'):
+            return
+        value = {
+            'id': music_data.get('id'),
+            'musicUrl': music_data.get('musicUrl'),
+            'title': music_data.get('title'),
+        }
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            self.stores += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_music(self, music_id):
+        """삭제된 음악을 가리키는 결과 제거"""
+        with self._lock:
+            keys = [key for key, (_, value) in self._entries.items() if str(value.get('id')) == str(music_id)]
+            for key in keys:
+                del self._entries[key]
+            self.invalidations += len(keys)
+        return len(keys)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'scope': self.scope,
+                'ttl': self.ttl,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else None,
+                'stores': self.stores,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
+
+
+cache = GenerationCache()
@@ -0,0 +1,180 @@
+import os
+import json
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# 음악 생성 작업 설정
+# - GENERATION_WORKERS: 백엔드 AI 생성 요청을 동시에 처리할 스레드 수
+# - GENERATION_JOB_TTL: 끝난 작업 기록을 보관하는 시간 (초)
+# - GENERATION_SSE_HEARTBEAT: 진행 상황 스트림에서 변화가 없을 때 keep-alive를 보내는 주기 (초)
+GENERATION_WORKERS = int(os.getenv('GENERATION_WORKERS', '4'))
+GENERATION_JOB_TTL = float(os.getenv('GENERATION_JOB_TTL', '600'))
+GENERATION_SSE_HEARTBEAT = float(os.getenv('GENERATION_SSE_HEARTBEAT', '15'))
+
+QUEUED = 'queued'
+RUNNING = 'running'
+UPLOADING = 'uploading'
+WAITING_BACKEND = 'waiting_backend'
+DONE = 'done'
+FAILED = 'failed'
+
+FINISHED_STATES = (DONE, FAILED)
+
+
+class Job:
+    """음악 생성 작업 하나의 상태"""
+
+    def __init__(self, kind, owner, lock):
+        self.id = str(uuid.uuid4())
+        self.kind = kind
+        self.owner = owner
+        self.state = QUEUED
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        self.finished_at = None
+        # 상태가 바뀔 때마다 증가 - 스트림이 새 이벤트 여부를 판단
+        self.version = 0
+        # 이 작업의 상태 변경 알림 (저장소 잠금 공유) - 스트림은 자기 작업이 바뀔 때만 깨어남
+        self.changed = threading.Condition(lock)
+
+    @property
+    def finished(self):
+        return self.state in FINISHED_STATES
+
+    def to_dict(self):
+        data = {
+            'job_id': self.id,
+            'kind': self.kind,
+            'status': self.state,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
+        }
+        if self.state == DONE:
+            data['result'] = self.result
+        elif self.state == FAILED:
+            data['error'] = self.error
+        return data
+
+
+class JobStore:
+    """생성 작업을 워커 풀에 넘기고 결과를 일정 시간 보관"""
+
+    def __init__(self, workers=GENERATION_WORKERS, ttl=GENERATION_JOB_TTL):
+        self.ttl = ttl
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._streams = 0
+        self._current = threading.local()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='generation')
+
+    def submit(self, kind, owner, fn, *args, on_finish=None):
+        """작업 등록 후 즉시 반환 - fn(*args)의 반환값이 작업 결과가 됨
+
+        fn은 워커 스레드에서 실행되므로 Flask request/session에 접근하면 안 된다.
+        on_finish는 작업이 성공/실패로 끝난 뒤 워커 스레드에서 호출된다.
+        """
+        job = Job(kind, owner, self._lock)
+        with self._lock:
+            self._expire_locked()
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job, fn, args, on_finish)
+        return job
+
+    def _run(self, job, fn, args, on_finish=None):
+        self._current.job = job
+        self._set_state(job, RUNNING)
+        try:
+            result = fn(*args)
+        except Exception as e:
+            print(f"🚨 생성 작업 실패 {job.id}: {e}")
+            self._set_state(job, FAILED, error=str(e))
+            return
+        finally:
+            self._current.job = None
+            if on_finish is not None:
+                on_finish()
+        self._set_state(job, DONE, result=result)
+
+    def report_progress(self, state):
+        """작업 함수 안에서 진행 단계 알림 (작업 스레드가 아니면 무시)"""
+        job = getattr(self._current, 'job', None)
+        if job is not None:
+            self._set_state(job, state)
+
+    def _set_state(self, job, state, result=None, error=None):
+        with self._lock:
+            job.state = state
+            job.updated_at = time.time()
+            if state == DONE:
+                job.result = result
+            elif state == FAILED:
+                job.error = error
+            if job.finished:
+                job.finished_at = job.updated_at
+            job.version += 1
+            job.changed.notify_all()
+
+    def get(self, job_id):
+        with self._lock:
+            self._expire_locked()
+            return self._jobs.get(job_id)
+
+    def events(self, job, heartbeat=GENERATION_SSE_HEARTBEAT):
+        """text/event-stream 형식으로 상태 변화를 내보내는 제너레이터
+
+        상태가 바뀔 때만 깨어나고, 변화가 없으면 heartbeat마다 keep-alive 주석을 보낸다.
+        작업이 끝나면 마지막 이벤트를 보내고 종료한다.
+        """
+        with self._lock:
+            self._streams += 1
+        try:
+            last_version = None
+            while True:
+                with job.changed:
+                    if job.version == last_version:
+                        job.changed.wait(timeout=heartbeat)
+                    version = job.version
+                    data = job.to_dict()
+                    finished = job.finished
+
+                if version == last_version:
+                    yield ': keep-alive\n\n'
+                    continue
+
+                last_version = version
+                yield f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+                if finished:
+                    return
+        finally:
+            with self._lock:
+                self._streams -= 1
+
+    def _expire_locked(self):
+        """끝난 지 ttl이 지난 작업 제거"""
+        cutoff = time.time() - self.ttl
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def stats(self):
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job.state] = counts.get(job.state, 0) + 1
+            return {
+                'jobs': len(self._jobs),
+                'by_status': counts,
+                'ttl': self.ttl,
+                'connected_streams': self._streams,
+            }
+
+
+jobs = JobStore()
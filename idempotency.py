@@ -0,0 +1,167 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+# Idempotency-Key 설정
+# - IDEMPOTENCY_TTL: 처리한 요청의 응답을 보관하고 같은 키의 재요청에 다시 보내는 시간 (초)
+# - IDEMPOTENCY_MAX_KEYS: 보관할 최대 키 수 (초과 시 오래된 것부터 제거)
+# - IDEMPOTENCY_WAIT_TIMEOUT: 같은 키의 첫 요청이 처리 중일 때 중복 요청이 기다리는 최대 시간 (초)
+# - IDEMPOTENCY_MAX_KEY_LENGTH: 허용하는 키 길이 상한
+IDEMPOTENCY_TTL = float(os.getenv('IDEMPOTENCY_TTL', '86400'))
+IDEMPOTENCY_MAX_KEYS = int(os.getenv('IDEMPOTENCY_MAX_KEYS', '10000'))
+IDEMPOTENCY_WAIT_TIMEOUT = float(os.getenv('IDEMPOTENCY_WAIT_TIMEOUT', '30'))
+IDEMPOTENCY_MAX_KEY_LENGTH = 255
+
+HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+
+
+class KeyInProgress(Exception):
+    """같은 키의 첫 요청이 기다리는 시간 안에 끝나지 않음"""
+
+
+class FingerprintMismatch(Exception):
+    """같은 키로 본문이 다른 요청을 보냄"""
+
+
+class StoredResponse:
+    """재요청에 다시 보낼 응답 (상태 코드/헤더/본문)"""
+
+    __slots__ = ('status_code', 'headers', 'body')
+
+    def __init__(self, status_code, headers, body):
+        self.status_code = status_code
+        self.headers = headers
+        self.body = body
+
+
+def _storable(stored):
+    # 오류 응답(4xx/5xx)은 보관하지 않으므로 같은 키로 다시 시도할 수 있음
+    return stored.status_code < 400
+
+
+class IdempotencyStore:
+    """Idempotency-Key별 응답 저장소 - 처리 중인 키는 Future, 끝난 키는 TTL 동안 응답과 본문 지문 보관
+
+    첫 요청만 실제로 처리하고, 처리 중에 들어온 같은 키의 요청은 그 응답을 기다렸다가
+    함께 받는다. 오류 응답이나 예외는 보관하지 않으며, 이때 기다리던 요청 중 하나만
+    이어받아 다시 처리하고 나머지는 그 결과를 기다린다.
+    """
+
+    def __init__(self, ttl=IDEMPOTENCY_TTL, max_keys=IDEMPOTENCY_MAX_KEYS, wait_timeout=IDEMPOTENCY_WAIT_TIMEOUT):
+        self.ttl = ttl
+        self.max_keys = max_keys
+        self.wait_timeout = wait_timeout
+        self._done = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.replayed = 0
+        self.joined = 0
+        self.conflicts = 0
+        self.mismatches = 0
+
+    def _get_done_locked(self, key):
+        entry = self._done.get(key)
+        if entry is None:
+            return None
+        expires_at, stored, fingerprint = entry
+        if expires_at <= time.monotonic():
+            del self._done[key]
+            return None
+        return stored, fingerprint
+
+    def _replay(self, stored, stored_fingerprint, fingerprint):
+        """보관된 응답을 다시 보내기 전에 본문 지문 확인"""
+        if stored_fingerprint is not None and fingerprint is not None and fingerprint() != stored_fingerprint:
+            with self._lock:
+                self.mismatches += 1
+            raise FingerprintMismatch()
+        return stored, True
+
+    def run(self, key, handler, fingerprint=None):
+        """key로 handler()를 한 번만 실행 - (StoredResponse, 재사용 여부)
+
+        handler는 StoredResponse를 돌려준다. fingerprint()는 요청 본문 지문으로, 보관된
+        응답의 지문과 다르면 FingerprintMismatch. 본문을 읽어야 하므로 응답을 보관할 때와
+        보관된 응답과 비교할 때만 호출한다. 같은 키의 요청이 wait_timeout 안에 끝나지 않으면
+        KeyInProgress.
+        """
+        wait_until = time.monotonic() + self.wait_timeout
+        while True:
+            with self._lock:
+                done = self._get_done_locked(key)
+                if done is not None:
+                    self.replayed += 1
+                    break
+                future = self._in_flight.get(key)
+                leader = future is None
+                if leader:
+                    future = Future()
+                    self._in_flight[key] = future
+                    self.executed += 1
+                else:
+                    self.joined += 1
+            if leader:
+                return self._lead(key, future, handler, fingerprint)
+
+            try:
+                stored, stored_fingerprint = future.result(timeout=max(wait_until - time.monotonic(), 0))
+            except FutureTimeout:
+                with self._lock:
+                    self.conflicts += 1
+                raise KeyInProgress(key)
+            except Exception:
+                # 처리하던 요청이 실패함 - 다시 확인해서 한 요청만 이어받아 처리
+                continue
+            if _storable(stored):
+                return self._replay(stored, stored_fingerprint, fingerprint)
+            # 보관하지 않는 오류 응답 - 같은 방식으로 한 요청만 다시 처리
+
+        return self._replay(done[0], done[1], fingerprint)
+
+    def _lead(self, key, future, handler, fingerprint):
+        try:
+            stored = handler()
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+
+        stored_fingerprint = None
+        if _storable(stored) and fingerprint is not None:
+            try:
+                stored_fingerprint = fingerprint()
+            except Exception as e:
+                # 이미 처리한 요청이므로 지문 없이 보관 (재요청은 확인 없이 재사용)
+                print(f"⚠️ 요청 본문 지문 계산 실패: {e}")
+
+        with self._lock:
+            del self._in_flight[key]
+            if _storable(stored):
+                self._done[key] = (time.monotonic() + self.ttl, stored, stored_fingerprint)
+                self._done.move_to_end(key)
+                while len(self._done) > self.max_keys:
+                    self._done.popitem(last=False)
+        future.set_result((stored, stored_fingerprint))
+        return stored, False
+
+    def stats(self):
+        with self._lock:
+            return {
+                'keys': len(self._done),
+                'max_keys': self.max_keys,
+                'ttl': self.ttl,
+                'in_flight': len(self._in_flight),
+                'executed': self.executed,
+                'replayed': self.replayed,
+                'joined_in_flight': self.joined,
+                'conflicts': self.conflicts,
+                'fingerprint_mismatches': self.mismatches,
+            }
+
+
+store = IdempotencyStore()
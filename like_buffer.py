@@ -0,0 +1,235 @@
+import os
+import time
+import atexit
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import backend_fanout
+
+# 좋아요 모아 보내기(write-behind) 설정
+# - LIKE_WRITE_BEHIND: 1이면 좋아요/취소를 모아서 보내고 바로 응답, 0이면 예전처럼 클릭마다 백엔드 호출
+# - LIKE_FLUSH_WINDOW: 클릭을 모으는 시간 (초) - 이 시간 안의 같은 곡 토글은 최종 상태 하나로 합침
+# - LIKE_FLUSH_BATCH: 한 번에 병렬로 보내는 최대 요청 수
+# - LIKE_FLUSH_RETRIES: 연결 오류/5xx일 때 다시 보내는 횟수
+# - LIKE_FLUSH_WORKERS: 좋아요를 보내는 전용 스레드 수 (페이지 요청이 쓰는 공용 풀을 차지하지 않도록 따로 둠)
+LIKE_WRITE_BEHIND = os.getenv('LIKE_WRITE_BEHIND', '1') == '1'
+LIKE_FLUSH_WINDOW = float(os.getenv('LIKE_FLUSH_WINDOW', '2'))
+LIKE_FLUSH_BATCH = int(os.getenv('LIKE_FLUSH_BATCH', '32'))
+LIKE_FLUSH_RETRIES = int(os.getenv('LIKE_FLUSH_RETRIES', '3'))
+LIKE_FLUSH_WORKERS = int(os.getenv('LIKE_FLUSH_WORKERS', '4'))
+
+# 실패한 좋아요를 되돌리라고 알려 줄 사용자 수 상한
+MAX_CORRECTION_USERS = 10000
+
+
+class _Pending:
+    """사용자 한 명의 곡 하나에 대해 아직 보내지 않은 좋아요 상태"""
+
+    __slots__ = ('original', 'desired', 'headers', 'due', 'attempts')
+
+    def __init__(self, original, desired, headers, due):
+        # original: 백엔드에 반영되어 있다고 보는 상태, desired: 마지막 클릭이 원하는 상태
+        self.original = original
+        self.desired = desired
+        self.headers = headers
+        self.due = due
+        self.attempts = 0
+
+
+class LikeBuffer:
+    """좋아요 토글을 (사용자, 곡)별로 모아 최종 상태만 백엔드에 보내는 버퍼
+
+    클릭은 바로 낙관적 상태로 응답하고, window가 지나면 백그라운드 스레드가 보낸다.
+    좋아요 -> 취소처럼 원래 상태로 돌아온 토글은 아예 보내지 않는다.
+    끝내 반영하지 못한 상태는 사용자별 정정 목록에 남겨 클라이언트가 화면을 되돌리게 한다.
+
+    writer(music_id, liked, headers)는 백엔드 응답 상태 코드를 돌려준다.
+    """
+
+    def __init__(self, writer, on_flushed=None, window=LIKE_FLUSH_WINDOW,
+                 batch_size=LIKE_FLUSH_BATCH, retries=LIKE_FLUSH_RETRIES, workers=LIKE_FLUSH_WORKERS):
+        self.writer = writer
+        self.on_flushed = on_flushed
+        self.window = window
+        self.batch_size = batch_size
+        self.retries = retries
+        self._pending = OrderedDict()
+        # 보내는 중인 (사용자, 곡) - 정정 확인 요청이 결과를 기다리도록 대기 수에 포함
+        self._sending = {}
+        self._corrections = OrderedDict()
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._thread = None
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='like-flush')
+        self.clicks = 0
+        self.coalesced = 0
+        self.noops = 0
+        self.writes = 0
+        self.retried = 0
+        self.failed = 0
+
+    def toggle(self, user, music_id, liked, headers):
+        """클릭 하나 기록 - 바로 돌려줄 낙관적 상태 반환"""
+        key = (user, music_id)
+        with self._lock:
+            self.clicks += 1
+            entry = self._pending.get(key)
+            if entry is None:
+                # 클릭은 화면 상태를 뒤집는 것이므로 백엔드는 반대 상태라고 봄
+                self._pending[key] = _Pending(not liked, liked, headers, time.monotonic() + self.window)
+            else:
+                entry.desired = liked
+                entry.headers = headers
+                self.coalesced += 1
+            # 새 클릭이 이전 정정을 대신함
+            user_corrections = self._corrections.get(user)
+            if user_corrections:
+                user_corrections.pop(music_id, None)
+            self._ensure_thread_locked()
+            self._wake.notify()
+        return {'liked': liked, 'pending': True}
+
+    def reconcile(self, user):
+        """사용자의 정정 목록(반영 실패한 곡의 실제 상태)을 꺼내고 남은 대기 수와 함께 반환"""
+        with self._lock:
+            corrections = self._corrections.pop(user, {})
+            pending = sum(1 for key in self._pending if key[0] == user)
+            pending += sum(count for key, count in self._sending.items() if key[0] == user)
+        return {
+            'corrections': [{'musicId': music_id, 'liked': liked} for music_id, liked in corrections.items()],
+            'pending': pending,
+        }
+
+    def _ensure_thread_locked(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='like-flush', daemon=True)
+            self._thread.start()
+            atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                batch = self._take_due_locked(time.monotonic())
+                while not batch:
+                    timeout = None
+                    if self._pending:
+                        timeout = max(min(entry.due for entry in self._pending.values()) - time.monotonic(), 0)
+                    self._wake.wait(timeout=timeout)
+                    batch = self._take_due_locked(time.monotonic())
+            self._send(batch)
+
+    def _take_due_locked(self, now, force=False):
+        """보낼 때가 된 항목을 batch_size까지 꺼냄 (원래 상태로 돌아온 항목은 버림)"""
+        batch = []
+        for key in list(self._pending):
+            entry = self._pending[key]
+            if not force and entry.due > now:
+                continue
+            del self._pending[key]
+            if entry.desired == entry.original:
+                self.noops += 1
+                continue
+            batch.append((key, entry))
+            self._sending[key] = self._sending.get(key, 0) + 1
+            if len(batch) >= self.batch_size:
+                break
+        return batch
+
+    def _send(self, batch, parallel=True):
+        calls = {
+            str(index): (lambda key=key, entry=entry: self.writer(key[1], entry.desired, entry.headers))
+            for index, (key, entry) in enumerate(batch)
+        }
+        if parallel:
+            results, errors = backend_fanout.run_parallel(calls, executor=self._executor)
+        else:
+            results, errors = self._send_serial(calls)
+
+        flushed = False
+        with self._lock:
+            for index, (key, entry) in enumerate(batch):
+                if self._sending[key] > 1:
+                    self._sending[key] -= 1
+                else:
+                    del self._sending[key]
+                status_code = results.get(str(index))
+                if status_code is not None and status_code < 300:
+                    self.writes += 1
+                    flushed = True
+                    continue
+
+                newer = self._pending.get(key)
+                transient = status_code is None or status_code >= 500
+                if transient and entry.attempts < self.retries:
+                    entry.attempts += 1
+                    self.retried += 1
+                    if newer is None:
+                        entry.due = time.monotonic() + self.window * entry.attempts
+                        self._pending[key] = entry
+                    else:
+                        # 새 클릭이 이미 기다리는 중이면 그 항목이 이어서 보냄 (백엔드는 아직 원래 상태)
+                        newer.original = entry.original
+                    continue
+
+                self.failed += 1
+                print(f"⚠️ 좋아요 반영 실패 (음악 {key[1]}): {errors.get(str(index)) or status_code}")
+                if newer is not None:
+                    newer.original = entry.original
+                else:
+                    self._add_correction_locked(key[0], key[1], entry.original)
+
+        if flushed and self.on_flushed is not None:
+            self.on_flushed()
+
+    @staticmethod
+    def _send_serial(calls):
+        """호출한 스레드에서 하나씩 보냄 - 종료 중에는 스레드 풀에 새 작업을 넣을 수 없음"""
+        results = {}
+        errors = {}
+        for name, fn in calls.items():
+            try:
+                results[name] = fn()
+            except Exception as e:
+                errors[name] = e
+        return results, errors
+
+    def _add_correction_locked(self, user, music_id, liked):
+        corrections = self._corrections.setdefault(user, {})
+        corrections[music_id] = liked
+        self._corrections.move_to_end(user)
+        while len(self._corrections) > MAX_CORRECTION_USERS:
+            self._corrections.popitem(last=False)
+
+    def flush(self):
+        """기다리는 항목을 지금 모두 보냄 (프로세스 종료 시 호출)
+
+        종료 시점에는 스레드 풀이 이미 닫혀 새 작업을 받지 않으므로 이 스레드에서 차례로
+        보내고, 다 보낸 뒤 전용 풀을 닫는다. 종료 중에는 실패한 항목을 다시 시도하지 않는다.
+        """
+        while True:
+            with self._lock:
+                batch = self._take_due_locked(time.monotonic(), force=True)
+                # 종료가 늦어지지 않도록 한 번씩만 보냄
+                for _, entry in batch:
+                    entry.attempts = self.retries
+            if not batch:
+                break
+            self._send(batch, parallel=False)
+        self._executor.shutdown(wait=False)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'window': self.window,
+                'pending': len(self._pending),
+                'sending': sum(self._sending.values()),
+                'clicks': self.clicks,
+                'coalesced': self.coalesced,
+                'noops': self.noops,
+                'backend_writes': self.writes,
+                'retried': self.retried,
+                'failed': self.failed,
+                'users_with_corrections': len(self._corrections),
+                'write_ratio': round(self.writes / self.clicks, 4) if self.clicks else None,
+            }
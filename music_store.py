@@ -0,0 +1,449 @@
+import os
+import json
+import queue
+import bisect
+import sqlite3
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+import pagination
+
+# 로컬 음악 데이터 저장소 (백엔드 연결 실패 시 사용)
+# - MUSIC_DB_FILE: SQLite 파일 경로
+# - MUSIC_GROUP_COMMIT_MAX: 한 트랜잭션(fsync 한 번)에 묶어 커밋할 최대 쓰기 수
+# - MUSIC_CHECKPOINT_BYTES: 쓰기가 없을 때 WAL이 이 크기를 넘으면 본 파일로 합침
+# - MUSIC_CHECKPOINT_IDLE: 쓰기가 이 시간(초) 동안 없으면 체크포인트 여부 확인
+# 예전 music_data.json이 있으면 처음 열 때 한 번만 옮겨 담고 파일 이름을 *.migrated로 바꾼다.
+MUSIC_DB_FILE = os.getenv('MUSIC_DB_FILE', 'music_data.sqlite3')
+MUSIC_GROUP_COMMIT_MAX = int(os.getenv('MUSIC_GROUP_COMMIT_MAX', '64'))
+MUSIC_CHECKPOINT_BYTES = int(os.getenv('MUSIC_CHECKPOINT_BYTES', str(4 * 1024 * 1024)))
+MUSIC_CHECKPOINT_IDLE = float(os.getenv('MUSIC_CHECKPOINT_IDLE', '1'))
+
+SAVE = 'save'
+DELETE = 'delete'
+
+
+class MusicStore:
+    """음악 기록을 SQLite에 저장하는 로컬 저장소
+
+    기록 모양은 기존 JSON과 같은 dict 그대로(data 열)이고, 조회에 쓰는 id/user_id/created_at만
+    따로 열로 빼서 인덱스를 건다. 쓰기는 모두 트랜잭션으로 처리하므로 여러 요청이 동시에
+    저장해도 서로의 변경을 덮어쓰지 않는다.
+
+    WAL 모드로 열어서 커밋은 -wal 파일 끝에 붙는 추가 쓰기가 되고, 비정상 종료 뒤에는
+    다음에 열 때 SQLite가 WAL을 다시 적용한다. 쓰기는 전용 스레드가 모아서 처리하는데,
+    앞 배치를 커밋(fsync)하는 동안 들어온 쓰기를 다음 트랜잭션 하나로 묶는다(group commit).
+    WAL은 쓰기가 없을 때 같은 스레드가 본 파일로 합친다.
+
+    쓰기마다 meta.version이 1씩 올라가므로, 다른 프로세스의 변경 여부를 버전으로 알 수 있다.
+    """
+
+    def __init__(self, path=MUSIC_DB_FILE, json_path=None,
+                 max_batch=MUSIC_GROUP_COMMIT_MAX, checkpoint_bytes=MUSIC_CHECKPOINT_BYTES):
+        self.path = path
+        self.max_batch = max_batch
+        self.checkpoint_bytes = checkpoint_bytes
+        self._queue = None
+        self._writer_pid = None
+        self._start_lock = threading.Lock()
+        self._listeners = []
+        self.writes = 0
+        self.batches = 0
+        self.checkpoints = 0
+
+        with self._db() as db:
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('''
+                CREATE TABLE IF NOT EXISTS music (
+                    id TEXT PRIMARY KEY,
+                    user_id TEXT,
+                    created_at TEXT,
+                    data TEXT NOT NULL
+                )
+            ''')
+            # (created_at, id)까지 포함해서 사용자별 keyset 페이지 순서와 같게 유지
+            db.execute('DROP INDEX IF EXISTS idx_music_user_created')
+            db.execute('CREATE INDEX IF NOT EXISTS idx_music_user_created_id ON music (user_id, created_at, id)')
+            db.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)')
+            db.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('version', 0)")
+
+        if json_path and os.path.exists(json_path):
+            self._migrate_json(json_path)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    @contextmanager
+    def _db(self):
+        db = self._connect()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @contextmanager
+    def _transaction(self):
+        """쓰기 잠금을 잡은 트랜잭션 (예외 시 롤백)"""
+        with self._db() as db:
+            db.execute('BEGIN IMMEDIATE')
+            try:
+                yield db
+            except Exception:
+                db.execute('ROLLBACK')
+                raise
+            db.execute('COMMIT')
+
+    @staticmethod
+    def _row(music):
+        return (str(music['id']), music.get('user_id'), music.get('created_at'),
+                json.dumps(music, ensure_ascii=False))
+
+    @staticmethod
+    def _bump_version(db):
+        db.execute("UPDATE meta SET value = value + 1 WHERE key = 'version'")
+
+    def _migrate_json(self, json_path):
+        """기존 music_data.json 기록을 한 트랜잭션으로 옮겨 담음"""
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                music_list = json.load(f)
+        except FileNotFoundError:
+            # 다른 프로세스가 먼저 옮김
+            return
+
+        with self._transaction() as db:
+            # 이미 있는 기록은 유지 (여러 프로세스가 동시에 시작해도 한 번만 반영)
+            db.executemany(
+                'INSERT OR IGNORE INTO music (id, user_id, created_at, data) VALUES (?, ?, ?, ?)',
+                [self._row(music) for music in music_list if 'id' in music]
+            )
+            self._bump_version(db)
+        try:
+            os.replace(json_path, f'{json_path}.migrated')
+        except FileNotFoundError:
+            pass
+        print(f"📦 로컬 음악 데이터 {len(music_list)}건을 {self.path}로 옮김")
+
+    def get(self, music_id):
+        with self._db() as db:
+            row = db.execute('SELECT data FROM music WHERE id = ?', (str(music_id),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def list(self, user_id=None):
+        """생성일 내림차순 음악 목록 (created_at 없는 기록 제외, user_id가 있으면 해당 사용자만)"""
+        with self._db() as db:
+            if user_id is None:
+                rows = db.execute(
+                    'SELECT data FROM music WHERE created_at IS NOT NULL ORDER BY created_at DESC, id DESC'
+                ).fetchall()
+            else:
+                rows = db.execute(
+                    'SELECT data FROM music WHERE user_id = ? AND created_at IS NOT NULL '
+                    'ORDER BY created_at DESC, id DESC',
+                    (user_id,)
+                ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def save(self, music):
+        """기록 추가 (같은 id가 있으면 교체) - 커밋될 때까지 대기"""
+        self._submit(SAVE, self._row(music))
+
+    def delete(self, music_id):
+        """기록 삭제 후 삭제된 기록 반환 (없으면 None) - 커밋될 때까지 대기"""
+        return self._submit(DELETE, str(music_id))
+
+    def add_listener(self, fn):
+        """커밋된 쓰기 알림 등록 - fn(kind, row 또는 music_id, 이전 버전, 새 버전)
+
+        쓰기 스레드에서 커밋 순서대로 호출되고, 호출이 끝난 뒤에 save/delete가 반환된다.
+        """
+        self._listeners.append(fn)
+
+    def _submit(self, kind, arg):
+        """쓰기 스레드에 넘기고 커밋된 뒤 결과 반환"""
+        future = Future()
+        self._start_writer().put((kind, arg, future))
+        return future.result()
+
+    def _start_writer(self):
+        """쓰기 스레드를 프로세스마다 한 번만 시작 (fork된 워커에서는 새로 시작)"""
+        pid = os.getpid()
+        if self._writer_pid == pid:
+            return self._queue
+        with self._start_lock:
+            if self._writer_pid != pid:
+                self._queue = queue.Queue()
+                threading.Thread(target=self._run_writer, args=(self._queue,),
+                                 name='music-store-writer', daemon=True).start()
+                self._writer_pid = pid
+        return self._queue
+
+    def _run_writer(self, pending):
+        db = self._connect()
+        # 커밋마다 WAL을 fsync (호출자는 커밋 후에 돌아가므로 반환된 쓰기는 유실되지 않음)
+        db.execute('PRAGMA synchronous=FULL')
+        # 커밋 도중 체크포인트로 지연되지 않도록 자동 체크포인트는 끄고 쉬는 동안 직접 처리
+        db.execute('PRAGMA wal_autocheckpoint=0')
+        while True:
+            try:
+                batch = [pending.get(timeout=MUSIC_CHECKPOINT_IDLE)]
+            except queue.Empty:
+                self._checkpoint_if_needed(db)
+                continue
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(pending.get_nowait())
+                except queue.Empty:
+                    break
+            self._commit_batch(db, batch)
+
+    @staticmethod
+    def _apply(db, kind, arg):
+        if kind == SAVE:
+            db.execute('INSERT OR REPLACE INTO music (id, user_id, created_at, data) VALUES (?, ?, ?, ?)', arg)
+            return None
+
+        found = db.execute('SELECT data FROM music WHERE id = ?', (arg,)).fetchone()
+        if found is None:
+            return None
+        db.execute('DELETE FROM music WHERE id = ?', (arg,))
+        return json.loads(found[0])
+
+    def _commit_batch(self, db, batch):
+        """batch를 트랜잭션 하나로 커밋 - 실패하면 하나씩 다시 시도해서 실패한 쓰기만 오류 처리"""
+        try:
+            db.execute('BEGIN IMMEDIATE')
+            before = db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+            results = []
+            for kind, arg, _ in batch:
+                results.append(self._apply(db, kind, arg))
+                self._bump_version(db)
+            db.execute('COMMIT')
+        except Exception as e:
+            if db.in_transaction:
+                db.execute('ROLLBACK')
+            if len(batch) == 1:
+                batch[0][2].set_exception(e)
+                return
+            for item in batch:
+                self._commit_batch(db, [item])
+            return
+
+        self.writes += len(batch)
+        self.batches += 1
+        for version, ((kind, arg, future), result) in enumerate(zip(batch, results), start=before + 1):
+            for listener in self._listeners:
+                try:
+                    listener(kind, arg, version - 1, version)
+                except Exception as e:
+                    print(f"⚠️ 로컬 음악 쓰기 알림 처리 오류: {e}")
+            future.set_result(result)
+
+    def _checkpoint_if_needed(self, db):
+        """WAL이 checkpoint_bytes를 넘으면 본 파일로 합치고 WAL을 비움"""
+        try:
+            if os.path.getsize(f'{self.path}-wal') <= self.checkpoint_bytes:
+                return
+            db.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+            self.checkpoints += 1
+        except FileNotFoundError:
+            pass
+        except sqlite3.Error as e:
+            print(f"⚠️ 로컬 음악 DB 체크포인트 실패: {e}")
+
+    def count(self):
+        with self._db() as db:
+            return db.execute('SELECT COUNT(*) FROM music').fetchone()[0]
+
+    def version(self):
+        with self._db() as db:
+            return db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+
+    def snapshot(self):
+        """(버전, 전체 기록 [(id, user_id, created_at, JSON 문자열)]) - 같은 시점 기준, 인덱스 적재용"""
+        with self._db() as db:
+            db.execute('BEGIN')
+            try:
+                version = db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+                rows = db.execute('SELECT id, user_id, created_at, data FROM music').fetchall()
+            finally:
+                db.execute('COMMIT')
+        return version, rows
+
+    def file_signature(self):
+        """DB 파일(및 WAL 파일)의 (mtime, 크기) - 다른 프로세스의 변경 감지용"""
+        signature = []
+        for path in (self.path, f'{self.path}-wal'):
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def stats(self):
+        return {
+            'writes': self.writes,
+            'commits': self.batches,
+            'writes_per_commit': round(self.writes / self.batches, 2) if self.batches else None,
+            'checkpoints': self.checkpoints,
+            'pending_writes': self._queue.qsize() if self._queue is not None else 0,
+        }
+
+
+class _Entry:
+    """메모리 인덱스의 기록 하나 - 원본은 JSON 문자열로 두고 꺼낼 때만 dict로 변환"""
+
+    __slots__ = ('id', 'user_id', 'created_at', 'data')
+
+    def __init__(self, music_id, user_id, created_at, data):
+        self.id = music_id
+        self.user_id = user_id
+        self.created_at = created_at
+        self.data = data
+
+
+def _sort_key(entry):
+    # 같은 시각에 만든 기록도 순서가 정해지도록 id까지 비교 (keyset 페이지 기준)
+    return (entry.created_at, entry.id)
+
+
+class MusicIndex:
+    """MusicStore 앞에 두는 프로세스 공용 메모리 인덱스
+
+    id → 기록 dict와 사용자별 created_at 정렬 목록을 들고 있어서 조회 시 DB를 읽지 않는다.
+    DB 파일의 mtime/크기가 바뀌면 저장소 버전을 확인해서, 다른 프로세스가 쓴 경우에만
+    전체를 다시 읽는다 (체크포인트처럼 내용이 그대로인 변경은 무시).
+    이 프로세스에서 쓴 변경은 쓰기 스레드의 커밋 알림으로 인덱스에 바로 반영한다.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._lock = threading.Lock()
+        self._by_id = {}
+        self._all = []
+        self._by_user = {}
+        self._signature = None
+        # 인덱스 내용이 반영하는 저장소 버전 (None이면 다음 조회 때 다시 읽음)
+        self._version = None
+        self.reloads = 0
+        store.add_listener(self._on_commit)
+
+    def _reload_locked(self):
+        # 서명을 먼저 잡아 둬야 읽는 도중의 변경을 다음 조회에서 놓치지 않음
+        signature = self.store.file_signature()
+        version, rows = self.store.snapshot()
+        self._by_id = {}
+        self._all = []
+        self._by_user = {}
+        for music_id, user_id, created_at, data in rows:
+            self._by_id[music_id] = _Entry(music_id, user_id, created_at, data)
+        for entry in self._by_id.values():
+            if entry.created_at is not None:
+                self._all.append(entry)
+                self._by_user.setdefault(entry.user_id, []).append(entry)
+        self._all.sort(key=_sort_key)
+        for entries in self._by_user.values():
+            entries.sort(key=_sort_key)
+        self._signature = signature
+        self._version = version
+        self.reloads += 1
+
+    def _ensure_fresh_locked(self):
+        if self._version is not None:
+            signature = self.store.file_signature()
+            if signature == self._signature:
+                return
+            if self.store.version() == self._version:
+                self._signature = signature
+                return
+        self._reload_locked()
+
+    def _insert_locked(self, entry):
+        self._by_id[entry.id] = entry
+        if entry.created_at is not None:
+            bisect.insort(self._all, entry, key=_sort_key)
+            bisect.insort(self._by_user.setdefault(entry.user_id, []), entry, key=_sort_key)
+
+    def _remove_locked(self, music_id):
+        entry = self._by_id.pop(music_id, None)
+        if entry is None or entry.created_at is None:
+            return
+        for entries in (self._all, self._by_user.get(entry.user_id, [])):
+            i = bisect.bisect_left(entries, _sort_key(entry), key=_sort_key)
+            if i < len(entries) and entries[i] is entry:
+                del entries[i]
+
+    def _on_commit(self, kind, arg, before, after):
+        """쓰기 스레드의 커밋 알림 - 바로 앞 버전을 반영하고 있을 때만 증분 적용"""
+        with self._lock:
+            if self._version is None or after <= self._version:
+                # 아직 적재 전이거나 이미 다시 읽은 스냅샷에 포함된 변경
+                return
+            if before != self._version:
+                # 그 사이 다른 프로세스의 쓰기가 있었음
+                self._version = None
+                return
+
+            if kind == SAVE:
+                music_id, user_id, created_at, data = arg
+                self._remove_locked(music_id)
+                self._insert_locked(_Entry(music_id, user_id, created_at, data))
+            else:
+                self._remove_locked(arg)
+            self._version = after
+
+    def get(self, music_id):
+        with self._lock:
+            self._ensure_fresh_locked()
+            entry = self._by_id.get(str(music_id))
+        return json.loads(entry.data) if entry else None
+
+    def list(self, user_id=None):
+        """생성일 내림차순 음악 목록 (created_at 없는 기록 제외, user_id가 있으면 해당 사용자만)"""
+        with self._lock:
+            self._ensure_fresh_locked()
+            entries = self._all if user_id is None else self._by_user.get(user_id, [])
+            data = [entry.data for entry in reversed(entries)]
+        return [json.loads(item) for item in data]
+
+    def page(self, user_id=None, after=None, limit=pagination.PLAYLIST_PAGE_SIZE):
+        """list()를 (created_at, id) 커서 기준으로 자른 한 페이지 - (기록 목록, 다음 커서 또는 None)"""
+        with self._lock:
+            self._ensure_fresh_locked()
+            entries = self._all if user_id is None else self._by_user.get(user_id, [])
+            after_key = tuple(after) if after is not None else None
+            page, has_more = pagination.page_desc(entries, after_key, limit, _sort_key)
+            data = [entry.data for entry in page]
+            last = page[-1] if has_more else None
+        next_cursor = pagination.encode_cursor(last.created_at, last.id) if last else None
+        return [json.loads(item) for item in data], next_cursor
+
+    def save(self, music):
+        self.store.save(music)
+
+    def delete(self, music_id):
+        return self.store.delete(music_id)
+
+    def count(self):
+        with self._lock:
+            self._ensure_fresh_locked()
+            return len(self._by_id)
+
+    def version(self):
+        """현재 인덱스가 반영하는 저장소 버전 (응답 ETag 계산용)"""
+        with self._lock:
+            self._ensure_fresh_locked()
+            return self._version
+
+    def stats(self):
+        with self._lock:
+            data = {
+                'records': len(self._by_id),
+                'users': len(self._by_user),
+                'reloads': self.reloads,
+                'version': self._version,
+            }
+        data.update(self.store.stats())
+        return data
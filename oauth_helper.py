@@ -1,5 +1,6 @@
 import json
 import requests
+import backend_client
 import datetime
 from flask import redirect, request, url_for, session
 from oauthlib.oauth2 import WebApplicationClient
@@ -73,7 +74,7 @@ def send_user_to_backend(google_user_info):
         print(f"백엔드 요청 URL: {backend_url}")
         
         # POST 요청으로 사용자 정보 직접 전송
-        response = requests.post(
+        response = backend_client.post(
             backend_url,
             json={'user_info': user_data},
             headers={'Content-Type': 'application/json'},
@@ -0,0 +1,137 @@
+import os
+import json
+import base64
+import bisect
+import threading
+from collections import OrderedDict
+
+# 플레이리스트 페이지 설정
+# - PLAYLIST_PAGE_SIZE: limit을 주지 않았을 때 한 번에 보내는 음악 수
+# - PLAYLIST_MAX_PAGE_SIZE: limit 상한
+PLAYLIST_PAGE_SIZE = int(os.getenv('PLAYLIST_PAGE_SIZE', '50'))
+PLAYLIST_MAX_PAGE_SIZE = int(os.getenv('PLAYLIST_MAX_PAGE_SIZE', '200'))
+
+# 백엔드 응답별로 만들어 둔 정렬 인덱스 수
+INDEX_MEMO_SIZE = 32
+
+
+class PageError(ValueError):
+    """잘못된 limit/after 파라미터"""
+
+
+def _normalize(created_at, music_id):
+    """커서 값을 (문자열, 문자열)로 통일 - 백엔드(int id)와 로컬(str id) 커서를 섞어 써도 비교 가능"""
+    return ('' if created_at is None else str(created_at)), str(music_id)
+
+
+def encode_cursor(created_at, music_id):
+    """(created_at, id)를 URL에 넣을 수 있는 불투명한 문자열로 변환"""
+    raw = json.dumps(list(_normalize(created_at, music_id)), ensure_ascii=False, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """encode_cursor의 역변환 - 없으면 None, 형식이 틀리면 PageError"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_at, music_id = json.loads(raw)
+    except (ValueError, TypeError):
+        raise PageError('잘못된 페이지 커서입니다.')
+    if not all(value is None or isinstance(value, (str, int, float)) for value in (created_at, music_id)):
+        raise PageError('잘못된 페이지 커서입니다.')
+    return _normalize(created_at, music_id)
+
+
+def parse_limit(value, default=PLAYLIST_PAGE_SIZE):
+    """limit 파라미터를 1 ~ PLAYLIST_MAX_PAGE_SIZE 범위로 변환"""
+    if value in (None, ''):
+        return default
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise PageError('limit은 숫자여야 합니다.')
+    return max(1, min(limit, PLAYLIST_MAX_PAGE_SIZE))
+
+
+def page_desc(entries, after_key, limit, key):
+    """key 오름차순으로 정렬된 entries에서 after_key보다 작은 항목을 내림차순으로 limit개
+
+    이분 탐색으로 시작 위치를 찾으므로 뒤쪽 페이지도 첫 페이지와 비용이 같다.
+    반환값: (items, 더 남았는지)
+    """
+    try:
+        end = len(entries) if after_key is None else bisect.bisect_left(entries, after_key, key=key)
+    except TypeError:
+        # 다른 목록에서 만든 커서라 정렬 키와 비교할 수 없음
+        raise PageError('잘못된 페이지 커서입니다.')
+    start = max(end - limit, 0)
+    return entries[start:end][::-1], start > 0
+
+
+class KeysetIndex:
+    """정렬 키 순서로 한 번 정렬해 둔 목록 - keyset 페이지 조회용
+
+    fields(item)은 커서에 넣을 (created_at, id) 원본 값을, sort_key(created_at, id)는
+    비교 가능한 정렬 키를 돌려준다.
+    """
+
+    def __init__(self, items, fields, sort_key):
+        self.fields = fields
+        self.sort_key = sort_key
+        keyed = sorted(((sort_key(*fields(item)), item) for item in items), key=lambda pair: pair[0])
+        self._keys = [pair[0] for pair in keyed]
+        self._items = [pair[1] for pair in keyed]
+        self.by_id = {str(fields(item)[1]): item for item in items}
+
+    def __len__(self):
+        return len(self._items)
+
+    def page(self, after=None, limit=PLAYLIST_PAGE_SIZE):
+        """after 커서 다음부터 limit개 - (items, 다음 커서 또는 None)"""
+        end = len(self._keys)
+        if after is not None:
+            try:
+                end = bisect.bisect_left(self._keys, self.sort_key(*after))
+            except TypeError:
+                raise PageError('잘못된 페이지 커서입니다.')
+        start = max(end - limit, 0)
+        items = self._items[start:end][::-1]
+        return items, cursor_after(items, self.fields) if start > 0 else None
+
+
+def cursor_after(items, fields):
+    """페이지 마지막 항목 다음을 가리키는 커서"""
+    if not items:
+        return None
+    return encode_cursor(*fields(items[-1]))
+
+
+class IndexMemo:
+    """같은 목록 객체(캐시된 백엔드 응답)로 만든 KeysetIndex 등 파생 값을 재사용
+
+    응답 캐시의 값은 공유되고 수정되지 않으므로 객체가 같으면 파생 값도 같다.
+    목록 객체를 함께 들고 있어서 id()가 다른 객체에 재사용될 일은 없다.
+    """
+
+    def __init__(self, size=INDEX_MEMO_SIZE):
+        self.size = size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, items, build):
+        key = id(items)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is items:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        index = build(items)
+        with self._lock:
+            self._entries[key] = (items, index)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        return index
@@ -0,0 +1,181 @@
+import os
+import math
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+
+# 요청 속도 제한 설정
+# - RATE_LIMITS: 규칙별 초당 토큰 수와 버스트 재정의 ("like=5:10,delete=1:5")
+# - RATE_LIMIT_DB: 여러 워커 프로세스가 같은 한도를 쓰도록 버킷을 저장할 SQLite 파일 (비우면 프로세스 메모리)
+# - RATE_LIMIT_MAX_KEYS: 메모리 저장소가 보관할 최대 버킷 수 (초과 시 오래 안 쓴 것부터 제거)
+RATE_LIMIT_DB = os.getenv('RATE_LIMIT_DB', '')
+RATE_LIMIT_MAX_KEYS = int(os.getenv('RATE_LIMIT_MAX_KEYS', '100000'))
+
+# SQLite 저장소에서 가득 찬(= 없는 것과 같은) 버킷을 지우는 주기 (초)
+PURGE_INTERVAL = 60
+
+DEFAULT_RULES = {
+    'like': (5, 10),
+    'unlike': (5, 10),
+    'delete': (1, 5),
+}
+
+
+def _parse_rules(value):
+    """'name=rate:burst,...' 형식의 환경변수를 {name: (rate, burst)}로 변환"""
+    rules = dict(DEFAULT_RULES)
+    for item in value.split(','):
+        if '=' not in item:
+            continue
+        name, spec = item.split('=', 1)
+        try:
+            rate, burst = (float(part) for part in spec.split(':', 1))
+        except ValueError:
+            print(f"⚠️ 잘못된 속도 제한 설정 무시: {item}")
+            continue
+        if rate <= 0 or burst < 1:
+            print(f"⚠️ 잘못된 속도 제한 설정 무시: {item}")
+            continue
+        rules[name.strip()] = (rate, burst)
+    return rules
+
+
+def _refill(tokens, updated, now, rate, burst):
+    return min(burst, tokens + (now - updated) * rate)
+
+
+def _decide(tokens, rate):
+    """(허용 여부, 남은 토큰, Retry-After 초)"""
+    if tokens >= 1:
+        return True, tokens - 1, 0
+    return False, tokens, max(1, math.ceil((1 - tokens) / rate))
+
+
+class MemoryBuckets:
+    """프로세스 메모리 토큰 버킷 - 키마다 [토큰 수, 갱신 시각, 가득 차는 시각]만 보관
+
+    가득 찬 버킷은 없는 것과 같으므로 오래 안 쓴 순서(앞쪽)부터 가득 찬 버킷을 지운다.
+    """
+
+    def __init__(self, max_keys=RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def take(self, key, rate, burst):
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            tokens = burst if bucket is None else _refill(bucket[0], bucket[1], now, rate, burst)
+            allowed, tokens, retry_after = _decide(tokens, rate)
+            self._buckets[key] = [tokens, now, now + (burst - tokens) / rate]
+            self._buckets.move_to_end(key)
+            self._evict_locked(now)
+        return allowed, retry_after
+
+    def _evict_locked(self, now):
+        while self._buckets:
+            key, bucket = next(iter(self._buckets.items()))
+            if bucket[2] > now and len(self._buckets) <= self.max_keys:
+                break
+            del self._buckets[key]
+            self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {'store': 'memory', 'buckets': len(self._buckets), 'max_keys': self.max_keys,
+                    'evictions': self.evictions}
+
+
+class SQLiteBuckets:
+    """여러 프로세스가 공유하는 SQLite 토큰 버킷 - 키 하나를 BEGIN IMMEDIATE로 읽고 갱신"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._purged_at = 0
+        self.purged = 0
+        db = self._connect()
+        db.execute('''
+            CREATE TABLE IF NOT EXISTS rate_buckets (
+                key TEXT PRIMARY KEY,
+                tokens REAL NOT NULL,
+                updated REAL NOT NULL,
+                full_at REAL NOT NULL
+            )
+        ''')
+        db.execute('CREATE INDEX IF NOT EXISTS idx_rate_buckets_full ON rate_buckets (full_at)')
+
+    def _connect(self):
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            db.execute('PRAGMA journal_mode=WAL')
+            self._local.db = db
+        return db
+
+    def take(self, key, rate, burst):
+        # 프로세스마다 시계가 달라지지 않도록 벽시계 사용
+        now = time.time()
+        db = self._connect()
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            row = db.execute('SELECT tokens, updated FROM rate_buckets WHERE key = ?', (key,)).fetchone()
+            tokens = burst if row is None else _refill(row[0], row[1], now, rate, burst)
+            allowed, tokens, retry_after = _decide(tokens, rate)
+            db.execute(
+                'INSERT OR REPLACE INTO rate_buckets (key, tokens, updated, full_at) VALUES (?, ?, ?, ?)',
+                (key, tokens, now, now + (burst - tokens) / rate)
+            )
+            if now - self._purged_at >= PURGE_INTERVAL:
+                self._purged_at = now
+                self.purged += db.execute('DELETE FROM rate_buckets WHERE full_at <= ?', (now,)).rowcount
+            db.execute('COMMIT')
+        except BaseException:
+            db.execute('ROLLBACK')
+            raise
+        return allowed, retry_after
+
+    def stats(self):
+        count = self._connect().execute('SELECT COUNT(*) FROM rate_buckets').fetchone()[0]
+        return {'store': 'sqlite', 'path': self.path, 'buckets': count, 'purged': self.purged}
+
+
+class RateLimiter:
+    """(규칙, 사용자)별 토큰 버킷 속도 제한"""
+
+    def __init__(self, rules, buckets):
+        self.rules = rules
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self.allowed = {}
+        self.limited = {}
+
+    def check(self, rule, identity):
+        """요청 하나 허용 여부 - (허용 여부, Retry-After 초). 규칙이 없으면 항상 허용"""
+        if rule not in self.rules:
+            return True, 0
+        rate, burst = self.rules[rule]
+        allowed, retry_after = self.buckets.take(f"{rule}:{identity}", rate, burst)
+        with self._lock:
+            counter = self.allowed if allowed else self.limited
+            counter[rule] = counter.get(rule, 0) + 1
+        return allowed, retry_after
+
+    def stats(self):
+        with self._lock:
+            data = {
+                'rules': {name: {'rate': rate, 'burst': burst} for name, (rate, burst) in self.rules.items()},
+                'allowed': dict(self.allowed),
+                'limited': dict(self.limited),
+            }
+        data.update(self.buckets.stats())
+        return data
+
+
+limiter = RateLimiter(
+    _parse_rules(os.getenv('RATE_LIMITS', '')),
+    SQLiteBuckets(RATE_LIMIT_DB) if RATE_LIMIT_DB else MemoryBuckets()
+)
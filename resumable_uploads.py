@@ -0,0 +1,223 @@
+import os
+import json
+import time
+import uuid
+import shutil
+import hashlib
+
+# 이어받기 업로드 설정
+# - RESUMABLE_CHUNK_SIZE: 청크 하나의 크기 (바이트, 마지막 청크만 작을 수 있음)
+# - RESUMABLE_UPLOAD_TTL: 마지막 청크 이후 이 시간(초) 동안 진행이 없으면 세션 삭제
+RESUMABLE_CHUNK_SIZE = int(os.getenv('RESUMABLE_CHUNK_SIZE', str(4 * 1024 * 1024)))
+RESUMABLE_UPLOAD_TTL = float(os.getenv('RESUMABLE_UPLOAD_TTL', '3600'))
+
+# 세션별 디렉터리에 meta.json과 청크 파일을 따로 저장한다.
+# 상태를 모두 디스크에 두므로 여러 워커 프로세스에서 청크를 받아도 문제가 없다.
+SESSIONS_DIR_NAME = '.resumable'
+
+
+class UploadError(Exception):
+    """클라이언트 요청 오류 - status_code로 응답 코드 전달"""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+def _sessions_dir(upload_folder):
+    return os.path.join(upload_folder, SESSIONS_DIR_NAME)
+
+
+def _session_dir(upload_folder, upload_id):
+    # upload_id는 uuid4 hex만 허용 (경로 조작 방지)
+    if len(upload_id) != 32 or not all(c in '0123456789abcdef' for c in upload_id):
+        raise UploadError('업로드 세션을 찾을 수 없습니다.', 404)
+    return os.path.join(_sessions_dir(upload_folder), upload_id)
+
+
+def _session_gone():
+    # 완료 요청이 세션 디렉터리를 옮기거나 지운 뒤에 도착한 청크/상태 요청
+    return UploadError('이미 완료된 업로드 세션입니다.', 409)
+
+
+def _chunk_path(session_dir, index):
+    return os.path.join(session_dir, f'{index:06d}.chunk')
+
+
+def create_session(upload_folder, kind, filename, size, content_type, owner, max_size):
+    """업로드 세션 생성 후 메타데이터 반환"""
+    if size <= 0:
+        raise UploadError('파일 크기가 올바르지 않습니다.')
+    if size > max_size:
+        raise UploadError(f'파일이 너무 큽니다. 최대 {max_size // (1024 * 1024)}MB까지 업로드할 수 있습니다.', 413)
+
+    collect_garbage(upload_folder)
+
+    upload_id = uuid.uuid4().hex
+    session_dir = _session_dir(upload_folder, upload_id)
+    os.makedirs(session_dir)
+
+    meta = {
+        'upload_id': upload_id,
+        'kind': kind,
+        'filename': filename,
+        'content_type': content_type,
+        'size': size,
+        'chunk_size': RESUMABLE_CHUNK_SIZE,
+        'total_chunks': (size + RESUMABLE_CHUNK_SIZE - 1) // RESUMABLE_CHUNK_SIZE,
+        'owner': owner,
+        'created_at': time.time()
+    }
+    with open(os.path.join(session_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+    print(f"📦 업로드 세션 생성: {upload_id} ({filename}, {size}바이트, {meta['total_chunks']}개 청크)")
+    return meta
+
+
+def load_session(upload_folder, upload_id, owner):
+    """세션 메타데이터 로드 (다른 사용자의 세션이면 없는 것으로 처리)"""
+    session_dir = _session_dir(upload_folder, upload_id)
+    try:
+        with open(os.path.join(session_dir, 'meta.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except FileNotFoundError:
+        raise UploadError('업로드 세션을 찾을 수 없습니다.', 404)
+
+    if meta['owner'] != owner:
+        raise UploadError('업로드 세션을 찾을 수 없습니다.', 404)
+    return meta
+
+
+def _expected_chunk_length(meta, index):
+    if index == meta['total_chunks'] - 1:
+        return meta['size'] - index * meta['chunk_size']
+    return meta['chunk_size']
+
+
+def write_chunk(upload_folder, meta, index, offset, checksum, stream):
+    """청크 하나 저장 - 오프셋/길이/sha256 확인 후 원자적으로 기록"""
+    if not 0 <= index < meta['total_chunks']:
+        raise UploadError('청크 번호가 범위를 벗어났습니다.')
+    if offset is not None and offset != index * meta['chunk_size']:
+        raise UploadError('청크 오프셋이 올바르지 않습니다.')
+
+    expected_length = _expected_chunk_length(meta, index)
+    session_dir = _session_dir(upload_folder, meta['upload_id'])
+    temp_path = os.path.join(session_dir, f'{index:06d}.{uuid.uuid4().hex}.tmp')
+
+    digest = hashlib.sha256()
+    length = 0
+    try:
+        with open(temp_path, 'wb') as f:
+            while True:
+                data = stream.read(64 * 1024)
+                if not data:
+                    break
+                length += len(data)
+                if length > expected_length:
+                    raise UploadError('청크 크기가 올바르지 않습니다.')
+                digest.update(data)
+                f.write(data)
+
+        if length != expected_length:
+            raise UploadError('청크 크기가 올바르지 않습니다.')
+        if checksum and checksum.lower() != digest.hexdigest():
+            raise UploadError('청크 체크섬이 일치하지 않습니다.', 422)
+
+        os.replace(temp_path, _chunk_path(session_dir, index))
+        # 마지막 활동 시각 갱신 (GC 기준)
+        os.utime(session_dir)
+    except FileNotFoundError:
+        raise _session_gone()
+    finally:
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+    return length
+
+
+def received_chunks(upload_folder, meta):
+    """도착한 청크 번호 목록"""
+    session_dir = _session_dir(upload_folder, meta['upload_id'])
+    try:
+        names = os.listdir(session_dir)
+    except FileNotFoundError:
+        raise _session_gone()
+    return sorted(int(name.split('.')[0]) for name in names if name.endswith('.chunk'))
+
+
+def session_status(upload_folder, meta):
+    received = received_chunks(upload_folder, meta)
+    received_set = set(received)
+    missing = [i for i in range(meta['total_chunks']) if i not in received_set]
+    return {
+        'upload_id': meta['upload_id'],
+        'size': meta['size'],
+        'chunk_size': meta['chunk_size'],
+        'total_chunks': meta['total_chunks'],
+        'received': received,
+        'missing': missing,
+        'complete': not missing
+    }
+
+
+def assemble(upload_folder, meta, dest_path):
+    """청크를 순서대로 이어 붙여 dest_path에 저장하고 세션 삭제
+
+    디스크 오류 등으로 조립에 실패하면 청크를 세션에 되돌려 두어 완료 요청을 다시 보낼 수 있게 한다.
+    """
+    status = session_status(upload_folder, meta)
+    if not status['complete']:
+        raise UploadError(f"아직 받지 못한 청크가 있습니다: {status['missing'][:10]}", 409)
+
+    # 세션 디렉터리 이름을 바꿔 선점 - 완료 요청이 동시에 와도 한 번만 조립
+    session_dir = _session_dir(upload_folder, meta['upload_id'])
+    claimed_dir = f'{session_dir}.assembling'
+    try:
+        os.rename(session_dir, claimed_dir)
+    except FileNotFoundError:
+        raise UploadError('이미 완료 처리 중인 업로드입니다.', 409)
+
+    temp_path = f'{dest_path}.{meta["upload_id"]}.tmp'
+    try:
+        with open(temp_path, 'wb') as out:
+            for index in range(meta['total_chunks']):
+                with open(_chunk_path(claimed_dir, index), 'rb') as chunk:
+                    shutil.copyfileobj(chunk, out)
+        os.replace(temp_path, dest_path)
+    except OSError:
+        os.rename(claimed_dir, session_dir)
+        raise
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    shutil.rmtree(claimed_dir, ignore_errors=True)
+
+    print(f"📦 업로드 완료: {meta['upload_id']} → {dest_path}")
+    return dest_path
+
+
+def collect_garbage(upload_folder, ttl=RESUMABLE_UPLOAD_TTL):
+    """ttl 동안 진행이 없는 세션 삭제"""
+    sessions_dir = _sessions_dir(upload_folder)
+    if not os.path.isdir(sessions_dir):
+        return 0
+
+    cutoff = time.time() - ttl
+    removed = 0
+    for name in os.listdir(sessions_dir):
+        path = os.path.join(sessions_dir, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+                removed += 1
+        except FileNotFoundError:
+            continue
+
+    if removed:
+        print(f"🧹 버려진 업로드 세션 {removed}개 삭제")
+    return removed
@@ -0,0 +1,109 @@
+import os
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+import backend_cache
+import deadlines
+
+# 동일 요청 합치기 설정
+# - BACKEND_SINGLE_FLIGHT_SCOPES: 엔드포인트별 범위 재정의 ("/playlist=global,/myplaylist=user")
+#   global - 익명 호출은 사용자 구분 없이 합침 (인증 헤더가 있으면 user와 같이 사용자별로 합침)
+#   user - 인증 사용자별로만 합침, 목록에 없는 엔드포인트는 user 범위
+#   공개 목록도 인증 호출이면 사용자별 좋아요 상태(pressed)가 담기므로 다른 사용자와 합치지 않는다
+GLOBAL_SCOPE = 'global'
+USER_SCOPE = 'user'
+
+DEFAULT_SCOPES = {
+    '/playlist': GLOBAL_SCOPE,
+    '/popular-playlist': GLOBAL_SCOPE,
+    '/myplaylist': USER_SCOPE,
+}
+
+
+def _parse_scopes(value):
+    """'path=global,path=user' 형식의 환경변수를 dict로 변환"""
+    scopes = dict(DEFAULT_SCOPES)
+    for item in value.split(','):
+        if '=' not in item:
+            continue
+        path, scope = (part.strip() for part in item.split('=', 1))
+        if scope not in (GLOBAL_SCOPE, USER_SCOPE):
+            print(f"⚠️ 잘못된 요청 합치기 범위 설정 무시: {item}")
+            continue
+        scopes[path] = scope
+    return scopes
+
+
+class SingleFlight:
+    """같은 키로 동시에 진행 중인 호출을 하나로 합침
+
+    먼저 온 요청(leader)만 fn()을 실행하고, 끝나기 전에 같은 키로 들어온 요청은
+    그 결과(또는 예외)를 함께 받는다. 결과는 여러 요청이 공유하므로 수정하면 안 된다.
+    끝난 호출은 바로 지우므로 결과를 기억하는 캐시가 아니다.
+    기다리는 요청은 자신의 마감 시간이 지나면 DeadlineExceeded로 먼저 빠져나간다.
+    """
+
+    def __init__(self, scopes):
+        self.scopes = scopes
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+        self.failures = 0
+        self.coalesced_by_path = {}
+
+    def key(self, method, path, headers):
+        """(method, path, 인증 범위) - global 범위의 익명 호출만 사용자 구분 없이 하나로 합침"""
+        if self.scopes.get(path, USER_SCOPE) == GLOBAL_SCOPE and not (headers or {}).get('Authorization'):
+            return method, path, GLOBAL_SCOPE
+        return method, path, backend_cache.identity_from_headers(headers)
+
+    def do(self, key, fn):
+        """key로 진행 중인 호출이 있으면 그 결과를 기다리고, 없으면 fn()을 실행"""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.coalesced += 1
+                self.coalesced_by_path[key[1]] = self.coalesced_by_path.get(key[1], 0) + 1
+                leader = False
+            else:
+                future = Future()
+                self._calls[key] = future
+                self.leaders += 1
+                leader = True
+
+        if not leader:
+            # 먼저 온 요청의 마감이 더 길어도 이 요청의 남은 시간까지만 기다림
+            try:
+                return future.result(timeout=deadlines.check())
+            except FutureTimeout:
+                raise deadlines.DeadlineExceeded('요청 마감 시간 안에 합쳐진 호출이 끝나지 않았습니다.')
+
+        try:
+            result = fn()
+        except BaseException as e:
+            with self._lock:
+                self.failures += 1
+                del self._calls[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            del self._calls[key]
+        future.set_result(result)
+        return result
+
+    def stats(self):
+        with self._lock:
+            calls = self.leaders + self.coalesced
+            return {
+                'scopes': self.scopes,
+                'in_flight': len(self._calls),
+                'upstream_calls': self.leaders,
+                'coalesced': self.coalesced,
+                'failures': self.failures,
+                'coalesced_ratio': round(self.coalesced / calls, 4) if calls else None,
+                'coalesced_by_path': dict(self.coalesced_by_path),
+            }
+
+
+flights = SingleFlight(_parse_scopes(os.getenv('BACKEND_SINGLE_FLIGHT_SCOPES', '')))
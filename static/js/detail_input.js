@@ -97,6 +97,7 @@ document.addEventListener('DOMContentLoaded', function() {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
+                    'Idempotency-Key': newIdempotencyKey()
                 },
                 body: JSON.stringify({
                     music_id: musicId, // 이전 단계에서 생성된 음악 ID (있는 경우)
@@ -104,6 +105,9 @@ document.addEventListener('DOMContentLoaded', function() {
                 })
             })
             .then(response => response.json())
+            .then(data => data.job_id ? waitForGenerationJob(data, status => {
+                this.textContent = GENERATION_PROGRESS_LABELS[status] || '생성 중...';
+            }) : data)
             .then(data => {
                 if (data.success) {
                     showMessage('음악이 생성되었습니다!', 'success');
@@ -91,20 +91,38 @@ document.addEventListener('DOMContentLoaded', function() {
                 }
                 imageUploadArea.style.pointerEvents = 'none';
 
-                // FormData 생성
-                const formData = new FormData();
-                const fieldName = mode === 'video' ? 'video' : 'image';
-                formData.append(fieldName, selectedFile);
-
-                // 서버 엔드포인트 결정
-                const endpoint = mode === 'video' ? '/generate-music-from-video' : '/generate-music-from-image';
-
-                // 서버에 데이터 전송
-                fetch(endpoint, {
-                    method: 'POST',
-                    body: formData
-                })
-                .then(response => response.json())
+                // 큰 파일은 청크 단위 이어받기 업로드, 작은 파일은 한 번에 전송
+                let request;
+                if (selectedFile.size > RESUMABLE_UPLOAD_THRESHOLD) {
+                    request = resumableUpload(selectedFile, mode, percent => {
+                        if (uploadText) {
+                            uploadText.textContent = `업로드 중... ${percent}%`;
+                        }
+                    });
+                } else {
+                    // FormData 생성
+                    const formData = new FormData();
+                    const fieldName = mode === 'video' ? 'video' : 'image';
+                    formData.append(fieldName, selectedFile);
+
+                    // 서버 엔드포인트 결정
+                    const endpoint = mode === 'video' ? '/generate-music-from-video' : '/generate-music-from-image';
+
+                    // 서버에 데이터 전송
+                    request = fetch(endpoint, {
+                        method: 'POST',
+                        headers: { 'Idempotency-Key': newIdempotencyKey() },
+                        body: formData
+                    })
+                    .then(response => response.json());
+                }
+
+                request
+                .then(data => data.job_id ? waitForGenerationJob(data, status => {
+                    if (uploadText) {
+                        uploadText.textContent = GENERATION_PROGRESS_LABELS[status] || '생성 중...';
+                    }
+                }) : data)
                 .then(data => {
                     if (data.success) {
                         const fileTypeText = mode === 'video' ? '동영상' : '이미지';
@@ -201,6 +219,97 @@ document.addEventListener('DOMContentLoaded', function() {
     }
 });
 
+// 이 크기(바이트)를 넘는 파일은 이어받기 업로드 사용
+const RESUMABLE_UPLOAD_THRESHOLD = 8 * 1024 * 1024;
+const CHUNK_MAX_RETRIES = 3;
+
+// 청크 sha256 (hex)
+function sha256Hex(buffer) {
+    return crypto.subtle.digest('SHA-256', buffer).then(hash =>
+        Array.from(new Uint8Array(hash)).map(b => b.toString(16).padStart(2, '0')).join('')
+    );
+}
+
+// 청크 하나 업로드 - 실패하면 잠시 후 재시도
+function uploadChunk(uploadId, index, blob, offset, attempt = 1) {
+    return blob.arrayBuffer()
+        .then(buffer => sha256Hex(buffer).then(checksum =>
+            fetch(`/uploads/sessions/${uploadId}/chunks/${index}`, {
+                method: 'PUT',
+                headers: {
+                    'Content-Type': 'application/octet-stream',
+                    'X-Chunk-Offset': String(offset),
+                    'X-Chunk-Checksum': checksum
+                },
+                body: buffer
+            })
+        ))
+        .then(response => {
+            if (!response.ok) {
+                throw new Error(`청크 ${index} 업로드 실패 (${response.status})`);
+            }
+        })
+        .catch(error => {
+            if (attempt >= CHUNK_MAX_RETRIES) {
+                throw error;
+            }
+            return new Promise(resolve => setTimeout(resolve, 1000 * attempt))
+                .then(() => uploadChunk(uploadId, index, blob, offset, attempt + 1));
+        });
+}
+
+// 이어받기 업로드 - 세션 생성, 빠진 청크만 전송, 완료 요청 (생성 작업 접수 응답 반환)
+function resumableUpload(file, mode, onProgress) {
+    return fetch('/uploads/sessions', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({
+            kind: mode === 'video' ? 'video' : 'image',
+            filename: file.name,
+            size: file.size,
+            content_type: file.type
+        })
+    })
+    .then(response => response.json())
+    .then(session => {
+        if (!session.success) {
+            return session;
+        }
+
+        function sendMissing() {
+            return fetch(session.status_url)
+                .then(response => response.json())
+                .then(status => {
+                    let done = status.received.length;
+                    let chain = Promise.resolve();
+                    status.missing.forEach(index => {
+                        const offset = index * session.chunk_size;
+                        const blob = file.slice(offset, offset + session.chunk_size);
+                        chain = chain
+                            .then(() => uploadChunk(session.upload_id, index, blob, offset))
+                            .then(() => {
+                                done += 1;
+                                if (onProgress) {
+                                    onProgress(Math.round(done / session.total_chunks * 100));
+                                }
+                            });
+                    });
+                    return chain;
+                });
+        }
+
+        // 재시도 후에도 실패한 청크가 있으면 서버 상태를 다시 확인해 한 번 더 이어서 전송
+        // 완료 요청은 업로드 세션마다 한 번만 처리되도록 세션 ID를 키로 사용
+        return sendMissing()
+            .catch(() => sendMissing())
+            .then(() => fetch(session.complete_url, {
+                method: 'POST',
+                headers: { 'Idempotency-Key': `upload-${session.upload_id}` }
+            }))
+            .then(response => response.json());
+    });
+}
+
 // 메시지 표시 함수
 function showMessage(message, type) {
     // 이미 있는 메시지 제거
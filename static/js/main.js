@@ -82,4 +82,75 @@ document.addEventListener('DOMContentLoaded', function() {
             animations.slideIn(loginButton, 'bottom', 800);
         }, 1200);
     }
-});
\ No newline at end of file
+});
+// 사용자 동작 하나에 대한 Idempotency-Key - 같은 동작의 재시도에는 같은 키를 보낸다
+function newIdempotencyKey() {
+    if (window.crypto && crypto.randomUUID) {
+        return crypto.randomUUID();
+    }
+    return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}${Math.random().toString(36).slice(2)}`;
+}
+
+// 생성 작업 진행 단계 표시 문구
+const GENERATION_PROGRESS_LABELS = {
+    queued: '대기 중...',
+    running: '생성 중...',
+    uploading: '파일 전송 중...',
+    waiting_backend: '음악 만드는 중...'
+};
+
+// 생성 작업 완료 대기 - 진행 상황 스트림(SSE)을 우선 사용하고, 안 되면 폴링
+function waitForGenerationJob(job, onProgress) {
+    if (!window.EventSource || !job.events_url) {
+        return pollGenerationJob(job.status_url, onProgress);
+    }
+
+    return new Promise((resolve, reject) => {
+        const source = new EventSource(job.events_url);
+
+        source.onmessage = function(event) {
+            const data = JSON.parse(event.data);
+            if (data.status === 'done') {
+                source.close();
+                resolve(data.result);
+            } else if (data.status === 'failed') {
+                source.close();
+                resolve({ success: false, error: data.error });
+            } else if (onProgress) {
+                onProgress(data.status);
+            }
+        };
+
+        // 스트림이 끊기면 폴링으로 전환
+        source.onerror = function() {
+            source.close();
+            pollGenerationJob(job.status_url, onProgress).then(resolve, reject);
+        };
+    });
+}
+
+// 생성 작업 상태 폴링 - 완료되면 작업 결과로 resolve
+function pollGenerationJob(statusUrl, onProgress, interval = 1500) {
+    return new Promise((resolve, reject) => {
+        function check() {
+            fetch(statusUrl)
+                .then(response => response.json())
+                .then(job => {
+                    if (!job.success) {
+                        reject(new Error(job.error || '작업을 찾을 수 없습니다'));
+                    } else if (job.status === 'done') {
+                        resolve(job.result);
+                    } else if (job.status === 'failed') {
+                        resolve({ success: false, error: job.error });
+                    } else {
+                        if (onProgress) {
+                            onProgress(job.status);
+                        }
+                        setTimeout(check, interval);
+                    }
+                })
+                .catch(reject);
+        }
+        check();
+    });
+}
@@ -5,17 +5,121 @@ document.addEventListener('DOMContentLoaded', function() {
     // 각 음악 항목에 호버 효과 추가
     const musicContainers = document.querySelectorAll('.music-container');
 
-    musicContainers.forEach(container => {
-        container.addEventListener('mouseenter', function() {
-            this.style.transform = 'translateY(-5px)';
-            this.style.transition = 'transform 0.3s';
-        });
+    musicContainers.forEach(addHoverEffect);
+
+    setupInfiniteScroll();
+});
+
+function addHoverEffect(container) {
+    container.addEventListener('mouseenter', function() {
+        this.style.transform = 'translateY(-5px)';
+        this.style.transition = 'transform 0.3s';
+    });
+
+    container.addEventListener('mouseleave', function() {
+        this.style.transform = 'translateY(0)';
+    });
+}
+
+// 무한 스크롤 - 목록 끝(sentinel)이 보이면 다음 페이지를 불러와 이어 붙임
+function setupInfiniteScroll() {
+    const musicList = document.querySelector('.music-list');
+    const sentinel = document.getElementById('playlistSentinel');
+    if (!musicList || !sentinel) {
+        return;
+    }
 
-        container.addEventListener('mouseleave', function() {
-            this.style.transform = 'translateY(0)';
+    let nextCursor = musicList.dataset.nextCursor;
+    let loading = false;
+
+    const observer = new IntersectionObserver(entries => {
+        if (entries[0].isIntersecting) {
+            loadNextPage();
+        }
+    }, { rootMargin: '400px 0px' });
+
+    function finish() {
+        observer.disconnect();
+        sentinel.remove();
+    }
+
+    function loadNextPage() {
+        if (loading || !nextCursor) {
+            return;
+        }
+        loading = true;
+
+        fetch(`/playlist/items?after=${encodeURIComponent(nextCursor)}`)
+        .then(response => response.json())
+        .then(data => {
+            if (!data.success) {
+                throw new Error(data.error || '목록을 불러오지 못했습니다.');
+            }
+
+            data.items.forEach(item => {
+                const container = createMusicContainer(item);
+                addHoverEffect(container);
+                musicList.appendChild(container);
+            });
+
+            nextCursor = data.next_cursor;
+            if (!nextCursor) {
+                finish();
+            }
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            showErrorMessage('목록을 더 불러오지 못했습니다.');
+            finish();
+        })
+        .finally(() => {
+            loading = false;
         });
+    }
+
+    observer.observe(sentinel);
+}
+
+// 템플릿의 .music-container와 같은 구조로 음악 항목 생성
+function createMusicContainer(item) {
+    const container = document.createElement('div');
+    container.className = 'music-container';
+    container.dataset.id = item.id;
+
+    const columnBox = document.createElement('div');
+    columnBox.className = 'column-box';
+
+    const title = document.createElement('h3');
+    title.textContent = item.title || '제목 없음';
+    const tempo = document.createElement('p');
+    tempo.textContent = `BPM: ${item.tempo ?? ''}`;
+    const createdAt = document.createElement('p');
+    createdAt.textContent = `생성일: ${item.created_at}`;
+    columnBox.append(title, tempo, createdAt);
+
+    const controls = document.createElement('div');
+    controls.className = 'music-controls';
+    [
+        ['play-btn', 'play.png', '재생', () => playMusic(item.id)],
+        ['download-btn', 'download.png', '다운로드', () => downloadMusic(item.id)],
+        ['delete-btn', 'delete.png', '삭제', () => deleteMusic(item.id)]
+    ].forEach(([className, image, alt, onClick]) => {
+        const button = document.createElement('button');
+        button.className = className;
+        button.addEventListener('click', onClick);
+
+        const img = document.createElement('img');
+        img.src = `/static/images/${image}`;
+        img.alt = alt;
+        img.width = 24;
+
+        button.appendChild(img);
+        controls.appendChild(button);
     });
-});
+
+    container.append(columnBox, controls);
+    return container;
+}
 
 // 음악 재생 함수
 function playMusic(musicId) {
@@ -81,7 +185,8 @@ function downloadMusic(musicId) {
 function deleteMusic(musicId) {
     if (confirm('정말로 이 음악을 삭제하시겠습니까?')) {
         fetch(`/delete/${musicId}`, {
-            method: 'DELETE'
+            method: 'DELETE',
+            headers: { 'Idempotency-Key': newIdempotencyKey() }
         })
         .then(response => response.json())
         .then(data => {